@@ -1,13 +1,32 @@
 #!/usr/bin/env python3
+import datetime
+import html
+import io
+import itertools
 import openpyxl
 import os
 import re
 import sys
+import tempfile
+import threading
+import time
 import uuid
 import webbrowser
+from dotenv import load_dotenv
 from multiprocessing import Pool, cpu_count, freeze_support
 from tqdm import tqdm
-from audit_printer import save_report, build_report
+from audit_printer import (
+    save_report, build_report, get_report_path, ReportWriter, NullReportWriter,
+    use_shared_report_css, write_shared_css, save_audit_result, OUTPUT_FORMATS,
+    AUDIT_RESULT_SCHEMA, AUDIT_RESULT_SCHEMA_VERSION, AuditError, WorkbookOpenError,
+    ReportExistsError,
+)
+from audit_batch import (
+    estimate_file_cost, stream_longest_first, format_utilization, CostModel, BatchEta,
+    load_history, append_history, build_history_record, format_duration,
+    discover_excel_files, REORDER_WINDOW, prefetch_jobs, read_workbook_bytes,
+    read_throttle_mbps,
+)
 from audit_lib_funcs import *
 
 __version__ = "1.3.5"
@@ -61,18 +80,42 @@ def check_for_updates():
     return None
 
 
-def audit_excel(file_path, show_progress=False):
+def audit_excel(file_path, show_progress=False, update_info=None, shared_css=False,
+                formats=("html",), audit_result=None, row_workers=None,
+                workbook_source=None, budget=None):
+    """
+    Audit one workbook and build its report.
+
+    The HTML report streams into a ReportWriter (a NullReportWriter when
+    "html" is not in formats) that save_report commits. When audit_result (a
+    dict) is given it is filled with the structured result for
+    save_audit_result. row_workers sets the process count for the row checks
+    (None = automatic, see column_validations). workbook_source (a path or
+    file-like object such as a BytesIO) is loaded instead of file_path when
+    given; file_path is still used for naming and locating the report.
+    budget (an AuditBudget) limits the time per stage and per file; stages
+    that run out are cut off or skipped and reported (result["budget"]).
+
+    Returns (file_path, report_lines, service_date_range, name_match_info).
+    Raises WorkbookOpenError when the workbook cannot be opened or has no
+    OASCAPHS tab.
+    """
+    if budget is None:
+        budget = AuditBudget()
+    deadline = budget.start("load")
     try:
         if show_progress:
             print(f"Loading workbook: {os.path.basename(file_path)}...")
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-    except:
-        print(
-            f"--- Critical Error opening {file_path}! Are you sure it's an Excel file?"
+        wb = openpyxl.load_workbook(
+            workbook_source if workbook_source is not None else file_path,
+            data_only=True,
         )
-        input("Press enter to continue: ")
-        print("\n")
-        sys.exit(1)
+    except Exception as e:
+        raise WorkbookOpenError(file_path, f"{e} (are you sure it's an Excel file?)") from e
+    finally:
+        budget.finish(deadline)
+    if "OASCAPHS" not in wb.sheetnames:
+        raise WorkbookOpenError(file_path, "the workbook has no OASCAPHS tab")
     sheet = wb["OASCAPHS"]
 
     # --- Extract and clean header/footer ---
@@ -114,10 +157,13 @@ def audit_excel(file_path, show_progress=False):
     facility_matches = []
     from audit_lib_funcs import FACILITY_NAME_ALIASES, find_all_columns_in_sheet
     if 'POP' in wb.sheetnames:
-        tab_matches = find_all_columns_in_sheet(wb['POP'], FACILITY_NAME_ALIASES)
-        for m in tab_matches:
-            m['tab'] = 'POP'
-        facility_matches.extend(tab_matches)
+        deadline = budget.start("facility")
+        if not deadline.skipped:
+            tab_matches = find_all_columns_in_sheet(wb['POP'], FACILITY_NAME_ALIASES, deadline=deadline)
+            for m in tab_matches:
+                m['tab'] = 'POP'
+            facility_matches.extend(tab_matches)
+        budget.finish(deadline)
 
     # Get base filename for comparison
     basefname = os.path.basename(file_path)
@@ -169,18 +215,34 @@ def audit_excel(file_path, show_progress=False):
     sid_issues = []
     sid_row_issues = []
     if sid_col and cms_col:
-        sid_issues, sid_row_issues = validate_sid_sequence(sheet, sid_col, cms_col, header_sid)  # type: ignore
-        issues.extend(sid_issues)
+        deadline = budget.start("sid")
+        if not deadline.skipped:
+            sid_issues, sid_row_issues = validate_sid_sequence(
+                sheet, sid_col, cms_col, header_sid, deadline=deadline
+            )  # type: ignore
+            issues.extend(sid_issues)
+        budget.finish(deadline)
         if show_progress:
             print(f"[OK] SID validation complete ({len(sid_issues)} issues found)")
 
-    # Validate INEL tab REPEAT entries
+    # Validate INEL tab REPEAT entries and count INEL patients in one pass
     inel_issues = []
     inel_row_issues = []
+    inel_count = None
+    inel_highlighted_count = 0
     if "INEL" in wb.sheetnames:
         inel_sheet = wb["INEL"]
-        inel_issues, inel_row_issues = validate_inel_repeat_rows(inel_sheet, show_progress=show_progress)
-        issues.extend(inel_issues)
+        deadline = budget.start("inel")
+        if not deadline.skipped:
+            inel_analysis = analyze_inel_tab(
+                inel_sheet, show_progress=show_progress, deadline=deadline
+            )
+            inel_issues = inel_analysis['issues']
+            inel_row_issues = inel_analysis['row_issues']
+            inel_count = inel_analysis['inel_count']
+            inel_highlighted_count = inel_analysis['highlighted_count']
+            issues.extend(inel_issues)
+        budget.finish(deadline)
         if show_progress:
             print(f"[OK] INEL validation complete ({len(inel_issues)} issues found)")
 
@@ -188,10 +250,13 @@ def audit_excel(file_path, show_progress=False):
     service_date_range = None
     blank_date_row_issues = []
     if svc_col:
-        service_date_range, blank_date_issues, blank_date_row_issues = extract_service_date_range(
-            sheet, svc_col, mrn_col=mrn_col, cms_col=cms_col
-        )
-        issues.extend(blank_date_issues)
+        deadline = budget.start("service_dates")
+        if not deadline.skipped:
+            service_date_range, blank_date_issues, blank_date_row_issues = extract_service_date_range(
+                sheet, svc_col, mrn_col=mrn_col, cms_col=cms_col, deadline=deadline
+            )
+            issues.extend(blank_date_issues)
+        budget.finish(deadline)
         if show_progress:
             print(f"[OK] Service date extraction complete")
 
@@ -203,53 +268,99 @@ def audit_excel(file_path, show_progress=False):
     cms1_count = None
     
     if cms_col and em_col:
-        try:
-            total_em, emails, mailings, non_reported, cms1_count = calc_e_m_total(
-                sheet, cms_col, em_col
-            )  # type: ignore
-        except Exception as e:
-            issues.append(f"Error calculating E/M totals: {str(e)}")
+        deadline = budget.start("e_m_totals")
+        if not deadline.skipped:
+            try:
+                total_em, emails, mailings, non_reported, cms1_count = calc_e_m_total(
+                    sheet, cms_col, em_col, deadline=deadline
+                )  # type: ignore
+            except Exception as e:
+                issues.append(f"Error calculating E/M totals: {str(e)}")
+        budget.finish(deadline)
 
     if show_progress:
         print("Building report...")
-    report_lines, issues = build_report(
-        wb=wb,
-        sheet=sheet,
-        file_path=file_path,
-        version=version,
+    # Stream the report into a temp file next to its final path; save_report renames it into place
+    report_path = get_report_path(file_path, service_date_range=service_date_range)
+    if "html" in formats:
+        # Batch runs can link one stylesheet in the AUDITS folder instead of inlining it
+        css_href = write_shared_css(os.path.dirname(report_path)) if shared_css else None
+        report_writer = ReportWriter(report_path)
+    else:
+        css_href = None
+        report_writer = NullReportWriter(report_path)
+
+    result = audit_result if audit_result is not None else {}
+    result.update(
+        schema=AUDIT_RESULT_SCHEMA,
+        schema_version=AUDIT_RESULT_SCHEMA_VERSION,
+        auditor_version=version,
+        file=os.path.abspath(file_path),
         audit_id=audit_id,
-        missing_req_headers=missing_req_headers,
-        patients_submitted=patients_submitted,
-        eligible_patients=eligible_patients,
-        sample_size=sample_size,
-        sid_prefix=sid_prefix,
-        sid_registry_name=sid_registry_name,
-        emails=emails,
-        mailings=mailings,
-        total_em=total_em,
-        non_reported=non_reported,
-        cms1_count=cms1_count,
-        headers=headers,
-        issues=issues,
-        count_nonempty_rows=count_nonempty_rows,
-        classify_cpt=classify_cpt,
-        cpt_is_ineligible=cpt_is_ineligible,
-        addr1_col=addr1_col,
-        addr2_col=addr2_col,
-        city_col=city_col,
-        state_col=state_col,
-        zip_col=zip_col,
-        cms_col=cms_col,
-        em_col=em_col,
-        find_frame_inel_count=find_frame_inel_count,  # optional
-        mrn_col=mrn_col,  # optional
-        sid_col=sid_col,  # SID column
-        sid_row_issues=sid_row_issues,  # SID validation issues
-        inel_row_issues=inel_row_issues,  # INEL validation issues
-        service_date_range=service_date_range,  # Service date range
-        blank_date_row_issues=blank_date_row_issues,  # Blank date issues
-        facility_matches=facility_matches,  # Facility/location columns from FRAME and POP tabs
+        generated_at=datetime.datetime.now().isoformat(timespec="seconds"),
+        header={
+            "patients_submitted": patients_submitted,
+            "eligible_patients": eligible_patients,
+            "sample_size": sample_size,
+            "header_sid": header_sid,
+            "sid_prefix": sid_prefix,
+            "sid_registry_name": sid_registry_name,
+            "service_date_range": service_date_range,
+            "missing_required_headers": list(missing_req_headers or []),
+        },
     )
+    deadline = budget.start("report")
+    try:
+        report_lines, issues = build_report(
+            wb=wb,
+            sheet=sheet,
+            file_path=file_path,
+            version=version,
+            audit_id=audit_id,
+            missing_req_headers=missing_req_headers,
+            patients_submitted=patients_submitted,
+            eligible_patients=eligible_patients,
+            sample_size=sample_size,
+            sid_prefix=sid_prefix,
+            sid_registry_name=sid_registry_name,
+            emails=emails,
+            mailings=mailings,
+            total_em=total_em,
+            non_reported=non_reported,
+            cms1_count=cms1_count,
+            headers=headers,
+            issues=issues,
+            count_nonempty_rows=count_nonempty_rows,
+            classify_cpt=classify_cpt,
+            cpt_is_ineligible=cpt_is_ineligible,
+            addr1_col=addr1_col,
+            addr2_col=addr2_col,
+            city_col=city_col,
+            state_col=state_col,
+            zip_col=zip_col,
+            cms_col=cms_col,
+            em_col=em_col,
+            find_frame_inel_count=find_frame_inel_count,  # optional
+            mrn_col=mrn_col,  # optional
+            sid_col=sid_col,  # SID column
+            sid_row_issues=sid_row_issues,  # SID validation issues
+            inel_row_issues=inel_row_issues,  # INEL validation issues
+            inel_count=inel_count,  # INEL patients (None if INEL tab missing)
+            inel_highlighted_count=inel_highlighted_count,  # INEL rows with highlighted service dates
+            service_date_range=service_date_range,  # Service date range
+            blank_date_row_issues=blank_date_row_issues,  # Blank date issues
+            facility_matches=facility_matches,  # Facility/location columns from FRAME and POP tabs
+            update_info=update_info,  # Renders the update badge into the header
+            report_writer=report_writer,
+            css_href=css_href,
+            audit_result=result,
+            row_workers=row_workers,
+            budget=budget,
+        )
+    except BaseException:
+        report_writer.discard()
+        budget.finish(deadline)
+        raise
     
     if show_progress:
         print("[OK] Report built successfully")
@@ -268,39 +379,383 @@ def audit_excel(file_path, show_progress=False):
             'match': names_match
         }
 
+    budget.finish(deadline)
+    budget.finish_file()
+    result["budget"] = {
+        "file_seconds": budget.file_seconds,
+        "stage_seconds": budget.stage_seconds,
+        "events": budget.events,
+    }
+    result["name_match"] = name_match_info
+
     return file_path, report_lines, service_date_range, name_match_info
 
 
+def save_failure_report(file_path, reason, version_str=version, update_info=None):
+    """Write the "Audit Failed" report for a file that could not be audited."""
+    return save_report(
+        file_path,
+        f"Critical error opening {os.path.basename(file_path)}.",
+        failure_reason=html.escape(reason),
+        version=version_str,
+        update_info=update_info,
+    )
+
+
+def run_audit(file_path, formats=("html",), update_info=None, shared_css=False,
+              show_progress=False, version_str=version, row_workers=None,
+              audit_result=None, workbook_source=None, budget=None, timings=None):
+    """
+    Audit one file and write every requested output format.
+    When audit_result (a dict) is given it is filled as in audit_excel.
+    Stage times are recorded in timings (a StageTimings, created if not
+    given) and stored as audit_result["stage_timings"], which the audit
+    history record is built from.
+    Returns (list of files written, name_match_info).
+
+    When the workbook cannot be opened, a failure report is written (if
+    "html" is in formats) and the WorkbookOpenError is re-raised with its
+    report_path set.
+    """
+    if audit_result is None:
+        audit_result = {}
+    if timings is None:
+        timings = StageTimings()
+    with timings.activate():
+        outcome = _run_audit(
+            file_path, formats, update_info, shared_css, show_progress, version_str,
+            row_workers, audit_result, workbook_source, budget, timings,
+        )
+    # The outputs were written while "save" was still running; include all of it
+    audit_result["stage_timings"] = timings.as_dict()
+    return outcome
+
+
+def _run_audit(file_path, formats, update_info, shared_css, show_progress, version_str,
+               row_workers, audit_result, workbook_source, budget, timings):
+    try:
+        file_path, report_lines, service_date_range, name_match_info = audit_excel(
+            file_path,
+            show_progress=show_progress,
+            update_info=update_info,
+            shared_css=shared_css,
+            formats=formats,
+            audit_result=audit_result,
+            row_workers=row_workers,
+            workbook_source=workbook_source,
+            budget=budget,
+        )
+    except WorkbookOpenError as e:
+        if "html" in formats:
+            e.report_path = save_failure_report(file_path, e.reason, version_str, update_info)
+        raise
+    output_files = []
+    with stage_timer("save"):
+        if "html" in formats:
+            output_files.append(save_report(
+                file_path, report_lines, version=version_str,
+                service_date_range=service_date_range, update_info=update_info,
+            ))
+        audit_result["stage_timings"] = timings.as_dict()
+        output_files.extend(save_audit_result(audit_result, report_lines.path, formats))
+    return output_files, name_match_info
+
+
 def process_file_wrapper(args):
     """Wrapper function for multiprocessing to process a single Excel file.
     
     Args:
-        args: Tuple of (filename, version_str, update_info)
+        args: Tuple of (job, version_str, update_info, formats, budgets),
+            where job is the dict from audit_batch.estimate_file_cost and
+            budgets is (file_seconds, stage_seconds) for an AuditBudget. When the prefetcher
+            set job["cached_path"], that local copy is read (then deleted)
+            instead of the original file.
         
     Returns:
-        dict with status, filename, result_file, name_match_info, and error (if any)
+        dict with status ('success', 'failed' for an AuditError such as an
+        unreadable workbook, 'error' for anything unexpected), filename,
+        result_file, output_files, name_match_info, wall_seconds,
+        cpu_seconds, read_seconds (time spent reading the workbook into
+        memory), history (audit history record, None unless successful),
+        budget_events (see AuditBudget.events), stage_timings (see
+        StageTimings.as_dict), error_type and error (if any)
     """
-    filename, version_str, update_info = args
+    job, version_str, update_info, formats, budgets = args
+    budget = AuditBudget(*budgets)
+    timings = StageTimings()
+    filename = job["path"]
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    read_seconds = 0.0
     try:
-        file_path, report_lines, service_date_range, name_match_info = audit_excel(filename)
-        final_file = save_report(file_path, report_lines, version=version_str, service_date_range=service_date_range, update_info=update_info)
+        workbook_source = None
+        cached_path = job.get("cached_path")
+        if cached_path:
+            try:
+                workbook_source = io.BytesIO(read_workbook_bytes(cached_path))
+            finally:
+                os.remove(cached_path)
+        elif read_throttle_mbps():
+            workbook_source = io.BytesIO(read_workbook_bytes(filename, read_throttle_mbps()))
+        read_seconds = time.perf_counter() - started
+        if workbook_source is not None:
+            timings.record("read", read_seconds)
+
+        audit_result = {}
+        output_files, name_match_info = run_audit(
+            filename,
+            formats=formats,
+            update_info=update_info,
+            shared_css=use_shared_report_css(),
+            version_str=version_str,
+            audit_result=audit_result,
+            workbook_source=workbook_source,
+            budget=budget,
+            timings=timings,
+        )
         return {
             'status': 'success',
             'filename': filename,
-            'result_file': final_file,
+            'result_file': output_files[0] if output_files else None,
+            'output_files': output_files,
             'name_match_info': name_match_info,
+            'wall_seconds': time.perf_counter() - started,
+            'cpu_seconds': time.process_time() - cpu_started,
+            'read_seconds': read_seconds,
+            'history': build_history_record(job, audit_result, version_str),
+            'budget_events': budget.events,
+            'stage_timings': timings.as_dict(),
+            'error_type': None,
             'error': None
         }
     except Exception as e:
+        report_path = getattr(e, 'report_path', None) if isinstance(e, WorkbookOpenError) else None
         return {
-            'status': 'error',
+            'status': 'failed' if isinstance(e, AuditError) else 'error',
             'filename': filename,
-            'result_file': None,
+            'result_file': report_path,
+            'output_files': [report_path] if report_path else [],
             'name_match_info': None,
+            'wall_seconds': time.perf_counter() - started,
+            'cpu_seconds': time.process_time() - cpu_started,
+            'read_seconds': read_seconds,
+            'history': None,
+            'budget_events': budget.events,
+            'stage_timings': timings.as_dict(),
+            'error_type': type(e).__name__,
             'error': str(e)
         }
 
 
+def _print_skipped_workbooks(not_oas_jobs, corrupt_jobs):
+    """Batch summary section for files discovery classified as not auditable."""
+    if not (not_oas_jobs or corrupt_jobs):
+        return
+    print("\n" + "="*60)
+    print("SKIPPED WORKBOOKS (not loaded)")
+    print("="*60)
+    if not_oas_jobs:
+        print(f"\n{len(not_oas_jobs)} workbook(s) without an OASCAPHS tab:\n")
+        for job in sorted(not_oas_jobs, key=lambda j: j["path"]):
+            sheets = ", ".join(job["sheets"][:6]) + (", ..." if len(job["sheets"]) > 6 else "")
+            print(f"  {job['path']}  (tabs: {sheets or 'none'})")
+    if corrupt_jobs:
+        print(f"\n{len(corrupt_jobs)} file(s) that could not be read:\n")
+        for job in sorted(corrupt_jobs, key=lambda j: j["path"]):
+            report_note = f" -> {job['report_path']}" if job.get("report_path") else ""
+            print(f"  [CORRUPT] {job['path']}: {job['error']}{report_note}")
+    print()
+
+
+def run_batch(dirs=(".",), recursive=False, include=(), exclude=(), formats=("html",),
+              update_info=None, version_str=version, prefetch=0, budgets=(None, None),
+              show_timings=False):
+    """
+    Audit every workbook found under dirs in a process pool (audit --all).
+
+    Discovery streams: each file is peeked at (see audit_batch.peek_workbook),
+    costed (see audit_batch.CostModel) and handed to the pool while the
+    folder scan is still running, reordered largest-first within a window
+    (see audit_batch.stream_longest_first). Workbooks without an OASCAPHS
+    sheet and corrupt files are never loaded; they are listed separately.
+    With prefetch > 0 up to that many upcoming workbooks are copied to a
+    local cache while earlier ones are audited (see audit_batch.prefetch_jobs).
+    budgets is (file_seconds, stage_seconds) for each file's AuditBudget.
+    With show_timings the stage timings of all workers are added up and
+    printed after the summary.
+    Prints the per-file results and the batch summary; returns the list of
+    process_file_wrapper results.
+    """
+    cost_model = CostModel(load_history())
+    scan_errors = []
+    not_oas_jobs = []
+    corrupt_jobs = []
+    discovery = {"count": 0, "done": False}
+    eta = BatchEta(workers=1)
+
+    def costed_jobs():
+        # Runs in the pool's task-feeding thread once the batch has started
+        found = discover_excel_files(dirs, recursive, include, exclude, errors=scan_errors)
+        for path, stat_result in found:
+            job = estimate_file_cost(path, stat_result)
+            if job["kind"] != "oas":
+                (not_oas_jobs if job["kind"] == "not_oas" else corrupt_jobs).append(job)
+                continue
+            job["cost"] = cost_model.total(job)
+            eta.add(path, job["cost"])
+            discovery["count"] += 1
+            yield job
+        discovery["done"] = True
+
+    # Scan up to one reorder window before starting so that small batches
+    # are fully sorted and the pool is never larger than the number of files
+    jobs = costed_jobs()
+    primed = list(itertools.islice(jobs, REORDER_WINDOW + 1))
+    if not primed:
+        for folder, error in scan_errors:
+            print(f"[WARN] Could not read {folder}: {error}")
+        print("No OAS workbooks found.")
+        _print_skipped_workbooks(not_oas_jobs, corrupt_jobs)
+        return []
+
+    num_processes = cpu_count()
+    if discovery["done"]:
+        num_processes = min(num_processes, len(primed))
+        print(f"Found {len(primed)} OAS workbook(s) to process.")
+    else:
+        print(f"Found {len(primed)} OAS workbook(s) so far; still scanning while auditing.")
+    print(f"Using {num_processes} processor(s) for parallel processing.\n")
+    eta.workers = num_processes
+    if cost_model.fitted:
+        basis = f"cost model from {cost_model.record_count} past audit(s)"
+    else:
+        basis = "rough estimate from file size until more audits are recorded"
+    scope = "" if discovery["done"] else " for the files found so far"
+    print(f"Estimated time{scope}: ~{format_duration(eta.initial())} ({basis})\n")
+
+    submissions = stream_longest_first(itertools.chain(primed, jobs))
+    cache = None
+    slots = None
+    if prefetch > 0:
+        # Files cached or in the pool at once: one per worker plus the read-ahead
+        cache = tempfile.TemporaryDirectory(prefix="oas-audit-prefetch-")
+        slots = threading.Semaphore(num_processes + prefetch)
+        submissions = prefetch_jobs(submissions, cache.name, slots, prefetch)
+        print(f"Reading up to {prefetch} workbook(s) ahead into a local cache.\n")
+
+    # Arguments for the worker function (job, version, update_info, formats)
+    worker_args = ((job, version_str, update_info, formats, budgets) for job in submissions)
+
+    # Process files in parallel with progress bar
+    # Using imap_unordered with chunksize=1 for immediate feedback
+    results = []
+    batch_started = time.perf_counter()
+    with Pool(processes=num_processes) as pool, tqdm(
+        total=len(primed) if discovery["done"] else None,
+        desc="Processing files",
+        unit="file",
+        smoothing=0  # Disable smoothing for immediate updates
+    ) as progress:
+        for result in pool.imap_unordered(process_file_wrapper, worker_args, chunksize=1):
+            results.append(result)
+            if slots is not None:
+                slots.release()
+            if result['history']:
+                append_history([result['history']])
+            remaining = eta.complete(result['filename'], result['wall_seconds'])
+            if discovery["done"] and progress.total != discovery["count"]:
+                progress.total = discovery["count"]
+            progress.set_postfix_str(f"ETA {format_duration(remaining)}")
+            progress.update()
+    makespan = time.perf_counter() - batch_started
+    if cache is not None:
+        cache.cleanup()
+
+    # Corrupt files were never loaded; give each the usual failure report
+    if "html" in formats:
+        for job in corrupt_jobs:
+            try:
+                job["report_path"] = save_failure_report(
+                    job["path"], job["error"], version_str, update_info
+                )
+            except (AuditError, OSError):
+                job["report_path"] = None
+
+    # Process results
+    files_processed = 0
+    name_mismatch_files = []  # Track files with name mismatches
+    for folder, error in scan_errors:
+        print(f"[WARN] Could not read {folder}: {error}")
+    for result in results:
+        if result['status'] == 'success':
+            print(f"[OK] {result['filename']} -> {', '.join(result['output_files'])}")
+            files_processed += 1
+
+            # Track name mismatch if applicable
+            name_match_info = result['name_match_info']
+            if name_match_info and not name_match_info['match']:
+                name_mismatch_files.append({
+                    'filename': result['filename'],
+                    'file_name': name_match_info['filename'],
+                    'registry_name': name_match_info['registry_name']
+                })
+        elif result['status'] == 'failed':
+            report_note = f" -> {result['result_file']}" if result['result_file'] else ""
+            print(f"[FAILED] {result['filename']}: {result['error']}{report_note}")
+        else:
+            print(f"[ERROR] {result['filename']}: {result['error_type']}: {result['error']}")
+
+    print(
+        f"\nCompleted: {files_processed}/{len(results)} file(s) processed successfully."
+    )
+    print(format_utilization(
+        makespan, sum(r['cpu_seconds'] for r in results), num_processes
+    ))
+    print(f"Time workers spent reading workbooks: {sum(r['read_seconds'] for r in results):.1f}s")
+    _print_skipped_workbooks(not_oas_jobs, corrupt_jobs)
+
+    overruns = [r for r in results if r['budget_events']]
+    if overruns:
+        print("\n" + "="*60)
+        print("TIME BUDGET OVERRUNS")
+        print("="*60 + "\n")
+        budget = AuditBudget(*budgets)
+        for result in overruns:
+            print(f"  {result['filename']}")
+            for event in result['budget_events']:
+                print(f"    - {budget.describe(event)}")
+        print()
+
+    if show_timings:
+        batch_timings = StageTimings()
+        for result in results:
+            batch_timings.merge(result['stage_timings'])
+        print("\n" + "="*60)
+        print(f"STAGE TIMINGS (all workers, {len(results)} file(s))")
+        print("="*60 + "\n")
+        for line in format_stage_timings(batch_timings.as_dict()):
+            print(f"  {line}")
+        print(f"\n  Batch wall time: {makespan:.1f}s on {num_processes} worker(s)")
+        print()
+
+    # Print name matching summary
+    print("\n" + "="*60)
+    print("CLIENT NAME MATCHING SUMMARY")
+    print("="*60)
+    if name_mismatch_files:
+        print(f"\n !!!  {len(name_mismatch_files)} file(s) with CLIENT NAME MISMATCH:\n")
+        for item in name_mismatch_files:
+            print(f"  File: {item['filename']}")
+            print(f"    - Filename:      {item['file_name']}")
+            print(f"    - Registry Name: {item['registry_name']}")
+            print()
+    else:
+        print("\n[OK] All files have matching client names (or no registry data)\n")
+    print("="*60 + "\n")
+
+    return results
+
+
 # Module-level update info (set in __main__ before any auditing)
 _update_info = None
 
@@ -310,12 +765,86 @@ if __name__ == "__main__":
     
     _update_info = check_for_updates()
     
-    remaining_argv = sys.argv[1:]
+    # --format json|ndjson|html (repeatable, or comma-separated); default html
+    # --workers N: processes for the row checks of a single large file
+    # --recursive/-r, --include GLOB, --exclude GLOB: folder scanning for --all
+    output_formats = []
+    row_workers = None
+    recursive = False
+    prefetch = 0
+    show_timings = False
+    load_dotenv()
+    try:
+        file_budget, stage_budgets = budgets_from_env()
+    except ValueError as e:
+        print(f"Invalid AUDIT_FILE_BUDGET_SECONDS / AUDIT_STAGE_BUDGETS setting: {e}")
+        sys.exit(1)
+    include_globs = []
+    exclude_globs = []
+    remaining_argv = []
+    argv_iter = iter(sys.argv[1:])
+    for a in argv_iter:
+        if a == "--format":
+            output_formats.extend(next(argv_iter, "").split(","))
+        elif a.startswith("--format="):
+            output_formats.extend(a.split("=", 1)[1].split(","))
+        elif a == "--workers" or a.startswith("--workers="):
+            value = a.split("=", 1)[1] if "=" in a else next(argv_iter, "")
+            try:
+                row_workers = max(1, int(value))
+            except ValueError:
+                print(f"--workers expects a number, got '{value}'")
+                sys.exit(1)
+        elif a == "--prefetch" or a.startswith("--prefetch="):
+            value = a.split("=", 1)[1] if "=" in a else next(argv_iter, "")
+            try:
+                prefetch = max(0, int(value))
+            except ValueError:
+                print(f"--prefetch expects a number, got '{value}'")
+                sys.exit(1)
+        elif a == "--budget" or a.startswith("--budget="):
+            value = a.split("=", 1)[1] if "=" in a else next(argv_iter, "")
+            try:
+                file_budget = float(value) if float(value) > 0 else None
+            except ValueError:
+                print(f"--budget expects seconds, got '{value}'")
+                sys.exit(1)
+        elif a == "--stage-budget" or a.startswith("--stage-budget="):
+            value = a.split("=", 1)[1] if a.startswith("--stage-budget=") else next(argv_iter, "")
+            try:
+                stage_budgets.update(parse_stage_budgets(value))
+            except ValueError as e:
+                print(f"--stage-budget expects stage=seconds: {e}")
+                sys.exit(1)
+        elif a in ("--recursive", "-r"):
+            recursive = True
+        elif a == "--timings":
+            show_timings = True
+        elif a in ("--include", "--exclude") or a.startswith(("--include=", "--exclude=")):
+            value = a.split("=", 1)[1] if "=" in a else next(argv_iter, "")
+            (include_globs if a.startswith("--include") else exclude_globs).append(value)
+        else:
+            remaining_argv.append(a)
+    output_formats = [f.strip().lower() for f in output_formats if f.strip()]
+    bad_formats = [f for f in output_formats if f not in OUTPUT_FORMATS]
+    if bad_formats:
+        print(f"Unknown --format value(s): {', '.join(bad_formats)} (choose from {', '.join(OUTPUT_FORMATS)})")
+        sys.exit(1)
+    output_formats = tuple(dict.fromkeys(output_formats)) or ("html",)
 
-    if len(remaining_argv) != 1:
-        print("Usage: audit <excel_file> or audit --all")
+    if len(remaining_argv) != 1 and not (remaining_argv and remaining_argv[0] == "--all"):
+        print("Usage: audit <excel_file> or audit --all [--recursive] [folders...] [--format html|json|ndjson]")
         print("Options:")
-        print("  --all       Process all Excel files in the current directory")
+        print("  --all       Process all Excel files in the given folders (default: current directory)")
+        print("  --recursive,-r  With --all, also search subfolders")
+        print("  --include GLOB  With --all, only audit matching files (repeatable)")
+        print("  --exclude GLOB  With --all, skip matching files or folders (repeatable)")
+        print("  --prefetch N    With --all, read up to N workbooks ahead into a local cache (slow network folders)")
+        print("  --budget SECONDS  Time budget per file; checks still running are cut off (default: none)")
+        print(f"  --stage-budget STAGE=SECONDS  Time budget per stage: {', '.join(BUDGET_STAGES)}")
+        print("  --format    Output format(s): html (default), json, ndjson; repeat or comma-separate")
+        print("  --workers N Processes for the row checks of one large file (default: automatic)")
+        print("  --timings   Print how long each audit stage took (added up across files with --all)")
         print("  --help,-h   Show this help message")
         print("  --version,-v Show version information")
         print("\n")
@@ -326,81 +855,35 @@ if __name__ == "__main__":
 
     arg = remaining_argv[0]
 
-    # Handle --all flag to process all files in current directory
+    # Handle --all flag: audit every workbook in the given folders (default: current)
     if arg == "--all":
         print_app_info_and_help_block()
         print()
-        # Get list of Excel files
-        excel_files = [
-            f for f in os.listdir(".") if f.endswith((".xlsx", ".xls", ".xlsm"))
-        ]
-
-        if not excel_files:
-            print("No Excel files found in current directory.")
-            sys.exit(0)
-
-        files_processed = 0
-        name_mismatch_files = []  # Track files with name mismatches
-        num_processes = min(cpu_count(), len(excel_files))
-        print(f"Found {len(excel_files)} Excel file(s) to process.")
-        print(f"Using {num_processes} processor(s) for parallel processing.\n")
-
-        # Prepare arguments for worker function (filename, version, update_info)
-        worker_args = [(f, version, _update_info) for f in excel_files]
-
-        # Process files in parallel with progress bar
-        # Using imap_unordered with chunksize=1 for immediate feedback
-        with Pool(processes=num_processes) as pool:
-            results = list(tqdm(
-                pool.imap_unordered(process_file_wrapper, worker_args, chunksize=1),
-                total=len(excel_files),
-                desc="Processing files",
-                unit="file",
-                smoothing=0  # Disable smoothing for immediate updates
-            ))
-        
-        # Process results
-        for result in results:
-            if result['status'] == 'success':
-                print(f"[OK] {result['filename']} -> {result['result_file']}")
-                files_processed += 1
-                
-                # Track name mismatch if applicable
-                name_match_info = result['name_match_info']
-                if name_match_info and not name_match_info['match']:
-                    name_mismatch_files.append({
-                        'filename': result['filename'],
-                        'file_name': name_match_info['filename'],
-                        'registry_name': name_match_info['registry_name']
-                    })
-            else:
-                print(f"[ERROR] {result['filename']}: {result['error']}")
-
-        print(
-            f"\nCompleted: {files_processed}/{len(excel_files)} file(s) processed successfully."
+        batch_dirs = remaining_argv[1:] or ["."]
+        missing_dirs = [d for d in batch_dirs if not os.path.isdir(d)]
+        if missing_dirs:
+            print(f"Error: folder(s) not found: {', '.join(missing_dirs)}")
+            sys.exit(1)
+        run_batch(
+            batch_dirs, recursive=recursive, include=include_globs, exclude=exclude_globs,
+            formats=output_formats, update_info=_update_info, prefetch=prefetch,
+            budgets=(file_budget, stage_budgets), show_timings=show_timings,
         )
-        
-        # Print name matching summary
-        print("\n" + "="*60)
-        print("CLIENT NAME MATCHING SUMMARY")
-        print("="*60)
-        if name_mismatch_files:
-            print(f"\n !!!  {len(name_mismatch_files)} file(s) with CLIENT NAME MISMATCH:\n")
-            for item in name_mismatch_files:
-                print(f"  File: {item['filename']}")
-                print(f"    - Filename:      {item['file_name']}")
-                print(f"    - Registry Name: {item['registry_name']}")
-                print()
-        else:
-            print("\n[OK] All files have matching client names (or no registry data)\n")
-        print("="*60 + "\n")
-        
         sys.exit(0)
 
     if arg == "--help" or arg == "-h":
-        print("Usage: audit <excel_file> or audit --all [--lookup]")
+        print("Usage: audit <excel_file> or audit --all [--recursive] [folders...] [--lookup] [--format html|json|ndjson]")
         print("Options:")
-        print("  --all       Process all Excel files in the current directory")
+        print("  --all       Process all Excel files in the given folders (default: current directory)")
+        print("  --recursive,-r  With --all, also search subfolders")
+        print("  --include GLOB  With --all, only audit matching files (repeatable)")
+        print("  --exclude GLOB  With --all, skip matching files or folders (repeatable)")
+        print("  --prefetch N    With --all, read up to N workbooks ahead into a local cache (slow network folders)")
+        print("  --budget SECONDS  Time budget per file; checks still running are cut off (default: none)")
+        print(f"  --stage-budget STAGE=SECONDS  Time budget per stage: {', '.join(BUDGET_STAGES)}")
+        print("  --format    Output format(s): html (default), json, ndjson; repeat or comma-separate")
+        print("  --workers N Processes for the row checks of one large file (default: automatic)")
+        print("  --timings   Print how long each audit stage took (added up across files with --all)")
         print("  --lookup    Append a people-search section for invalid emails / missing phones")
         print("  --help,-h   Show this help message")
         print("  --version,-v Show version information")
@@ -422,20 +905,51 @@ if __name__ == "__main__":
         print_app_info_and_help_block()
         print()
         print(f"Processing: {os.path.basename(file_path)}")
-        file_path, report_lines, service_date_range, name_match_info = audit_excel(file_path, show_progress=False)
-        final_file = save_report(file_path, report_lines, version=version, service_date_range=service_date_range, update_info=_update_info)
-        print(f"Report saved: {final_file}")
-        
-        # Open the report in the default browser
-        try:
-            webbrowser.open('file:///' + os.path.abspath(final_file).replace('\\', '/'))
-            print("Opening report in your default browser...")
-        except Exception as e:
-            print(f"Could not automatically open browser: {e}")
-        
-        # Print clickable link for easy access
-        print(f"\nReport link: file:///{os.path.abspath(final_file).replace(chr(92), '/')}")
+        audit_result = {}
+        budget = AuditBudget(file_budget, stage_budgets)
+        timings = StageTimings()
+        started = time.perf_counter()
+        output_files, name_match_info = run_audit(
+            file_path, formats=output_formats, update_info=_update_info,
+            row_workers=row_workers, audit_result=audit_result, budget=budget,
+            timings=timings,
+        )
+        for event in budget.events:
+            print(f"[TIME BUDGET] {budget.describe(event)}")
+        if show_timings:
+            print("\nStage timings:")
+            for line in format_stage_timings(timings.as_dict(), time.perf_counter() - started):
+                print(f"  {line}")
+            print()
+        append_history([build_history_record(
+            estimate_file_cost(file_path), audit_result, version
+        )])
+        for output_file in output_files:
+            print(f"Report saved: {output_file}")
+
+        if "html" in output_formats:
+            final_file = output_files[0]
+            # Open the report in the default browser
+            try:
+                webbrowser.open('file:///' + os.path.abspath(final_file).replace('\\', '/'))
+                print("Opening report in your default browser...")
+            except Exception as e:
+                print(f"Could not automatically open browser: {e}")
+
+            # Print clickable link for easy access
+            print(f"\nReport link: file:///{os.path.abspath(final_file).replace(chr(92), '/')}")
         
+    except WorkbookOpenError as e:
+        # Interactive run (e.g. from the context menu): keep the window open
+        print(f"--- Critical Error opening {file_path}! {e.reason}")
+        input("Press enter to continue: ")
+        print("\n")
+        sys.exit(1)
+    except ReportExistsError as e:
+        print(f"--- File already exists! {e}")
+        input("Press enter to exit: ")
+        print("\n")
+        sys.exit(99)
     except Exception as e:
         # For single file mode, print error and exit
         print(f"\nError processing file: {e}")
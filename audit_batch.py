@@ -0,0 +1,549 @@
+"""
+Discovery and scheduling helpers for `audit --all`.
+
+Files are submitted largest-first (longest processing time first) so a big
+workbook never starts last and holds up the whole batch on its own.
+"""
+import datetime
+import fnmatch
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+
+# openpyxl cannot read legacy .xls workbooks, so they are never queued
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm")
+# Excel lock files (~$Book.xlsx), hidden files and editor/OneDrive temp files
+SKIPPED_NAME_PREFIXES = ("~$", ".")
+SKIPPED_NAME_SUFFIXES = (".tmp", ".partial")
+# Folders never descended into by --recursive (report output, hidden folders)
+SKIPPED_DIR_NAMES = ("AUDITS",)
+# How many discovered files are held back and reordered largest-first before
+# the next one is handed to the pool while a directory scan is still running
+REORDER_WINDOW = 64
+
+
+def _glob_match(rel_path, name, patterns):
+    rel_path = rel_path.replace(os.sep, "/")
+    return any(
+        fnmatch.fnmatch(name.lower(), pat.lower()) or fnmatch.fnmatch(rel_path.lower(), pat.lower())
+        for pat in patterns
+    )
+
+
+def is_batch_candidate(name):
+    """True if a file name looks like an auditable workbook (not a lock/temp file)."""
+    lowered = name.lower()
+    return (
+        lowered.endswith(EXCEL_EXTENSIONS)
+        and not name.startswith(SKIPPED_NAME_PREFIXES)
+        and not lowered.endswith(SKIPPED_NAME_SUFFIXES)
+    )
+
+
+def discover_excel_files(dirs=(".",), recursive=False, include=(), exclude=(), errors=None):
+    """
+    Yield (path, os.stat_result) for each auditable workbook under dirs, as
+    it is found, using os.scandir so the stat comes from the directory scan.
+
+    include/exclude are globs matched (case-insensitively) against the file
+    name or its path relative to the scanned directory; a file must match
+    an include glob when any are given, and matching an exclude glob skips
+    it (or the whole folder when recursive). Folders that cannot be read are
+    skipped and, when errors is a list, appended to it as (path, message).
+
+    Folders and files are de-duplicated by their real path, so a symlink or
+    junction that points back up the tree is entered only once and a
+    workbook reachable through several links is yielded once.
+    """
+    seen = set()
+    visited_dirs = set()
+    for root in dirs:
+        pending = [root]
+        while pending:
+            current = pending.pop()
+            dir_key = os.path.normcase(os.path.realpath(current))
+            if dir_key in visited_dirs:
+                continue
+            visited_dirs.add(dir_key)
+            try:
+                with os.scandir(current) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError as e:
+                if errors is not None:
+                    errors.append((current, str(e)))
+                continue
+            subdirs = []
+            for entry in entries:
+                path = os.path.normpath(entry.path)
+                rel_path = os.path.relpath(path, root)
+                try:
+                    if entry.is_dir():
+                        if (recursive and not entry.name.startswith(SKIPPED_NAME_PREFIXES)
+                                and entry.name not in SKIPPED_DIR_NAMES
+                                and not _glob_match(rel_path, entry.name, exclude)):
+                            subdirs.append(path)
+                        continue
+                    if not entry.is_file() or not is_batch_candidate(entry.name):
+                        continue
+                    if include and not _glob_match(rel_path, entry.name, include):
+                        continue
+                    if _glob_match(rel_path, entry.name, exclude):
+                        continue
+                    key = os.path.normcase(os.path.realpath(path))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield path, entry.stat()
+                except OSError as e:
+                    if errors is not None:
+                        errors.append((path, str(e)))
+            # Depth-first, in name order
+            pending.extend(reversed(subdirs))
+
+
+OAS_SHEET_NAME = "OASCAPHS"
+_OFFICE_DOCUMENT_REL = "/officeDocument"
+
+
+def _workbook_part_name(zf):
+    """Name of the workbook XML part, normally xl/workbook.xml (from _rels/.rels)."""
+    names = set(zf.namelist())
+    if "xl/workbook.xml" in names:
+        return "xl/workbook.xml"
+    if "_rels/.rels" in names:
+        for rel in ElementTree.fromstring(zf.read("_rels/.rels")):
+            if rel.get("Type", "").endswith(_OFFICE_DOCUMENT_REL):
+                target = rel.get("Target", "").lstrip("/")
+                if target in names:
+                    return target
+    return None
+
+
+def peek_workbook(file_path):
+    """
+    Classify a workbook from its zip directory and workbook XML (a few KB)
+    without loading any sheet.
+
+    Returns a dict with:
+      - kind: "oas" (has an OASCAPHS sheet), "not_oas" or "corrupt"
+      - sheets: sheet names in workbook order ([] if corrupt)
+      - xml_size: uncompressed size in bytes of the worksheet XML plus shared
+        strings, which tracks parse time better than the file size (None if
+        corrupt)
+      - error: why the file is corrupt, else None
+    """
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            part = _workbook_part_name(zf)
+            if part is None:
+                return {"kind": "corrupt", "sheets": [], "xml_size": None,
+                        "error": "no workbook part in the file"}
+            root = ElementTree.fromstring(zf.read(part))
+            xml_size = sum(
+                info.file_size for info in zf.infolist()
+                if info.filename.startswith("xl/worksheets/")
+                or info.filename == "xl/sharedStrings.xml"
+            )
+    except zipfile.BadZipFile:
+        return {"kind": "corrupt", "sheets": [], "xml_size": None,
+                "error": "not an .xlsx/.xlsm file (not a zip archive)"}
+    except ElementTree.ParseError as e:
+        return {"kind": "corrupt", "sheets": [], "xml_size": None,
+                "error": f"unreadable workbook XML ({e})"}
+    except Exception as e:
+        return {"kind": "corrupt", "sheets": [], "xml_size": None, "error": str(e)}
+
+    sheets = [el.get("name") for el in root.iter() if el.tag.rsplit("}", 1)[-1] == "sheet"]
+    kind = "oas" if OAS_SHEET_NAME in sheets else "not_oas"
+    return {"kind": kind, "sheets": sheets, "xml_size": xml_size, "error": None}
+
+
+def estimate_file_cost(file_path, stat_result=None):
+    """
+    Describe one batch file for scheduling.
+
+    Returns a dict with path, size (bytes on disk), the kind / sheets /
+    xml_size / error fields from peek_workbook, and cost, the number the
+    batch sorts by.
+    """
+    if stat_result is None:
+        stat_result = os.stat(file_path)
+    job = {"path": file_path, "size": stat_result.st_size}
+    job.update(peek_workbook(file_path))
+    job["cost"] = job["xml_size"] if job["xml_size"] is not None else stat_result.st_size
+    return job
+
+
+def stream_longest_first(jobs, window=REORDER_WINDOW):
+    """
+    Reorder a stream of job dicts largest-"cost"-first without waiting for
+    it to end: up to `window` jobs are buffered and the largest buffered job
+    is released each time a new one arrives. A stream no longer than the
+    window therefore comes out fully sorted.
+    """
+    heap = []
+    counter = itertools.count()
+    for job in jobs:
+        heapq.heappush(heap, (-job["cost"], job["path"], next(counter), job))
+        if len(heap) > window:
+            yield heapq.heappop(heap)[-1]
+    while heap:
+        yield heapq.heappop(heap)[-1]
+
+
+def format_utilization(makespan, cpu_seconds, workers):
+    """One-line batch summary comparing wall time with the CPU time spent."""
+    capacity = makespan * workers
+    utilization = cpu_seconds / capacity if capacity > 0 else 0.0
+    return (
+        f"Makespan: {makespan:.1f}s | total CPU time: {cpu_seconds:.1f}s "
+        f"across {workers} worker(s) | utilization: {utilization:.0%}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Audit history and the per-stage cost model
+# ---------------------------------------------------------------------------
+# Every audited file appends one JSON line (stage timings + row counts) to a
+# local history file. Its timings are the audit's StageTimings seconds under
+# the shared stage names (audit_lib_funcs.AUDIT_STAGES); records written before
+# those names were used (load_seconds, analysis_seconds, ...) are left out of
+# the fit. A small linear model per stage is fitted from it:
+#
+#     seconds = c0 + c1 * sheet XML MB + c2 * mailing rows/1000 + c3 * email rows/1000
+#
+# Mailing rows (usaddress parsing) and email rows are not known before a file
+# is opened, so they are predicted from the last audit of the same client
+# (scaled by XML size) or, failing that, from the average rows per MB.
+
+HISTORY_FILE_NAME = "audit_history.jsonl"
+HISTORY_MAX_RECORDS = 500
+COST_MODEL_MIN_RECORDS = 5
+DEFAULT_SECONDS_PER_MB = 0.5   # used until there is enough history to fit
+_RIDGE = 1e-3
+_MB = 1024 * 1024
+
+
+def get_history_path():
+    """
+    Location of the audit history file: AUDIT_HISTORY_FILE if set, otherwise
+    %LOCALAPPDATA%\\OAS-CAHPS-Auditor\\audit_history.jsonl
+    """
+    override = os.getenv("AUDIT_HISTORY_FILE")
+    if override:
+        return override
+    appdata = os.getenv("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    return os.path.join(appdata, "OAS-CAHPS-Auditor", HISTORY_FILE_NAME)
+
+
+def client_key(file_path):
+    """Client part of a batch file name (text before '#'), lower-cased."""
+    return os.path.basename(file_path).split("#", 1)[0].strip().lower()
+
+
+def build_history_record(job, audit_result, version_str=None):
+    """
+    Slim history entry for one audited file from its job dict (see
+    estimate_file_cost) and the audit_result filled by run_audit; timings
+    are its stage_timings seconds.
+    """
+    counts = audit_result.get("counts", {})
+    return {
+        "audited_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "file": os.path.basename(job["path"]),
+        "client": client_key(job["path"]),
+        "size": job["size"],
+        "xml_size": job["xml_size"],
+        "oascaphs_rows": counts.get("oascaphs_rows"),
+        "mailings": counts.get("mailings"),
+        "emails": counts.get("emails"),
+        "timings": {
+            stage: entry["seconds"]
+            for stage, entry in audit_result.get("stage_timings", {}).items()
+        },
+        "version": version_str,
+    }
+
+
+def load_history(path=None, limit=HISTORY_MAX_RECORDS):
+    """Most recent history records (oldest first); unreadable lines are skipped."""
+    path = path or get_history_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    records = []
+    for line in lines[-limit:]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and isinstance(record.get("timings"), dict):
+            records.append(record)
+    return records
+
+
+def append_history(records, path=None):
+    """
+    Append records to the history file, trimming it back to the newest
+    HISTORY_MAX_RECORDS once it grows to twice that. History is best-effort:
+    I/O errors are swallowed so they never fail an audit.
+    """
+    if not records:
+        return
+    path = path or get_history_path()
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+        if len(lines) >= 2 * HISTORY_MAX_RECORDS:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(lines[-HISTORY_MAX_RECORDS:])
+            os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _solve(matrix, vector):
+    """Solve a small dense linear system by Gaussian elimination (None if singular)."""
+    n = len(vector)
+    aug = [list(row) + [vector[i]] for i, row in enumerate(matrix)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(aug[r][col]))
+        if abs(aug[pivot][col]) < 1e-12:
+            return None
+        aug[col], aug[pivot] = aug[pivot], aug[col]
+        for r in range(n):
+            if r != col:
+                factor = aug[r][col] / aug[col][col]
+                for c in range(col, n + 1):
+                    aug[r][c] -= factor * aug[col][c]
+    return [aug[i][n] / aug[i][i] for i in range(n)]
+
+
+def _features(xml_mb, mailings, emails):
+    return (1.0, xml_mb, mailings / 1000.0, emails / 1000.0)
+
+
+class CostModel:
+    """
+    Per-stage linear cost model fitted from audit history (see the section
+    comment above). predict(job) returns {stage: seconds}; total(job) their
+    sum. With fewer than COST_MODEL_MIN_RECORDS usable records every file is
+    costed at DEFAULT_SECONDS_PER_MB.
+    """
+
+    def __init__(self, records=()):
+        usable = [
+            r for r in records
+            if r.get("xml_size") and r.get("mailings") is not None and r.get("emails") is not None
+        ]
+        self.record_count = len(usable)
+        self.coefficients = {}
+        self._client_rows = {}
+        total_mb = sum(r["xml_size"] for r in usable) / _MB
+        self._mailings_per_mb = sum(r["mailings"] for r in usable) / total_mb if total_mb else 0.0
+        self._emails_per_mb = sum(r["emails"] for r in usable) / total_mb if total_mb else 0.0
+        for r in usable:
+            self._client_rows[r.get("client")] = (r["xml_size"], r["mailings"], r["emails"])
+        if self.record_count < COST_MODEL_MIN_RECORDS:
+            return
+
+        stages = sorted({
+            stage for r in usable for stage in r["timings"]
+            if not stage.endswith("_seconds")
+        })
+        rows = [(_features(r["xml_size"] / _MB, r["mailings"], r["emails"]), r) for r in usable]
+        for stage in stages:
+            samples = [(x, r["timings"][stage]) for x, r in rows if stage in r["timings"]]
+            if len(samples) < COST_MODEL_MIN_RECORDS:
+                continue
+            n = len(samples[0][0])
+            xtx = [[sum(x[i] * x[j] for x, _ in samples) for j in range(n)] for i in range(n)]
+            for i in range(1, n):
+                xtx[i][i] += _RIDGE * len(samples)
+            xty = [sum(x[i] * y for x, y in samples) for i in range(n)]
+            coef = _solve(xtx, xty)
+            if coef is not None:
+                self.coefficients[stage] = coef
+
+    @property
+    def fitted(self):
+        return bool(self.coefficients)
+
+    def predicted_rows(self, job):
+        """(mailings, emails) expected for a job before it is opened."""
+        xml_size = job.get("xml_size") or job["size"]
+        previous = self._client_rows.get(client_key(job["path"]))
+        if previous and previous[0]:
+            scale = xml_size / previous[0]
+            return previous[1] * scale, previous[2] * scale
+        xml_mb = xml_size / _MB
+        return self._mailings_per_mb * xml_mb, self._emails_per_mb * xml_mb
+
+    def predict(self, job):
+        xml_mb = (job.get("xml_size") or job["size"]) / _MB
+        if not self.fitted:
+            return {"total_seconds": DEFAULT_SECONDS_PER_MB * xml_mb}
+        x = _features(xml_mb, *self.predicted_rows(job))
+        return {
+            stage: max(0.0, sum(c * v for c, v in zip(coef, x)))
+            for stage, coef in self.coefficients.items()
+        }
+
+    def total(self, job):
+        return sum(self.predict(job).values())
+
+
+def estimate_makespan(costs, workers):
+    """
+    Wall time for running jobs of the given costs on `workers` processes,
+    simulating the largest-first greedy assignment the batch uses.
+    """
+    workers = max(1, workers)
+    loads = [0.0] * workers
+    for cost in sorted(costs, reverse=True):
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+def format_duration(seconds):
+    """Short human duration: 45s, 3m 05s, 1h 02m."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+class BatchEta:
+    """
+    Running ETA for a batch. Predictions are rescaled by how long completed
+    files actually took relative to what the model predicted for them.
+    """
+
+    def __init__(self, predicted=(), workers=1):
+        self.predicted = dict(predicted)   # path -> predicted seconds
+        self.workers = workers
+        self._done_predicted = 0.0
+        self._done_actual = 0.0
+        # Files may be added by the discovery thread while results come in
+        self._lock = threading.Lock()
+
+    def add(self, path, predicted_seconds):
+        with self._lock:
+            self.predicted[path] = predicted_seconds
+
+    def remaining(self):
+        with self._lock:
+            scale = self._done_actual / self._done_predicted if self._done_predicted > 0 else 1.0
+            costs = [c * scale for c in self.predicted.values()]
+        return estimate_makespan(costs, self.workers)
+
+    def initial(self):
+        return self.remaining()
+
+    def complete(self, path, actual_seconds):
+        """Record a finished file and return the new remaining-time estimate."""
+        with self._lock:
+            predicted = self.predicted.pop(path, None)
+            if predicted is not None and actual_seconds is not None:
+                self._done_predicted += predicted
+                self._done_actual += actual_seconds
+        return self.remaining()
+
+
+# ---------------------------------------------------------------------------
+# Read-ahead prefetching (audit --all --prefetch N)
+# ---------------------------------------------------------------------------
+# On OneDrive/SMB folders the first read of a workbook is slow. The prefetcher
+# copies upcoming workbooks into a local cache folder on a few threads while
+# the pool is still auditing earlier ones; workers then load the local copy
+# into memory. READ_THROTTLE_ENV slows every workbook read down to a given
+# MB/s so the overlap can be measured on a local disk.
+
+READ_THROTTLE_ENV = "AUDIT_READ_THROTTLE_MBPS"
+PREFETCH_THREADS = 4
+_READ_CHUNK = 1024 * 1024
+
+
+def read_throttle_mbps():
+    """Simulated read speed in MB/s from AUDIT_READ_THROTTLE_MBPS (None = unthrottled)."""
+    try:
+        value = float(os.getenv(READ_THROTTLE_ENV, ""))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def read_workbook_bytes(file_path, throttle_mbps=None):
+    """Read a whole file in 1 MB chunks, sleeping to stay under throttle_mbps if given."""
+    chunks = []
+    with open(file_path, "rb") as f:
+        while True:
+            started = time.perf_counter()
+            chunk = f.read(_READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if throttle_mbps:
+                delay = len(chunk) / (throttle_mbps * _MB) - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+    return b"".join(chunks)
+
+
+def _copy_to_cache(job, cache_dir, index, throttle_mbps):
+    name = f"{index:06d}{os.path.splitext(job['path'])[1]}"
+    cached_path = os.path.join(cache_dir, name)
+    data = read_workbook_bytes(job["path"], throttle_mbps)
+    with open(cached_path, "wb") as f:
+        f.write(data)
+    return cached_path
+
+
+def prefetch_jobs(jobs, cache_dir, slots, depth, threads=PREFETCH_THREADS):
+    """
+    Yield job dicts in order with job["cached_path"] set to a local copy of
+    the workbook, copying up to `depth` files ahead of the one being yielded.
+
+    slots is a threading.Semaphore bounding the files that are cached or being
+    audited at once: one slot is taken before a file is copied and the caller
+    must release it when that file's result comes back (the worker deletes the
+    cached copy once it has read it). A copy that fails leaves cached_path
+    None, so the worker reads the original file instead.
+    """
+    throttle = read_throttle_mbps()
+    jobs = iter(jobs)
+    pending = deque()
+    names = itertools.count()
+    with ThreadPoolExecutor(max_workers=max(1, min(threads, depth))) as executor:
+        while True:
+            while len(pending) < max(1, depth):
+                job = next(jobs, None)
+                if job is None:
+                    break
+                slots.acquire()
+                future = executor.submit(_copy_to_cache, job, cache_dir, next(names), throttle)
+                pending.append((job, future))
+            if not pending:
+                return
+            job, future = pending.popleft()
+            try:
+                job["cached_path"] = future.result()
+            except OSError:
+                job["cached_path"] = None
+            yield job
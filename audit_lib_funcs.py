@@ -4,11 +4,173 @@ import json
 import os
 import sys
 import csv
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, wraps
 from openpyxl.worksheet.worksheet import Worksheet
 import phonenumbers
 from email_validator import validate_email as ev_validate, EmailNotValidError
 
 
+# ---------------------------------------------------------------------------
+# Stage timings
+# ---------------------------------------------------------------------------
+# A StageTimings registry adds up wall time per named audit stage. Stages nest
+# (column validations run inside report building), and each stage is charged
+# only its own time, so the stages of one audit add up to its wall time.
+# AUDIT_STAGES is the one stage vocabulary: AuditBudget opens and closes its
+# stages in the registry (and reads their times back from it), --timings and
+# the report footer print it, and the audit history stores it. Work outside
+# the budgeted stages (header parsing, reading and saving files) is timed with
+# @timed_stage / stage_timer into whichever registry is active in this process
+# (see StageTimings.activate); with none active they do nothing.
+
+AUDIT_STAGES = {
+    "read": "Workbook read",
+    "load": "Workbook load",
+    "header": "Header/footer parsing",
+    "facility": "Facility/location scan",
+    "sid": "SID sequence check",
+    "inel": "INEL tab analysis",
+    "service_dates": "Service date range",
+    "e_m_totals": "E/M totals",
+    "report": "Report writing",
+    "frame": "FRAME repeat count",
+    "row_counts": "Tab row counts",
+    "column_validations": "OASCAPHS column validations",
+    "email": "Email quality check",
+    "surgical_category": "Surgical category check",
+    "upload_diff": "UPLOAD vs OASCAPHS comparison",
+    "pop_email": "POP/UPLOAD email check",
+    "cpt": "CPT eligibility check",
+    "address": "Address check",
+    "lookup_candidates": "Lookup candidates",
+    "save": "Saving outputs",
+}
+
+_active_timings = None
+
+
+class StageTimings:
+    """Accumulated self time and call count per stage name, in first-seen order."""
+
+    def __init__(self):
+        self.stages = {}   # name -> [seconds, calls]
+        self._stack = []   # open stages: [name, started, time spent in child stages]
+
+    @contextmanager
+    def stage(self, name):
+        frame = self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(frame)
+
+    def start(self, name):
+        """Open stage `name` and return its frame for stop()."""
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        return frame
+
+    def stop(self, frame):
+        """
+        Close an open stage, and any stage an exception left open inside it.
+        Returns the stage's self time (0.0 if it is not open).
+        """
+        if not any(open_frame is frame for open_frame in self._stack):
+            return 0.0
+        while True:
+            top = self._stack.pop()
+            elapsed = time.perf_counter() - top[1]
+            self.record(top[0], elapsed - top[2])
+            if self._stack:
+                self._stack[-1][2] += elapsed
+            if top is frame:
+                return elapsed - top[2]
+
+    @contextmanager
+    def activate(self):
+        """Make this the registry @timed_stage functions record into."""
+        global _active_timings
+        previous, _active_timings = _active_timings, self
+        try:
+            yield self
+        finally:
+            _active_timings = previous
+
+    def record(self, name, seconds, calls=1):
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+
+    def merge(self, other):
+        """Add another registry's as_dict() output (e.g. from a pool worker)."""
+        for name, entry in other.items():
+            self.record(name, entry["seconds"], entry["calls"])
+
+    def as_dict(self):
+        """
+        {stage: {"seconds", "calls"}}; stages still open (such as the report
+        while its own footer is written) are included with their time so far
+        and count as one call each.
+        """
+        stages = {name: [seconds, calls] for name, (seconds, calls) in self.stages.items()}
+        now = time.perf_counter()
+        for i, (name, started, child) in enumerate(self._stack):
+            inner = self._stack[i + 1][1] if i + 1 < len(self._stack) else now
+            entry = stages.setdefault(name, [0.0, 0])
+            entry[0] += inner - started - child
+            entry[1] += 1
+        return {
+            name: {"seconds": round(seconds, 4), "calls": calls}
+            for name, (seconds, calls) in stages.items()
+        }
+
+
+def timed_stage(name):
+    """Decorator: time calls to the function as stage `name` in the active StageTimings."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active_timings is None:
+                return func(*args, **kwargs)
+            with _active_timings.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def active_stage_timings():
+    """The StageTimings registry active in this process, or None."""
+    return _active_timings
+
+
+def stage_timer(name):
+    """Context manager: time a block as stage `name` in the active StageTimings, if any."""
+    if _active_timings is None:
+        return nullcontext()
+    return _active_timings.stage(name)
+
+
+def format_stage_timings(stages, total_seconds=None):
+    """
+    Plain-text table (list of lines) of {stage: {"seconds", "calls"}},
+    slowest first, with each stage's share of total_seconds (default: the
+    sum of the stages).
+    """
+    if total_seconds is None:
+        total_seconds = sum(entry["seconds"] for entry in stages.values())
+    lines = [f"{'Stage':<22} {'Seconds':>9} {'Calls':>6} {'Share':>6}"]
+    for name, entry in sorted(stages.items(), key=lambda item: -item[1]["seconds"]):
+        share = entry["seconds"] / total_seconds if total_seconds else 0.0
+        lines.append(f"{name:<22} {entry['seconds']:>9.3f} {entry['calls']:>6} {share:>6.0%}")
+    lines.append(f"{'total':<22} {total_seconds:>9.3f}")
+    return lines
+
+
 # --- SID Registry lookup ---
 SIDS_ONEDRIVE_LINK = "https://jlm353-my.sharepoint.com/:f:/g/personal/dcdata_jlm-solutions_com/IgBhYR7tt6YTRbgNTDEh9M7xAc5HSCC3KSaJt6ImfJV65kg?e=hKp0ZU"
 
@@ -22,6 +184,7 @@ def _get_sids_csv_path():
         return os.path.join(base_path, 'SIDs.csv')
 
 
+@timed_stage("header")
 def lookup_sid_client_name(sid_prefix, show_missing_warning=False):
     """Look up client name from SIDs.csv by 2-3 letter SID code.
     
@@ -162,6 +325,7 @@ def clean_hf_text(text: str) -> str:
     return cleaned
 
 
+@timed_stage("header")
 def pick_header(sheet):
     return (
         get_hf_text(sheet.oddHeader)
@@ -171,6 +335,7 @@ def pick_header(sheet):
     )
 
 
+@timed_stage("header")
 def pick_footer(sheet):
     return (
         get_hf_text(sheet.oddFooter)
@@ -180,6 +345,196 @@ def pick_footer(sheet):
     )
 
 
+# ---------------------------------------------------------------------------
+# Time budgets
+# ---------------------------------------------------------------------------
+# A budget caps how long one file (and each stage of its audit) may take, so a
+# pathological workbook cannot hold up a whole --all batch. Long row loops
+# check their Deadline cooperatively and stop early; stages that cannot be
+# interrupted (workbook load, writing the report HTML) are only recorded as
+# overruns. Every pass over a tab is its own stage, so once the file budget is
+# spent the remaining passes are skipped and the file finishes shortly after.
+
+# Every audit stage except the ones around the audit itself can be budgeted
+BUDGET_STAGES = tuple(stage for stage in AUDIT_STAGES if stage not in ("read", "header", "save"))
+# Stages that always run to the end; running over only records an overrun
+UNINTERRUPTIBLE_STAGES = ("load", "report")
+BUDGET_STAGE_LABELS = {**AUDIT_STAGES, "file": "Whole file"}
+
+
+class Deadline:
+    """
+    Wall-clock cutoff for one audit stage. Row loops call
+    `if deadline.reached(row, sheet): break`, which records the row and tab
+    they stopped at. When a stage scans several tabs, only the first cutoff
+    is kept: the scans after it stop at once and would otherwise hide where
+    the stage really stopped. A Deadline without a limit never fires.
+    """
+
+    def __init__(self, stage=None, budget_seconds=None, limit_at=None):
+        self.stage = stage
+        self.budget_seconds = budget_seconds
+        self.started = time.monotonic()
+        self.limit_at = limit_at
+        self.stopped_at = None  # row where a row loop was cut off
+        self.stopped_sheet = None  # title of the tab that row is on
+        self.skipped = False    # the file budget was spent before the stage began
+        self.frame = None       # the stage's open StageTimings frame (see AuditBudget)
+
+    def expired(self):
+        return self.limit_at is not None and time.monotonic() >= self.limit_at
+
+    def reached(self, row=None, sheet=None):
+        if self.limit_at is None or time.monotonic() < self.limit_at:
+            return False
+        if self.stopped_at is None:
+            self.stopped_at = row
+            self.stopped_sheet = getattr(sheet, "title", None)
+        return True
+
+
+class AuditBudget:
+    """
+    Per-file and per-stage time budgets for one audit (seconds; None = no
+    limit). start(stage) returns the stage's Deadline, which is the earlier
+    of the stage budget and what is left of the file budget; finish(deadline)
+    records it. events lists every stage that was skipped, cut off or ran
+    over its budget as {stage, label, status, budget_seconds,
+    elapsed_seconds, stopped_at_row, stopped_at_sheet}.
+
+    Stages are timed in timings (a StageTimings; by default the one active
+    when the first stage starts, else a private one), so a stage's elapsed
+    time is its self time there: stages that run inside it are not counted.
+    """
+
+    def __init__(self, file_seconds=None, stage_seconds=None, timings=None):
+        self.file_seconds = file_seconds
+        self.stage_seconds = dict(stage_seconds or {})
+        self.started = time.monotonic()
+        self.file_limit_at = self.started + file_seconds if file_seconds else None
+        self.timings = timings
+        self.elapsed = {}
+        self.events = []
+
+    @property
+    def active(self):
+        return bool(self.file_seconds or self.stage_seconds)
+
+    def start(self, stage):
+        now = time.monotonic()
+        budget_seconds = self.stage_seconds.get(stage)
+        limits = [t for t in (
+            now + budget_seconds if budget_seconds else None,
+            self.file_limit_at,
+        ) if t is not None]
+        deadline = Deadline(stage, budget_seconds, min(limits) if limits else None)
+        if (self.file_limit_at is not None and now >= self.file_limit_at
+                and stage not in UNINTERRUPTIBLE_STAGES):
+            deadline.skipped = True
+            return deadline
+        if self.timings is None:
+            self.timings = active_stage_timings() or StageTimings()
+        deadline.frame = self.timings.start(stage)
+        return deadline
+
+    def finish(self, deadline):
+        """
+        Record a finished (or skipped) stage, closing it in timings. Its
+        elapsed time excludes the stages that ran inside it.
+        """
+        elapsed = self.timings.stop(deadline.frame) if deadline.frame is not None else 0.0
+        self.elapsed[deadline.stage] = elapsed
+        if deadline.skipped:
+            status = "skipped"
+        elif deadline.stopped_at is not None:
+            status = "cut_off"
+        elif deadline.budget_seconds and elapsed > deadline.budget_seconds:
+            status = "overrun"
+        else:
+            return
+        self._add_event(deadline.stage, status, deadline.budget_seconds, elapsed,
+                        deadline.stopped_at, deadline.stopped_sheet)
+
+    def status(self, stage):
+        """Event status recorded for a stage ("skipped", "cut_off", "overrun") or None."""
+        for event in self.events:
+            if event["stage"] == stage:
+                return event["status"]
+        return None
+
+    def incomplete(self, *stages):
+        """
+        Labels of the given stages that were skipped or cut off, i.e. whose
+        counts and findings only cover part of the rows (an overrun stage
+        still finished, so it is complete).
+        """
+        return [
+            BUDGET_STAGE_LABELS.get(stage, stage) for stage in stages
+            if self.status(stage) in ("skipped", "cut_off")
+        ]
+
+    def finish_file(self):
+        """Record a file-budget overrun once the whole audit is done."""
+        elapsed = time.monotonic() - self.started
+        if self.file_seconds and elapsed > self.file_seconds:
+            self._add_event("file", "overrun", self.file_seconds, elapsed, None)
+
+    def _add_event(self, stage, status, budget_seconds, elapsed, stopped_at, stopped_sheet=None):
+        self.events.append({
+            "stage": stage,
+            "label": BUDGET_STAGE_LABELS.get(stage, stage),
+            "status": status,
+            "budget_seconds": budget_seconds,
+            "elapsed_seconds": round(elapsed, 3),
+            "stopped_at_row": stopped_at,
+            "stopped_at_sheet": stopped_sheet,
+        })
+
+    def describe(self, event):
+        """One-line plain-text description of an event."""
+        if event["status"] == "skipped":
+            return f"{event['label']} skipped: the file's time budget ({self.file_seconds:g}s) was already used up"
+        if event["status"] == "cut_off":
+            where = f"row {event['stopped_at_row']}"
+            if event.get("stopped_at_sheet"):
+                where = f"{event['stopped_at_sheet']} {where}"
+            return (
+                f"{event['label']} stopped at {where} after "
+                f"{event['elapsed_seconds']:.1f}s (time budget reached); later rows were not checked"
+            )
+        return (
+            f"{event['label']} took {event['elapsed_seconds']:.1f}s, over its "
+            f"{event['budget_seconds']:g}s budget"
+        )
+
+
+def parse_stage_budgets(text):
+    """
+    Parse "address=60,inel=30" into {"address": 60.0, "inel": 30.0}.
+    Raises ValueError for unknown stages or non-numeric values.
+    """
+    budgets = {}
+    for part in filter(None, (p.strip() for p in (text or "").split(","))):
+        stage, _, seconds = part.partition("=")
+        stage = stage.strip().lower()
+        if stage not in BUDGET_STAGES:
+            raise ValueError(f"unknown stage '{stage}' (choose from {', '.join(BUDGET_STAGES)})")
+        budgets[stage] = float(seconds)
+    return budgets
+
+
+def budgets_from_env():
+    """
+    (file_seconds, stage_seconds) from AUDIT_FILE_BUDGET_SECONDS and
+    AUDIT_STAGE_BUDGETS (e.g. "address=60,inel=30"); unset means no limit.
+    """
+    file_seconds = os.getenv("AUDIT_FILE_BUDGET_SECONDS")
+    return (
+        float(file_seconds) if file_seconds else None,
+        parse_stage_budgets(os.getenv("AUDIT_STAGE_BUDGETS", "")),
+    )
+
+
 def normalize_postal_code(raw):
     if raw is None:
         return None
@@ -223,7 +578,13 @@ def check_address(
     cms_col=None,
     em_col=None,
     street_address_2_col=None,
+    deadline=None,
 ):
+    """
+    Check mailed (CMS=1, E/M=M) rows for invalid or problematic addresses.
+    Returns (invalid_addresses, noted_addresses). With a Deadline the scan
+    stops at the row where it is reached.
+    """
     from i18naddress import normalize_address, InvalidAddressError
     import usaddress
 
@@ -237,6 +598,8 @@ def check_address(
     for row_number, row in enumerate(
         sheet.iter_rows(min_row=2, values_only=True), start=2
     ):
+        if deadline is not None and deadline.reached(row_number, sheet):
+            break
         if not any(cell is not None and str(cell).strip() != "" for cell in row):
             continue
 
@@ -373,13 +736,15 @@ def check_address(
     return invalid_addresses, noted_addresses
 
 
-def calc_e_m_total(sheet, cms_col, em_col):
+def calc_e_m_total(sheet, cms_col, em_col, deadline=None):
     emails = 0
     mailings = 0
     non_reported = 0
     cms1_count = 0
 
-    for row in sheet.iter_rows(min_row=2, values_only=True):
+    for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+        if deadline is not None and deadline.reached(r, sheet):
+            break
         cms_val = row[cms_col - 1]  # type: ignore
         em_val = row[em_col - 1]  # type: ignore
 
@@ -435,16 +800,83 @@ def classify_cpt(cpt_code: str) -> int:
     return 5
 
 
-def count_nonempty_rows(sheet):
+class SheetStats:
+    """
+    Row and column statistics for one sheet, gathered in a single pass.
+
+    Attributes:
+        header_row: header row found from MRN_ALIASES (1 if none is found)
+        nonempty_rows: non-empty rows after header_row
+        first_data_row / last_data_row: first and last non-empty rows after
+            header_row (None when there are none)
+        max_data_column: right-most column holding a value after header_row
+        column_fill: {col_idx: non-empty cell count} for rows after header_row
+        complete: False when a deadline stopped the scan part-way, so the
+            counts only cover the rows before deadline.stopped_at
+
+    Use get_sheet_stats() to get the shared instance for a sheet.
+    """
+
+    def __init__(self, sheet, deadline=None):
+        header_info = find_column_in_sheet(sheet, MRN_ALIASES)
+        self.header_row = header_info['header_row'] if header_info else 1
+
+        # row_flags[r] is 1 when row r holds any non-blank value
+        self._row_flags = bytearray(1)
+        column_fill = {}
+        header_row = self.header_row
+        self.complete = True
+        for row_idx, row in enumerate(sheet.iter_rows(min_row=1, values_only=True), start=1):
+            if deadline is not None and deadline.reached(row_idx, sheet):
+                self.complete = False
+                break
+            filled = [
+                col_idx
+                for col_idx, cell in enumerate(row, start=1)
+                if cell is not None and str(cell).strip() != ""
+            ]
+            self._row_flags.append(1 if filled else 0)
+            if filled and row_idx > header_row:
+                for col_idx in filled:
+                    column_fill[col_idx] = column_fill.get(col_idx, 0) + 1
+
+        self.column_fill = column_fill
+        self.max_data_column = max(column_fill) if column_fill else 0
+        self.nonempty_rows = self.nonempty_rows_after(header_row)
+        data_start = header_row + 1
+        first = self._row_flags.find(1, data_start)
+        self.first_data_row = first if first != -1 else None
+        last = self._row_flags.rfind(1, data_start)
+        self.last_data_row = last if last != -1 else None
+
+    def nonempty_rows_after(self, row_idx):
+        """Count non-empty rows below row_idx."""
+        return self._row_flags.count(1, row_idx + 1)
+
+
+def get_sheet_stats(sheet, deadline=None):
+    """
+    Return the SheetStats for a sheet, building it on first use.
+    Kept on the sheet object so every row count in the report shares one scan;
+    stats cut short by deadline are returned but not kept.
+    """
+    stats = getattr(sheet, "_audit_sheet_stats", None)
+    if stats is None:
+        stats = SheetStats(sheet, deadline=deadline)
+        if stats.complete:
+            try:
+                sheet._audit_sheet_stats = stats
+            except AttributeError:
+                pass
+    return stats
+
+
+def count_nonempty_rows(sheet, deadline=None):
     """Count rows that actually contain data (ignores blanks/formatting)."""
-    count = 0
-    for row in sheet.iter_rows(min_row=2, values_only=True):  # skip header
-        if any(cell is not None and str(cell).strip() != "" for cell in row):
-            count += 1
-    return count
+    return get_sheet_stats(sheet, deadline).nonempty_rows_after(1)  # skip header
 
 
-def count_nonempty_rows_after_header(sheet, header_aliases=None):
+def count_nonempty_rows_after_header(sheet, header_aliases=None, deadline=None):
     """
     Count rows that actually contain data, starting after the header row.
     Finds the header row dynamically (even if not in row 1), then counts
@@ -453,47 +885,20 @@ def count_nonempty_rows_after_header(sheet, header_aliases=None):
     Args:
         sheet: The worksheet to count rows in
         header_aliases: List of header column names to search for (defaults to MRN_ALIASES)
+        deadline: optional Deadline; rows after the one where it is reached are not counted
     
     Returns:
         int: Count of non-empty data rows after the header
     """
-    # Use MRN_ALIASES as default if not provided
+    stats = get_sheet_stats(sheet, deadline)
     if header_aliases is None:
-        # Import here to avoid circular dependency issues
-        header_aliases = [
-            "chart id", "patid", "medical account number", "patient account number",
-            "patient acct no", "medical record number", "mrn", "patient id",
-            "patient mrn", "medicalrecordnumber", "medrec", "md rc", "acct#",
-            "patient account #", "account number", "patient chart number",
-            "acctnum", "mrnum", "patientid", "mrno", "per nbr", "pt.id"
-        ]
-    
+        return stats.nonempty_rows
+
     # Find the header row by looking for common header column names
-    header_row_idx = None
-    for row_idx in range(1, 41):  # Check first 40 rows for the header
-        try:
-            row = list(sheet.iter_rows(min_row=row_idx, max_row=row_idx, values_only=True))[0]
-            for cell_value in row:
-                if cell_value:
-                    cell_str = str(cell_value).strip().lower()
-                    if any(cell_str == alias.lower() for alias in header_aliases):
-                        header_row_idx = row_idx
-                        break
-            if header_row_idx:
-                break
-        except (IndexError, AttributeError):
-            continue
-    
-    # If no header found, default to row 1
-    if header_row_idx is None:
-        header_row_idx = 1
-    
-    # Count non-empty rows after the header
-    count = 0
-    for row in sheet.iter_rows(min_row=header_row_idx + 1, values_only=True):
-        if any(cell is not None and str(cell).strip() != "" for cell in row):
-            count += 1
-    return count
+    # (also inside pipe/comma delimited single-column layouts)
+    header_info = find_column_in_sheet(sheet, header_aliases)
+    header_row_idx = header_info['header_row'] if header_info else 1
+    return stats.nonempty_rows_after(header_row_idx)
 
 
 def is_blank_row(row) -> bool:
@@ -596,20 +1001,38 @@ def find_frame_inel_count(
     top_nonempty_threshold: int = 3,
     min_block_rows: int = 3,
     max_blank_within_block: int = 1,
-) -> int:
+    deadline=None,
+):
     """
     Locate the lower sparse block and count non-empty values in column B for that block.
-    Returns integer count.
+    Returns integer count, or None when deadline is reached before the end of
+    the sheet (the block sits at the bottom, so a partial scan cannot count it).
+
+    The sheet is streamed once; only a compact per-row non-empty count and a
+    "has a value in column B or later" flag are kept, so memory stays small
+    even when FRAME holds the full sampling frame.
     """
-    rows = list(frame_sheet.iter_rows(values_only=True))
-    if not rows:
+    # count non-empty cells per row, and whether the row has anything from column B onwards.
+    # Column A is tracked separately because RATSTATS random numbers may be placed there
+    # and should not be counted as INEL entries. Identifiers may be in any column >= B.
+    nonempty_counts = array("H")
+    has_id_value = bytearray()
+    for row_idx, row in enumerate(frame_sheet.iter_rows(values_only=True), start=1):
+        if deadline is not None and deadline.reached(row_idx, frame_sheet):
+            return None
+        cnt = 0
+        for c in row:
+            if c is not None and str(c).strip() != "":
+                cnt += 1
+        first = row[0] if row else None
+        first_nonempty = first is not None and str(first).strip() != ""
+        nonempty_counts.append(min(cnt, 0xFFFF))
+        has_id_value.append(1 if cnt - first_nonempty > 0 else 0)
+
+    n_rows = len(nonempty_counts)
+    if not n_rows:
         return 0
 
-    # count non-empty cells per row
-    nonempty_counts = [
-        sum(1 for c in row if c is not None and str(c).strip() != "") for row in rows
-    ]
-
     # find last dense row
     last_dense_index = -1
     for i, cnt in enumerate(nonempty_counts):
@@ -618,63 +1041,84 @@ def find_frame_inel_count(
 
     # candidate start of sparse region
     start_idx = last_dense_index + 1
-    if start_idx >= len(rows):
+    if start_idx >= n_rows:
         return 0
 
-    # accumulate a sparse run starting at start_idx allowing a small number of blanks inside
+    # accumulate a sparse run starting at start_idx
     sparse_run = 0
-    blanks_in_run = 0
     i = start_idx
-    while i < len(rows):
-        cnt = nonempty_counts[i]
-        if cnt <= 2:
+    while i < n_rows:
+        if nonempty_counts[i] <= 2:
             sparse_run += 1
-            i += 1  # ✅ Add this line
         else:
             if sparse_run >= min_block_rows:
                 break
             sparse_run = 0
             start_idx = i + 1
-            i += 1
+        i += 1
 
     if sparse_run < min_block_rows:
-        # fallback: scan whole sheet for any run of rows with <=2 non-empty values
-        start_idx = None
-        for i in range(len(rows)):
-            if nonempty_counts[i] <= 2 and nonempty_counts[i] != 0:
-                run = 1
-                blanks = 0
-                for j in range(i + 1, len(rows)):
-                    if nonempty_counts[j] == 0:
-                        blanks += 1
-                        if blanks > max_blank_within_block:
-                            break
-                    elif nonempty_counts[j] <= 2:
-                        run += 1
-                    else:
-                        break
-                if run >= min_block_rows:
-                    start_idx = i
-                    sparse_run = run
-                    break
-        if start_idx is None:
+        # fallback: find the first row with 1-2 non-empty values that starts a run of
+        # sparse rows (allowing a few blanks inside). A sliding window (row, end) tracks
+        # the run for every row in a single linear pass instead of rescanning from each row.
+        found = _find_first_sparse_run(nonempty_counts, min_block_rows, max_blank_within_block)
+        if found is None:
             return 0
+        start_idx, sparse_run = found
 
-    end_idx = start_idx + sparse_run  # exclusive
+    end_idx = min(start_idx + sparse_run, n_rows)  # exclusive
 
     # Count rows with any non-empty value from column B onwards in the sparse block.
-    # Column A is skipped because RATSTATS random numbers may be placed there and
-    # should not be counted as INEL entries. Identifiers may be in any column >= B.
-    pt_id_count = 0
-    for r in range(start_idx, end_idx):
-        row = rows[r]
-        if any(val is not None and str(val).strip() != "" for val in row[1:]):
-            pt_id_count += 1
+    return sum(has_id_value[start_idx:end_idx])
+
+
+def _find_first_sparse_run(nonempty_counts, min_block_rows, max_blank_within_block):
+    """
+    Return (start_idx, run_length) of the first sparse run in nonempty_counts, or None.
+
+    A run starts at a row with 1-2 non-empty values and continues through following
+    rows with 1-2 values; it stops at a dense row (3+ values) or once more than
+    max_blank_within_block blank rows are seen. run_length counts the non-blank rows.
+    Runs in O(n): the window end only ever moves forward.
+    """
+    n_rows = len(nonempty_counts)
+    end = 0          # window covers rows (i, end)
+    blanks = 0       # blank rows inside the window
+    sparse = 0       # 1-2 value rows inside the window
+    for i in range(n_rows):
+        if end > i:
+            # row i leaves the window
+            cnt = nonempty_counts[i]
+            if cnt == 0:
+                blanks -= 1
+            elif cnt <= 2:
+                sparse -= 1
+        else:
+            end = i + 1
+            blanks = 0
+            sparse = 0
+
+        # extend the window as far as the run continues
+        while end < n_rows:
+            cnt = nonempty_counts[end]
+            if cnt == 0:
+                if blanks + 1 > max_blank_within_block:
+                    break
+                blanks += 1
+            elif cnt <= 2:
+                sparse += 1
+            else:
+                break
+            end += 1
 
-    return pt_id_count
+        cnt = nonempty_counts[i]
+        if 0 < cnt <= 2 and 1 + sparse >= min_block_rows:
+            return i, 1 + sparse
+    return None
 
 
 # function to check for required headers
+@timed_stage("header")
 def check_req_headers(headers):
     required_names = [
         "SID",
@@ -714,7 +1158,7 @@ def check_req_headers(headers):
     return mapping, missing_req_headers
 
 
-def validate_sid_sequence(sheet, sid_col, cms_col, header_sid=None):
+def validate_sid_sequence(sheet, sid_col, cms_col, header_sid=None, deadline=None):
     """
     Validate SID sequence for proper formatting, uniqueness, and numerical order.
     Only validates rows where CMS INDICATOR = 1.
@@ -725,6 +1169,7 @@ def validate_sid_sequence(sheet, sid_col, cms_col, header_sid=None):
         sid_col: Column index for SID (1-based), or None if column missing
         cms_col: Column index for CMS INDICATOR (1-based), or None if column missing
         header_sid: The SID from the header (should be first SID - 1)
+        deadline: optional Deadline; the scan stops at the row where it is reached
     """
     issues = []
     row_issues = []
@@ -753,6 +1198,8 @@ def validate_sid_sequence(sheet, sid_col, cms_col, header_sid=None):
     for row in sheet.iter_rows(min_row=2, values_only=True):
         if not any(cell for cell in row):
             break
+        if deadline is not None and deadline.reached(row_num, sheet):
+            break
             
         cms_value = row[cms_col - 1] if cms_col <= len(row) else None
         
@@ -854,128 +1301,186 @@ def validate_sid_sequence(sheet, sid_col, cms_col, header_sid=None):
     return issues, row_issues
 
 
-def validate_inel_repeat_rows(inel_sheet, show_progress=False):
+# Background fills treated as "highlighted" (common yellow shades)
+_YELLOW_FILL_RGBS = {'FFFF00', 'FFFFE0', 'FFFFCC'}
+
+
+def _get_rgb_str(color_obj):
+    """Return the 6-digit uppercase RGB string of an openpyxl color, or None."""
+    if color_obj and color_obj.rgb:
+        rgb = color_obj.rgb
+        if isinstance(rgb, str) and len(rgb) >= 6:
+            return (rgb[-6:] if len(rgb) == 8 else rgb).upper()
+    return None
+
+
+def get_style_cache(workbook):
     """
-    Validate INEL tab REPEAT entries.
-    
-    For rows marked as REPEAT (duplicates):
-    - All cells in the row should have red font (RGB 255, 0, 0)
-    - "REPEAT" should appear in the rightmost column
-    - The "REPEAT" cell should have yellow background fill and bold red font
-    - No other cells should have highlighting (yellow background)
-    
-    For rows with no cell-level highlighting:
-    - They MUST have "REPEAT" marker, otherwise there's no indication why they're in INEL
-    
-    Returns (issues, row_issues) lists.
+    Return the style-flag cache for a workbook (see get_style_flags).
+    The cache is created on first use and kept on the workbook object, since
+    style ids are only meaningful within the workbook that defines them.
     """
-    issues = []
-    row_issues = []
-    
+    cache = getattr(workbook, "_audit_style_flags", None)
+    if cache is None:
+        cache = {}
+        try:
+            workbook._audit_style_flags = cache
+        except AttributeError:
+            pass
+    return cache
+
+
+def get_style_flags(cell, style_cache):
+    """
+    Return formatting flags for a cell as a tuple:
+    (is_yellow_bg, is_red_font, is_bold, has_any_fill)
+
+    Workbooks only contain a handful of distinct styles, so the flags are
+    computed once per style id (openpyxl's cell.style_id, which is the raw
+    s= attribute for read-only cells) and looked up from style_cache afterwards.
+    """
+    style_id = getattr(cell, "style_id", None)
+    flags = style_cache.get(style_id) if style_id is not None else None
+    if flags is not None:
+        return flags
+
+    fill = cell.fill
+    font = cell.font
+
+    is_yellow_bg = _get_rgb_str(fill.fgColor if fill else None) in _YELLOW_FILL_RGBS
+    is_red_font = _get_rgb_str(font.color if font else None) == 'FF0000'
+    is_bold = bool(font.bold) if font is not None else False
+
+    # Any fill color other than "none"/white counts as highlighted
+    has_any_fill = False
+    if fill and fill.start_color:
+        color_index = fill.start_color.index
+        if color_index and color_index != '00000000' and color_index != 'FFFFFFFF':
+            has_any_fill = True
+
+    flags = (is_yellow_bg, is_red_font, is_bold, has_any_fill)
+    if style_id is not None:
+        style_cache[style_id] = flags
+    return flags
+
+
+def analyze_inel_tab(inel_sheet, show_progress=False, deadline=None):
+    """
+    Analyze the INEL tab in a single pass over its rows.
+
+    Validates REPEAT entries (see validate_inel_repeat_rows for the rules) and,
+    in the same traversal, counts the INEL patients for the report: rows whose
+    service-date cell is highlighted are counted separately as ineligible
+    service dates.
+
+    Returns a dict:
+      {
+        'issues':            list of general issue strings
+        'row_issues':        list of row-level REPEAT validation issue dicts
+        'inel_count':        int  — non-empty rows without a highlighted service date
+        'highlighted_count': int  — non-empty rows with a highlighted service date
+      }
+
+    With a Deadline the scan stops at the row where it is reached, so the
+    counts and issues cover only the rows before it.
+    """
+    analysis = {
+        'issues': [],
+        'row_issues': [],
+        'inel_count': 0,
+        'highlighted_count': 0,
+    }
+
     if inel_sheet is None:
-        return issues, row_issues
-    
-    # Helper function to extract RGB color efficiently
-    def get_rgb_str(color_obj):
-        if color_obj and color_obj.rgb:
-            rgb = color_obj.rgb
-            if isinstance(rgb, str) and len(rgb) >= 6:
-                return (rgb[-6:] if len(rgb) == 8 else rgb).upper()
-        return None
-    
+        return analysis
+
+    row_issues = analysis['row_issues']
+
+    # Formatting flags are memoized per style id for the whole workbook
+    style_cache = get_style_cache(inel_sheet.parent)
+
+    # Patient counting starts after the service date header (row 2 if not found)
+    service_date_col, header_row = find_column_by_aliases(inel_sheet, SERVICE_DATE_ALIASES)
+    count_start_row = header_row + 1 if header_row else 2
+
     # Get the maximum column used in the sheet
     max_col = inel_sheet.max_column
     total_rows = inel_sheet.max_row
-    
+
     if show_progress and total_rows > 100:
         print(f"  Checking {total_rows} rows in INEL tab...")
-    
-    for row_num in range(2, total_rows + 1):
+
+    for row_num, row_cells in enumerate(
+        inel_sheet.iter_rows(min_row=2, max_row=total_rows, max_col=max_col), start=2
+    ):
+        if deadline is not None and deadline.reached(row_num, inel_sheet):
+            break
         # Show progress for large sheets
         if show_progress and total_rows > 100 and row_num % 100 == 0:
             print(f"  Progress: {row_num}/{total_rows} rows checked...", end='\r')
-        
+
         # Quick check if row is completely empty before doing expensive style checks
-        has_data = False
-        for col_num in range(1, max_col + 1):
-            cell = inel_sheet.cell(row_num, col_num)
-            if cell.value is not None and str(cell.value).strip() != "":
-                has_data = True
-                break
-        
-        if not has_data:
+        if not any(
+            cell.value is not None and str(cell.value).strip() != "" for cell in row_cells
+        ):
             continue
-        
+
+        # Count the patient, skipping ones with highlighted service dates
+        if row_num >= count_start_row:
+            highlighted = False
+            if service_date_col and service_date_col <= len(row_cells):
+                highlighted = get_style_flags(row_cells[service_date_col - 1], style_cache)[3]
+            if highlighted:
+                analysis['highlighted_count'] += 1
+            else:
+                analysis['inel_count'] += 1
+
         # Check if "REPEAT" or "LISTED MORE THAN ONCE ON FILE" exists in the rightmost column
         has_repeat = False
-        repeat_cell = inel_sheet.cell(row_num, max_col)
-        
+        repeat_cell = row_cells[max_col - 1]
+
         if repeat_cell.value:
             cell_text = str(repeat_cell.value).strip().upper()
             if cell_text == "REPEAT" or cell_text == "LISTED MORE THAN ONCE ON FILE":
                 has_repeat = True
-        
+
         # Check for yellow highlighting (background fill) and red font in non-REPEAT cells
-        cells_with_yellow_bg = []
-        cells_with_red_font = []
-        
-        for col_num in range(1, max_col):  # Exclude rightmost column
-            cell = inel_sheet.cell(row_num, col_num)
+        cells_with_yellow_bg = 0
+        cells_with_red_font = 0
+        nonempty_cells = 0
+
+        for cell in row_cells[:max_col - 1]:  # Exclude rightmost column
             if cell.value is None or str(cell.value).strip() == "":
                 continue
-            
-            # Check for yellow background fill
-            bg_rgb = get_rgb_str(cell.fill.fgColor if cell.fill else None)
-            if bg_rgb in ['FFFF00', 'FFFFE0', 'FFFFCC']:  # Common yellow shades
-                cells_with_yellow_bg.append((row_num, col_num))
-            
-            # Check for red font
-            font_rgb = get_rgb_str(cell.font.color if cell.font else None)
-            if font_rgb == 'FF0000':  # Red font
-                cells_with_red_font.append((row_num, col_num))
-        
+            nonempty_cells += 1
+
+            is_yellow_bg, is_red_font, _, _ = get_style_flags(cell, style_cache)
+            if is_yellow_bg:
+                cells_with_yellow_bg += 1
+            if is_red_font:
+                cells_with_red_font += 1
+
         # Validate REPEAT rows
         if has_repeat:
-            # Check REPEAT cell formatting (cached access)
-            repeat_font_ok = False
-            repeat_bg_ok = False
-            repeat_bold_ok = False
-            
-            if repeat_cell.font is not None:
-                font_rgb = get_rgb_str(repeat_cell.font.color)
-                if font_rgb == 'FF0000':
-                    repeat_font_ok = True
-                if repeat_cell.font.bold:
-                    repeat_bold_ok = True
-            
-            bg_rgb = get_rgb_str(repeat_cell.fill.fgColor if repeat_cell.fill else None)
-            if bg_rgb in ['FFFF00', 'FFFFE0', 'FFFFCC']:
-                repeat_bg_ok = True
-            
+            # Check REPEAT cell formatting (cached per style id)
+            repeat_bg_ok, repeat_font_ok, repeat_bold_ok, _ = get_style_flags(repeat_cell, style_cache)
+
             # Check if there are other highlighted cells (conflicting indicators)
             if cells_with_yellow_bg:
                 row_issues.append({
                     'row': row_num,
                     'issue_type': 'INEL REPEAT Conflict',
-                    'description': f"Row {row_num}: Has 'REPEAT' marker but also has {len(cells_with_yellow_bg)} other highlighted cell(s) - conflicting INEL reasons"
+                    'description': f"Row {row_num}: Has 'REPEAT' marker but also has {cells_with_yellow_bg} other highlighted cell(s) - conflicting INEL reasons"
                 })
-            
-            # Check if all cells have red font (count non-empty cells efficiently)
-            expected_red_cells = 0
-            for col_num in range(1, max_col):
-                cell = inel_sheet.cell(row_num, col_num)
-                if cell.value is not None and str(cell.value).strip() != "":
-                    expected_red_cells += 1
-            
-            actual_red_cells = len(cells_with_red_font)
-            
-            if actual_red_cells < expected_red_cells:
+
+            # Check if all non-empty cells have red font
+            if cells_with_red_font < nonempty_cells:
                 row_issues.append({
                     'row': row_num,
                     'issue_type': 'INEL REPEAT Formatting',
-                    'description': f"Row {row_num}: REPEAT row should have red font on ALL cells ({actual_red_cells}/{expected_red_cells} cells have red font)"
+                    'description': f"Row {row_num}: REPEAT row should have red font on ALL cells ({cells_with_red_font}/{nonempty_cells} cells have red font)"
                 })
-            
+
             # Check REPEAT cell formatting
             formatting_issues = []
             if not repeat_font_ok:
@@ -984,14 +1489,14 @@ def validate_inel_repeat_rows(inel_sheet, show_progress=False):
                 formatting_issues.append("bold")
             if not repeat_bg_ok:
                 formatting_issues.append("yellow background")
-            
+
             if formatting_issues:
                 row_issues.append({
                     'row': row_num,
                     'issue_type': 'INEL REPEAT Cell Format',
                     'description': f"Row {row_num}: REPEAT cell missing {', '.join(formatting_issues)}"
                 })
-        
+
         # Check rows with no highlighting - they should have REPEAT
         elif not cells_with_yellow_bg:
             # No REPEAT and no highlighted cells = no indication of INEL reason
@@ -1000,11 +1505,30 @@ def validate_inel_repeat_rows(inel_sheet, show_progress=False):
                 'issue_type': 'INEL Missing Reason',
                 'description': f"Row {row_num}: No highlighted cells and no REPEAT marker - no indication of why row is in INEL"
             })
-    
+
     if show_progress and total_rows > 100:
         print()  # New line after progress updates
+
+    return analysis
+
+
+def validate_inel_repeat_rows(inel_sheet, show_progress=False):
+    """
+    Validate INEL tab REPEAT entries.
     
-    return issues, row_issues
+    For rows marked as REPEAT (duplicates):
+    - All cells in the row should have red font (RGB 255, 0, 0)
+    - "REPEAT" should appear in the rightmost column
+    - The "REPEAT" cell should have yellow background fill and bold red font
+    - No other cells should have highlighting (yellow background)
+    
+    For rows with no cell-level highlighting:
+    - They MUST have "REPEAT" marker, otherwise there's no indication why they're in INEL
+    
+    Returns (issues, row_issues) lists.
+    """
+    analysis = analyze_inel_tab(inel_sheet, show_progress=show_progress)
+    return analysis['issues'], analysis['row_issues']
         
         
 # --- Cross-tab consistency checking ---
@@ -1292,25 +1816,52 @@ def _expand_alias_variants(alias):
     return variants
 
 
-def _expand_aliases(aliases):
-    """Expand a list of aliases into a set including all space/underscore variants."""
+@lru_cache(maxsize=None)
+def _expand_alias_tuple(aliases):
     expanded = set()
     for alias in aliases:
         expanded.update(_expand_alias_variants(alias))
-    return expanded
+    return frozenset(expanded)
+
+
+def _expand_aliases(aliases):
+    """Expand a list of aliases into a frozenset including all space/underscore variants.
+    Results are cached, so repeated lookups with the same alias list are free."""
+    return _expand_alias_tuple(tuple(aliases))
+
+
+# Expand the built-in alias families once at import so lookups never rebuild them
+for _alias_family in (MRN_ALIASES, EMAIL_ALIASES, SERVICE_DATE_ALIASES, FACILITY_NAME_ALIASES):
+    _expand_aliases(_alias_family)
+
+# One alternation for all hint keywords. Letter lookarounds give word-boundary
+# matching so that short keywords like "id" don't fire on unrelated words
+# ("provider", "valid", etc.)
+_DATA_HEADER_HINT_RE = re.compile(
+    r'(?<![a-z])(?:' + '|'.join(re.escape(k) for k in _DATA_HEADER_KEYWORD_HINTS) + r')(?![a-z])'
+)
+
+
+@lru_cache(maxsize=8192)
+def _normalize_header_text(text):
+    """Collapse whitespace, strip surrounding quotes, and lowercase header text."""
+    return re.sub(r'\s+', ' ', text).strip().strip('"\'').strip().lower()
+
+
+@lru_cache(maxsize=8192)
+def _text_is_data_block_header(text):
+    normalized = _normalize_header_text(text)
+    compact = normalized.replace(" ", "").replace("_", "").replace("-", "")
+    if normalized in _DATA_BLOCK_HEADER_MARKERS or compact in _DATA_BLOCK_HEADER_MARKERS:
+        return True
+    return _DATA_HEADER_HINT_RE.search(normalized) is not None
 
 
 def _is_likely_data_block_header(value):
     """Return True when a value looks like a patient-data header label."""
     if value is None:
         return False
-    normalized = re.sub(r'\s+', ' ', str(value)).strip().strip('"\'').strip().lower()
-    compact = normalized.replace(" ", "").replace("_", "").replace("-", "")
-    if normalized in _DATA_BLOCK_HEADER_MARKERS or compact in _DATA_BLOCK_HEADER_MARKERS:
-        return True
-    # Use word-boundary matching on the space-preserving normalized form so that
-    # short keywords like "id" don't fire on unrelated words ("provider", "valid", etc.)
-    return any(re.search(r'(?<![a-z])' + re.escape(k) + r'(?![a-z])', normalized) for k in _DATA_HEADER_KEYWORD_HINTS)
+    return _text_is_data_block_header(str(value))
 
 
 def _row_has_data_header_signature(values, min_hits=3):
@@ -1329,21 +1880,105 @@ def _row_has_data_header_signature(values, min_hits=3):
     return False
 
 
-def _detect_sheet_delimiter(sheet, check_rows=15):
+# Number of leading rows searched for header labels (handles title rows / spacing)
+HEADER_SCAN_ROWS = 40
+
+
+class HeaderIndex:
+    """
+    Index of the header cells in the first HEADER_SCAN_ROWS rows of a sheet.
+
+    The rows are read once; every header label is stored under its plain
+    (stripped, lowercased) and normalized (whitespace-collapsed, unquoted) forms,
+    so resolving any alias family (MRN_ALIASES, EMAIL_ALIASES, SERVICE_DATE_ALIASES,
+    FACILITY_NAME_ALIASES, ...) is one dict lookup per alias variant instead of
+    another pass over the sheet. Use get_header_index() to get the shared
+    index for a sheet.
     """
-    Detect if a sheet has data packed into a single column using | or , as a delimiter.
-    This handles POP tabs where all columns are joined into one cell per row.
 
-    Returns (delimiter, header_row_idx, header_parts) or (None, None, None) if normal.
-    Pipe (|) is checked before comma to avoid false positives on data cells that
-    legitimately contain commas (e.g. CPT code strings like "43239,FAC").
+    def __init__(self, sheet, scan_rows=HEADER_SCAN_ROWS):
+        # Don't read past the end of the sheet: iter_rows creates cells for
+        # missing rows, which would grow the sheet's max_row.
+        max_row = sheet.max_row
+        last_row = min(scan_rows, max_row) if max_row else scan_rows
+        self.rows = [
+            tuple(row) for row in sheet.iter_rows(min_row=1, max_row=last_row, values_only=True)
+        ]
+
+        # header text -> [(col_idx, row_idx), ...] in row-major order
+        self._plain = {}
+        self._normalized = {}
+        for row_idx, row in enumerate(self.rows, start=1):
+            for col_idx, cell_value in enumerate(row, start=1):
+                if not cell_value:
+                    continue
+                text = str(cell_value)
+                self._plain.setdefault(text.strip().lower(), []).append((col_idx, row_idx))
+                self._normalized.setdefault(_normalize_header_text(text), []).append((col_idx, row_idx))
+
+        self._delimiter_info = None
+
+    def header_text(self, col_idx, row_idx):
+        """Return the stripped header label at (col_idx, row_idx), or ''."""
+        try:
+            value = self.rows[row_idx - 1][col_idx - 1]
+        except IndexError:
+            return ''
+        return str(value).strip() if value is not None else ''
+
+    def find(self, aliases):
+        """
+        Return (col_idx, header_row) of the first header cell (scanning rows top to
+        bottom, columns left to right) matching any alias variant, or (None, None).
+        """
+        best = None
+        for variant in _expand_aliases(aliases):
+            positions = self._plain.get(variant)
+            if positions:
+                col_idx, row_idx = positions[0]
+                if best is None or (row_idx, col_idx) < (best[1], best[0]):
+                    best = (col_idx, row_idx)
+        return best if best is not None else (None, None)
+
+    def find_all(self, aliases):
+        """
+        Return [(col_idx, header_row), ...] for every column whose header matches an
+        alias variant, in row-major order. Each column is reported once, at the
+        first row where it matches.
+        """
+        first_by_col = {}
+        for variant in _expand_aliases(aliases):
+            for col_idx, row_idx in self._normalized.get(variant, ()):
+                if col_idx not in first_by_col or row_idx < first_by_col[col_idx]:
+                    first_by_col[col_idx] = row_idx
+        return sorted(first_by_col.items(), key=lambda item: (item[1], item[0]))
+
+    def delimiter_info(self, check_rows=15):
+        """Cached _detect_sheet_delimiter result for the indexed rows."""
+        if self._delimiter_info is None:
+            self._delimiter_info = _detect_delimiter_in_rows(self.rows[:check_rows])
+        return self._delimiter_info
+
+
+def get_header_index(sheet):
+    """
+    Return the HeaderIndex for a sheet, building it on first use.
+    The index is kept on the sheet object so every alias lookup on the same
+    sheet shares one scan of its leading rows.
     """
-    for row_idx in range(1, check_rows + 1):
+    index = getattr(sheet, "_audit_header_index", None)
+    if index is None:
+        index = HeaderIndex(sheet)
         try:
-            row = list(sheet.iter_rows(min_row=row_idx, max_row=row_idx, values_only=True))[0]
-        except (IndexError, AttributeError):
-            continue
+            sheet._audit_header_index = index
+        except AttributeError:
+            pass
+    return index
 
+
+def _detect_delimiter_in_rows(rows):
+    """Delimiter detection over already-read rows; see _detect_sheet_delimiter."""
+    for row_idx, row in enumerate(rows, start=1):
         non_empty = [c for c in row if c is not None and str(c).strip()]
         if not non_empty:
             continue
@@ -1361,71 +1996,169 @@ def _detect_sheet_delimiter(sheet, check_rows=15):
     return None, None, None
 
 
-def find_column_in_sheet(sheet, aliases):
+def _detect_sheet_delimiter(sheet, check_rows=15):
     """
-    Like find_column_by_aliases but also handles pipe/comma delimited single-column sheets.
-    Returns a dict with column info, or None if not found:
-      {
-        'col_idx':    int  — 1-based for normal sheets; 0-based position within the split for delimited
-        'header_row': int  — row index where the header was found
-        'delimiter':  str or None
-        'is_delimited': bool
-        'header_name': str
-      }
+    Detect if a sheet has data packed into a single column using | or , as a delimiter.
+    This handles POP tabs where all columns are joined into one cell per row.
+
+    Returns (delimiter, header_row_idx, header_parts) or (None, None, None) if normal.
+    Pipe (|) is checked before comma to avoid false positives on data cells that
+    legitimately contain commas (e.g. CPT code strings like "43239,FAC").
     """
-    # Try normal column layout first
-    col_idx, hdr_row = find_column_by_aliases(sheet, aliases)
-    if col_idx is not None:
-        try:
-            hdr_cells = list(sheet.iter_rows(min_row=hdr_row, max_row=hdr_row, values_only=True))[0]
-            hdr_name = str(hdr_cells[col_idx - 1]).strip()
-        except Exception:
-            hdr_name = ''
-        return {
-            'col_idx': col_idx,
-            'header_row': hdr_row,
-            'delimiter': None,
-            'is_delimited': False,
-            'header_name': hdr_name,
-        }
+    return get_header_index(sheet).delimiter_info(check_rows)
 
-    # Fall back to delimited detection
-    delimiter, hdr_row, parts = _detect_sheet_delimiter(sheet)
-    if delimiter is None:
-        return None
 
+class DelimitedSheetView:
+    """
+    Multi-column view of a sheet whose rows are packed into column A with a
+    delimiter (see _detect_sheet_delimiter).
+
+    Every row is split once when the view is built; blank fields become None,
+    like empty cells in a normal sheet. The view supports the read-only subset
+    of the worksheet interface used by the audit helpers (title, max_row,
+    max_column, iter_rows(..., values_only=True)), so delimited and normal POP
+    tabs are read the same way. With quote_aware=True, rows containing quotes
+    are parsed as CSV so quoted fields may contain the delimiter.
+    """
+
+    def __init__(self, sheet, delimiter, quote_aware=False):
+        self.sheet = sheet
+        self.title = sheet.title
+        self.delimiter = delimiter
+        self.quote_aware = quote_aware
+        self._rows = [
+            self._split(row[0] if row else None) for row in sheet.iter_rows(values_only=True)
+        ]
+        self.max_row = len(self._rows)
+        self.max_column = max((len(row) for row in self._rows), default=0)
+
+    def _split(self, raw):
+        if raw is None:
+            return ()
+        text = str(raw)
+        parts = None
+        if self.quote_aware and '"' in text:
+            try:
+                parts = next(csv.reader([text], delimiter=self.delimiter))
+            except (csv.Error, StopIteration):
+                parts = None
+        if parts is None:
+            parts = text.split(self.delimiter)
+        return tuple(part.strip() or None for part in parts)
+
+    def iter_rows(self, min_row=1, max_row=None, values_only=True):
+        if not values_only:
+            raise ValueError("DelimitedSheetView only supports values_only=True")
+        last_row = self.max_row if max_row is None else min(max_row, self.max_row)
+        for row_idx in range(max(min_row, 1) - 1, last_row):
+            yield self._rows[row_idx]
+
+
+def get_delimited_view(sheet):
+    """
+    Return the DelimitedSheetView for a sheet, or None if the sheet is not a
+    single-column delimited layout. The view is built once and kept on the sheet.
+    Comma-delimited rows are parsed quote-aware (CSV exports quote fields that
+    contain commas); pipe-delimited rows are split as-is.
+    """
+    if hasattr(sheet, "_audit_delimited_view"):
+        return sheet._audit_delimited_view
+    delimiter, _, _ = _detect_sheet_delimiter(sheet)
+    view = DelimitedSheetView(sheet, delimiter, quote_aware=(delimiter == ',')) if delimiter else None
+    try:
+        sheet._audit_delimited_view = view
+    except AttributeError:
+        pass
+    return view
+
+
+def _delimited_header_positions(sheet, aliases):
+    """
+    For a delimited sheet, return (view, header_row, [(col_idx, header_text), ...])
+    for the header fields matching any alias, or (None, None, []) if the sheet is
+    not delimited. col_idx is 1-based within the view.
+    """
+    view = get_delimited_view(sheet)
+    if view is None:
+        return None, None, []
+    _, hdr_row, _ = _detect_sheet_delimiter(sheet)
     expanded = _expand_aliases(aliases)
-    for pos, part in enumerate(parts):
-        cell_str = re.sub(r'\s+', ' ', part).strip().strip('"\'').strip().lower()
-        if cell_str in expanded:
+    header_parts = next(view.iter_rows(min_row=hdr_row, max_row=hdr_row), ())
+    matches = [
+        (col_idx, part)
+        for col_idx, part in enumerate(header_parts, start=1)
+        if part is not None and _normalize_header_text(part) in expanded
+    ]
+    return view, hdr_row, matches
+
+
+def sheet_for_column(sheet, col_info):
+    """
+    Return the sheet to read data rows from for a column found by
+    find_column_in_sheet: the delimited view for delimited layouts, else the sheet.
+    """
+    if col_info is not None and col_info['is_delimited']:
+        return get_delimited_view(sheet)
+    return sheet
+
+
+def find_column_in_sheet(sheet, aliases, delimited=None):
+    """
+    Like find_column_by_aliases but also handles pipe/comma delimited single-column sheets.
+    Returns a dict with column info, or None if not found:
+      {
+        'col_idx':    int  — 1-based column index; for delimited sheets this is the
+                             column within the split rows of the DelimitedSheetView
+        'header_row': int  — row index where the header was found
+        'delimiter':  str or None
+        'is_delimited': bool
+        'header_name': str
+      }
+    Read data rows from sheet_for_column(sheet, col_info) and use get_row_value.
+    delimited=None tries the normal layout first, then the delimited one;
+    True/False restricts the search to that layout.
+    """
+    # Try normal column layout first
+    if delimited is not True:
+        header_index = get_header_index(sheet)
+        col_idx, hdr_row = header_index.find(aliases)
+        if col_idx is not None:
+            hdr_name = header_index.header_text(col_idx, hdr_row)
             return {
-                'col_idx': pos,   # 0-based position within the split
+                'col_idx': col_idx,
                 'header_row': hdr_row,
-                'delimiter': delimiter,
-                'is_delimited': True,
-                'header_name': part,
+                'delimiter': None,
+                'is_delimited': False,
+                'header_name': hdr_name,
             }
+        if delimited is False:
+            return None
 
-    return None
+    # Fall back to delimited detection
+    view, hdr_row, matches = _delimited_header_positions(sheet, aliases)
+    if not matches:
+        return None
+
+    col_idx, part = matches[0]
+    return {
+        'col_idx': col_idx,
+        'header_row': hdr_row,
+        'delimiter': view.delimiter,
+        'is_delimited': True,
+        'header_name': part,
+    }
 
 
 def get_row_value(row, col_info):
     """
-    Extract the value for a column from a data row, handling delimited sheets.
+    Extract the value for a column from a data row.
+    row: a row from sheet_for_column(sheet, col_info) — delimited rows are already split.
     col_info: dict returned by find_column_in_sheet.
     """
     if col_info is None:
         return None
-    if col_info['is_delimited']:
-        cell = row[0] if row else None
-        if cell is None:
-            return None
-        parts = str(cell).split(col_info['delimiter'])
-        idx = col_info['col_idx']
-        return parts[idx].strip() if idx < len(parts) else None
-    else:
-        idx = col_info['col_idx'] - 1
-        return row[idx] if idx < len(row) else None
+    idx = col_info['col_idx'] - 1
+    return row[idx] if idx < len(row) else None
 
 
 def find_column_by_aliases(sheet, aliases):
@@ -1435,80 +2168,100 @@ def find_column_by_aliases(sheet, aliases):
     Handles sheets with rows spaced apart.
     Also checks underscore/space/removed variants of each alias.
     """
-    expanded = _expand_aliases(aliases)
     # Check first few rows for headers (in case of spacing)
-    for header_row_idx in range(1, 41):  # Check first 40 rows
-        try:
-            row = list(
-                sheet.iter_rows(
-                    min_row=header_row_idx, max_row=header_row_idx, values_only=True
-                )
-            )[0]
-            for col_idx, cell_value in enumerate(row, start=1):
-                if cell_value:
-                    cell_str = str(cell_value).strip().lower()
-                    if cell_str in expanded:
-                        return col_idx, header_row_idx
-        except (IndexError, AttributeError):
-            continue
-    return None, None
+    return get_header_index(sheet).find(aliases)
+
+
+def _collect_unique_column_values(rows, columns, deadline=None, sheet=None):
+    """
+    Collect the unique non-empty values of several columns in one traversal.
+
+    rows:    iterable of (row_idx, values) pairs in sheet order
+    columns: list of (first_data_row, value_index) — value_index is 0-based into values
 
+    Each column is collected independently (case-insensitive de-duplication, first
+    spelling kept) and stops on its own once it has values and either the row looks
+    like a patient-data header block or its own cell looks like a header label.
+    The traversal ends as soon as every column has stopped, or at the row where
+    deadline (optional) is reached; sheet is the tab the rows come from, recorded
+    with that row.
 
-def find_all_columns_by_aliases(sheet, aliases):
+    Returns a list of value lists, one per column.
+    """
+    unique_vals = [[] for _ in columns]
+    seen_vals = [set() for _ in columns]
+    active = list(range(len(columns)))
+
+    for row_idx, values in rows:
+        if deadline is not None and deadline.reached(row_idx, sheet):
+            break
+        has_signature = None  # computed at most once per row, only when needed
+        still_active = []
+        for k in active:
+            first_data_row, value_index = columns[k]
+            if row_idx < first_data_row:
+                still_active.append(k)
+                continue
+            vals = unique_vals[k]
+            if vals:
+                if has_signature is None:
+                    has_signature = _row_has_data_header_signature(values)
+                if has_signature:
+                    continue
+            val = values[value_index] if value_index < len(values) else None
+            val_str = str(val).strip() if val is not None else ""
+            if val_str:
+                if vals and _is_likely_data_block_header(val_str):
+                    continue
+                val_lower = val_str.lower()
+                if val_lower not in seen_vals[k]:
+                    seen_vals[k].add(val_lower)
+                    vals.append(val_str)
+            still_active.append(k)
+        active = still_active
+        if not active:
+            break
+
+    return unique_vals
+
+
+def find_all_columns_by_aliases(sheet, aliases, deadline=None):
     """
     Find ALL columns in the sheet that match any alias in the list.
     Returns a list of dicts: [{'col': 1-based col index, 'header_row': row index,
                                'header_name': original header text, 'values': list of unique non-empty values}]
+    Values for every matched column are collected in a single pass over the sheet.
     """
-    expanded = _expand_aliases(aliases)
+    header_index = get_header_index(sheet)
+    matches = header_index.find_all(aliases)
+    if not matches:
+        return []
+
+    first_data_row = min(header_row_idx for _, header_row_idx in matches) + 1
+    all_values = _collect_unique_column_values(
+        enumerate(sheet.iter_rows(min_row=first_data_row, values_only=True), start=first_data_row),
+        [(header_row_idx + 1, col_idx - 1) for col_idx, header_row_idx in matches],
+        deadline=deadline, sheet=sheet,
+    )
+
     found = []
-    seen_cols = set()
-    for header_row_idx in range(1, 41):  # Check first 40 rows
-        try:
-            row = list(
-                sheet.iter_rows(
-                    min_row=header_row_idx, max_row=header_row_idx, values_only=True
-                )
-            )[0]
-            for col_idx, cell_value in enumerate(row, start=1):
-                if cell_value and col_idx not in seen_cols:
-                    # Normalize: collapse all whitespace, strip quotes, lowercase
-                    cell_str = re.sub(r'\s+', ' ', str(cell_value)).strip().strip('"\'').strip().lower()
-                    if cell_str in expanded:
-                        # Collect all unique non-empty values from this column
-                        unique_vals = []
-                        seen_vals = set()
-                        for data_row in sheet.iter_rows(min_row=header_row_idx + 1, values_only=True):
-                            val = data_row[col_idx - 1] if len(data_row) >= col_idx else None
-                            if unique_vals and _row_has_data_header_signature(data_row):
-                                break
-                            if val is not None and str(val).strip():
-                                if unique_vals and _is_likely_data_block_header(val):
-                                    break
-                                val_str = str(val).strip()
-                                val_lower = val_str.lower()
-                                if val_lower not in seen_vals:
-                                    seen_vals.add(val_lower)
-                                    unique_vals.append(val_str)
-                        found.append({
-                            'col': col_idx,
-                            'header_row': header_row_idx,
-                            'header_name': str(cell_value).strip(),
-                            'values': unique_vals,
-                        })
-                        seen_cols.add(col_idx)
-        except (IndexError, AttributeError):
-            continue
+    for (col_idx, header_row_idx), unique_vals in zip(matches, all_values):
+        found.append({
+            'col': col_idx,
+            'header_row': header_row_idx,
+            'header_name': header_index.header_text(col_idx, header_row_idx),
+            'values': unique_vals,
+        })
     return found
 
 
-def find_all_columns_in_sheet(sheet, aliases):
+def find_all_columns_in_sheet(sheet, aliases, deadline=None):
     """
     Like find_all_columns_by_aliases but also handles pipe/comma delimited single-column sheets.
     Returns a list of match dicts (header_name, values, col_idx, header_row, is_delimited, delimiter).
     Tries normal layout first; if nothing found, falls back to delimiter detection.
     """
-    results = find_all_columns_by_aliases(sheet, aliases)
+    results = find_all_columns_by_aliases(sheet, aliases, deadline=deadline)
     if results:
         for r in results:
             r['is_delimited'] = False
@@ -1516,40 +2269,26 @@ def find_all_columns_in_sheet(sheet, aliases):
         return results
 
     # Fall back to delimiter detection
-    delimiter, hdr_row, parts = _detect_sheet_delimiter(sheet)
-    if delimiter is None:
+    view, hdr_row, matches = _delimited_header_positions(sheet, aliases)
+    if not matches:
         return []
 
-    expanded = _expand_aliases(aliases)
+    all_values = _collect_unique_column_values(
+        enumerate(view.iter_rows(min_row=hdr_row + 1), start=hdr_row + 1),
+        [(hdr_row + 1, col_idx - 1) for col_idx, _ in matches],
+        deadline=deadline, sheet=sheet,
+    )
+
     found = []
-    for pos, part in enumerate(parts):
-        cell_str = re.sub(r'\s+', ' ', part).strip().strip('"\'').strip().lower()
-        if cell_str in expanded:
-            unique_vals = []
-            seen_vals = set()
-            for data_row in sheet.iter_rows(min_row=hdr_row + 1, values_only=True):
-                raw = data_row[0] if data_row else None
-                if raw is None:
-                    continue
-                row_parts = str(raw).split(delimiter)
-                if unique_vals and _row_has_data_header_signature(row_parts):
-                    break
-                val = row_parts[pos].strip() if pos < len(row_parts) else ''
-                if val:
-                    if unique_vals and _is_likely_data_block_header(val):
-                        break
-                    if val.lower() in seen_vals:
-                        continue
-                    seen_vals.add(val.lower())
-                    unique_vals.append(val)
-            found.append({
-                'col_idx': pos,
-                'header_row': hdr_row,
-                'header_name': part,
-                'values': unique_vals,
-                'is_delimited': True,
-                'delimiter': delimiter,
-            })
+    for (col_idx, part), unique_vals in zip(matches, all_values):
+        found.append({
+            'col_idx': col_idx,
+            'header_row': hdr_row,
+            'header_name': part,
+            'values': unique_vals,
+            'is_delimited': True,
+            'delimiter': view.delimiter,
+        })
     return found
 
 
@@ -1563,98 +2302,493 @@ def normalize_email(email_val):
     return email_str
 
 
+# --- MRN-keyed cross-tab index ---
+
+def column_info(col_idx, header_row=1, header_name=''):
+    """Build a find_column_in_sheet-style column dict for a known 1-based column."""
+    return {
+        'col_idx': col_idx,
+        'header_row': header_row,
+        'delimiter': None,
+        'is_delimited': False,
+        'header_name': header_name,
+    }
+
+
+class MrnIndex:
+    """
+    MRN-keyed index of one tab (POP, UPLOAD, OASCAPHS, INEL, ...), built in a
+    single pass over its data rows.
+
+    Each non-blank row with an MRN is kept as a record (row_idx, mrn, row) in
+    sheet order; lookups by MRN return the last record for that MRN. Fields are
+    named columns (column dicts as returned by find_column_in_sheet) that can be
+    read from any record, so comparing another field across tabs only needs the
+    column resolved with add_field() — never another scan of the sheet.
+    A deadline (optional) stops the scan early; rows after it are not indexed.
+    """
+
+    def __init__(self, sheet, mrn_info, fields=None, deadline=None):
+        self.sheet = sheet
+        self.title = getattr(sheet, "title", "")
+        self.mrn_info = mrn_info
+        self.fields = dict(fields or {})
+        self.records = []   # (row_idx, mrn, row) in sheet order
+        self._by_mrn = {}   # mrn -> position in records (last occurrence wins)
+
+        start_row = mrn_info['header_row'] + 1
+        source = sheet_for_column(sheet, mrn_info)
+        for row_idx, row in enumerate(source.iter_rows(min_row=start_row, values_only=True), start=start_row):
+            if deadline is not None and deadline.reached(row_idx, source):
+                break
+            if is_blank_row(row):
+                continue
+            mrn_val = get_row_value(row, mrn_info)
+            if not mrn_val:
+                continue
+            mrn = str(mrn_val).strip()
+            if not mrn:
+                continue
+            self._by_mrn[mrn] = len(self.records)
+            self.records.append((row_idx, mrn, row))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, mrn):
+        return mrn in self._by_mrn
+
+    def add_field(self, name, aliases):
+        """Resolve a field by header aliases (same layout as the MRN column). Returns True if found."""
+        info = find_column_in_sheet(self.sheet, aliases, delimited=self.mrn_info['is_delimited'])
+        if info is None:
+            return False
+        self.fields[name] = info
+        return True
+
+    def has_field(self, name):
+        return name in self.fields
+
+    def record(self, mrn):
+        """Return the (row_idx, mrn, row) record for an MRN, or None."""
+        pos = self._by_mrn.get(mrn)
+        return self.records[pos] if pos is not None else None
+
+    def value(self, record, field):
+        """Return a field's value from a record (None if the field is not resolved)."""
+        info = self.fields.get(field)
+        if info is None or record is None:
+            return None
+        return get_row_value(record[2], info)
+
+    def get(self, mrn, field):
+        """Return a field's value for an MRN, or None."""
+        return self.value(self.record(mrn), field)
+
+
+def build_mrn_index(sheet, fields=None, deadline=None):
+    """
+    Build an MrnIndex for a tab whose headers vary (POP, INEL): the MRN column is
+    found with MRN_ALIASES, and fields maps field names to alias lists.
+    Works for normal and pipe/comma delimited layouts. Returns None when no MRN
+    column is found; fields that can't be found are left unresolved.
+    """
+    mrn_info = find_column_in_sheet(sheet, MRN_ALIASES)
+    if mrn_info is None:
+        return None
+    index = MrnIndex(sheet, mrn_info, deadline=deadline)
+    for name, aliases in (fields or {}).items():
+        index.add_field(name, aliases)
+    return index
+
+
+def build_mrn_index_from_headers(sheet, headers, fields=None, mrn_header="MRN"):
+    """
+    Build an MrnIndex for a tab with fixed row-1 headers (OASCAPHS, UPLOAD).
+    headers maps header name -> 1-based column; fields maps field names to
+    header names. Returns None when the MRN header is missing.
+    """
+    mrn_col = headers.get(mrn_header)
+    if not mrn_col:
+        return None
+    field_infos = {}
+    for name, header_name in (fields or {}).items():
+        col = headers.get(header_name)
+        if col:
+            field_infos[name] = column_info(col, header_name=header_name)
+    return MrnIndex(sheet, column_info(mrn_col, header_name=mrn_header), field_infos)
+
+
+def find_field_mismatches(left, right, field, right_field=None, normalize=None):
+    """
+    Hash-join two MrnIndex objects on MRN and compare one field.
+
+    Walks the left index in sheet order; for every record whose MRN is also in
+    the right index, the field values are compared after normalize() (default:
+    stripped string, blank -> None). Only pairs where both values are present
+    and differ are reported.
+
+    Returns [(left_row_idx, mrn, left_value, right_value), ...] with raw values.
+    """
+    if right_field is None:
+        right_field = field
+    if normalize is None:
+        normalize = lambda v: (str(v).strip() or None) if v is not None else None
+
+    mismatches = []
+    if not left.has_field(field) or not right.has_field(right_field):
+        return mismatches
+
+    for record in left.records:
+        right_record = right.record(record[1])
+        if right_record is None:
+            continue
+        left_val = left.value(record, field)
+        right_val = right.value(right_record, right_field)
+        left_norm = normalize(left_val)
+        right_norm = normalize(right_val)
+        if left_norm and right_norm and left_norm != right_norm:
+            mismatches.append((record[0], record[1], left_val, right_val))
+    return mismatches
+
+
 def check_pop_upload_email_consistency(
-    wb, upload_sheet, mrn_col_upload, email_col_upload
+    wb, upload_sheet, mrn_col_upload, email_col_upload, deadline=None
 ):
     """
     Check that emails in UPLOAD tab match those in POP tab for the same MRN.
     Returns list of mismatches: [(upload_row, mrn, upload_email, pop_email), ...]
+    When deadline is reached only the MRNs indexed by then are compared.
     """
-    mismatches = []
-
     # Check if POP tab exists
     if "POP" not in wb.sheetnames:
-        return mismatches  # Can't check without POP tab
-
-    pop_sheet = wb["POP"]
+        return []  # Can't check without POP tab
 
-    # Find MRN and Email columns in POP using aliases — handles both normal and delimited sheets
-    mrn_info = find_column_in_sheet(pop_sheet, MRN_ALIASES)
-    email_info = find_column_in_sheet(pop_sheet, EMAIL_ALIASES)
+    # Index POP by MRN (aliases handle both normal and delimited sheets)
+    pop_index = build_mrn_index(wb["POP"], {'email': EMAIL_ALIASES}, deadline=deadline)
 
-    if mrn_info is None:
+    if pop_index is None:
         return [("N/A", "N/A", "N/A", "Could not locate MRN column in POP tab")]
 
-    if email_info is None:
+    if not pop_index.has_field('email'):
         return [("N/A", "N/A", "N/A", "Could not locate Email column in POP tab")]
 
-    # Build a dictionary of MRN -> Email from POP tab
-    pop_data_start_row = mrn_info['header_row'] + 1
+    upload_index = MrnIndex(
+        upload_sheet,
+        column_info(mrn_col_upload),
+        {'email': column_info(email_col_upload)},
+        deadline=deadline,
+    )
 
-    pop_mrn_to_email = {}
-    for row in pop_sheet.iter_rows(min_row=pop_data_start_row, values_only=True):
-        # Skip completely empty rows
-        if not any(cell is not None and str(cell).strip() != "" for cell in row):
-            continue
+    return [
+        (upload_row, mrn, upload_email or "", normalize_email(pop_email) or "")
+        for upload_row, mrn, upload_email, pop_email in find_field_mismatches(
+            upload_index, pop_index, 'email', normalize=normalize_email
+        )
+    ]
 
-        # Get MRN and Email from this row (works for both normal and delimited sheets)
-        try:
-            mrn_val = get_row_value(row, mrn_info)
-            email_val = get_row_value(row, email_info)
-
-            if mrn_val:
-                mrn_str = str(mrn_val).strip()
-                if mrn_str:
-                    # Store normalized email
-                    pop_mrn_to_email[mrn_str] = normalize_email(email_val)
-        except (IndexError, AttributeError):
-            continue
 
-    # Now compare UPLOAD tab against POP data
-    for upload_row_idx, row in enumerate(
-        upload_sheet.iter_rows(min_row=2, values_only=True), start=2
-    ):
-        # Skip empty rows
-        if not any(cell is not None and str(cell).strip() != "" for cell in row):
-            continue
+# --- UPLOAD vs OASCAPHS row alignment ---
 
-        try:
-            upload_mrn = row[mrn_col_upload - 1] if mrn_col_upload <= len(row) else None
-            upload_email = (
-                row[email_col_upload - 1] if email_col_upload <= len(row) else None
-            )
+def _longest_increasing_pairs(pairs):
+    """
+    Return the longest subsequence of (i, j) pairs (given in increasing i) whose
+    j values are strictly increasing. Patience sorting, O(n log n).
+    """
+    tails = []       # smallest tail j of an increasing run of each length
+    tail_pos = []    # index into pairs of that tail
+    prev = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        length = bisect_left(tails, j)
+        if length == len(tails):
+            tails.append(j)
+            tail_pos.append(k)
+        else:
+            tails[length] = j
+            tail_pos[length] = k
+        prev[k] = tail_pos[length - 1] if length > 0 else -1
 
-            if not upload_mrn:
-                continue
+    result = []
+    k = tail_pos[-1] if tail_pos else -1
+    while k != -1:
+        result.append(pairs[k])
+        k = prev[k]
+    result.reverse()
+    return result
 
-            mrn_str = str(upload_mrn).strip()
-            upload_email_norm = normalize_email(upload_email)
-
-            # Check if this MRN exists in POP
-            if mrn_str in pop_mrn_to_email:
-                pop_email_norm = pop_mrn_to_email[mrn_str]
-
-                # Compare emails (only flag if both exist and differ)
-                if upload_email_norm and pop_email_norm:
-                    if upload_email_norm != pop_email_norm:
-                        mismatches.append(
-                            (
-                                upload_row_idx,
-                                mrn_str,
-                                upload_email or "",
-                                pop_mrn_to_email[mrn_str] or "",
-                            )
-                        )
-        except (IndexError, AttributeError):
-            continue
 
-    return mismatches
+_ALIGN_SIMILARITY_LIMIT = 2500  # max gap rows squared for similarity pairing
 
 
-def extract_service_date_range(sheet, svc_col, mrn_col=None, cms_col=None):
+def _align_row_keys(left_keys, right_keys):
+    """
+    Align two sequences of row keys (tuples of normalized cell values) in
+    near-linear time.
+
+    Anchors are keys that occur exactly once on each side and stay in order
+    (longest increasing subsequence, as in patience diff); the gaps between
+    anchors are then matched on equal leading/trailing keys. Leftover rows with
+    equal keys on both sides are paired as moved. Remaining rows inside the
+    same gap are paired as changed rows: positionally when both sides have the
+    same number left, otherwise by most equal fields (at least half).
+
+    Returns a dict of lists:
+      'same':    [(i, j), ...] matched in order
+      'moved':   [(i, j), ...] equal keys at out-of-order positions
+      'changed': [(i, j), ...] different keys paired within a gap
+      'left':    [i, ...] only in left
+      'right':   [j, ...] only in right
+    """
+    n_left, n_right = len(left_keys), len(right_keys)
+    left_counts = Counter(left_keys)
+    right_counts = Counter(right_keys)
+    right_unique_pos = {k: j for j, k in enumerate(right_keys) if right_counts[k] == 1}
+    candidates = [
+        (i, right_unique_pos[k])
+        for i, k in enumerate(left_keys)
+        if left_counts[k] == 1 and k in right_unique_pos
+    ]
+    anchors = _longest_increasing_pairs(candidates)
+
+    same = []
+    gaps = []  # (left_start, left_end, right_start, right_end)
+    prev_i, prev_j = -1, -1
+    for anchor_i, anchor_j in anchors + [(n_left, n_right)]:
+        li, lj = prev_i + 1, prev_j + 1
+        hi, hj = anchor_i, anchor_j
+        while li < hi and lj < hj and left_keys[li] == right_keys[lj]:
+            same.append((li, lj))
+            li += 1
+            lj += 1
+        suffix = []
+        while hi > li and hj > lj and left_keys[hi - 1] == right_keys[hj - 1]:
+            hi -= 1
+            hj -= 1
+            suffix.append((hi, hj))
+        same.extend(reversed(suffix))
+        if li < hi or lj < hj:
+            gaps.append((li, hi, lj, hj))
+        if anchor_i < n_left:
+            same.append((anchor_i, anchor_j))
+        prev_i, prev_j = anchor_i, anchor_j
+
+    # Rows left over in the gaps with an equal key on the other side were moved
+    right_leftover = defaultdict(deque)
+    for _, _, lj, hj in gaps:
+        for j in range(lj, hj):
+            right_leftover[right_keys[j]].append(j)
+    moved = []
+    moved_left = set()
+    moved_right = set()
+    for li, hi, _, _ in gaps:
+        for i in range(li, hi):
+            candidates_j = right_leftover.get(left_keys[i])
+            if candidates_j:
+                j = candidates_j.popleft()
+                moved.append((i, j))
+                moved_left.add(i)
+                moved_right.add(j)
+
+    changed = []
+    left_only = []
+    right_only = []
+    for li, hi, lj, hj in gaps:
+        rest_left = [i for i in range(li, hi) if i not in moved_left]
+        rest_right = [j for j in range(lj, hj) if j not in moved_right]
+        if len(rest_left) == len(rest_right) or len(rest_left) * len(rest_right) > _ALIGN_SIMILARITY_LIMIT:
+            n_pairs = min(len(rest_left), len(rest_right))
+            gap_pairs = list(zip(rest_left[:n_pairs], rest_right[:n_pairs]))
+        else:
+            # Uneven small gap: pair each row with the most similar row opposite,
+            # so a deleted row is reported as missing rather than shifting the rest
+            scored = sorted(
+                (
+                    (-sum(a == b for a, b in zip(left_keys[i], right_keys[j])), i, j)
+                    for i in rest_left
+                    for j in rest_right
+                ),
+            )
+            used_left, used_right = set(), set()
+            gap_pairs = []
+            for neg_score, i, j in scored:
+                if i in used_left or j in used_right or -neg_score * 2 < len(left_keys[i]):
+                    continue
+                used_left.add(i)
+                used_right.add(j)
+                gap_pairs.append((i, j))
+        paired_left = {i for i, _ in gap_pairs}
+        paired_right = {j for _, j in gap_pairs}
+        changed.extend(sorted(gap_pairs))
+        left_only.extend(i for i in rest_left if i not in paired_left)
+        right_only.extend(j for j in rest_right if j not in paired_right)
+
+    if moved:
+        # Moved pairs inside the LIS of all pairs are really in order; only the rest are out of order
+        in_order = set(_longest_increasing_pairs(sorted(same + moved)))
+        same = sorted(p for p in same + moved if p in in_order)
+        moved = sorted(p for p in moved if p not in in_order)
+
+    return {
+        'same': same,
+        'moved': moved,
+        'changed': changed,
+        'left': left_only,
+        'right': right_only,
+    }
+
+
+def diff_upload_oascaphs(oas_sheet, oas_headers, upload_sheet, upload_headers, ignore_cols=(),
+                         deadline=None):
+    """
+    Compare the UPLOAD tab against OASCAPHS row by row, even when row counts differ.
+
+    Rows are matched on MRN (hash join). When an MRN appears more than once, or
+    when MRN is missing, rows are aligned on their full-row values instead (see
+    _align_row_keys), so one inserted or deleted row doesn't misalign every row
+    after it. Matched rows that fall outside the longest in-order run are
+    reported as reordered. Values are compared on the shared columns minus
+    ignore_cols.
+
+    Returns a list of dicts sorted by OASCAPHS row:
+      {'kind': 'mismatch' | 'missing_upload' | 'missing_oascaphs' | 'reordered',
+       'oas_row': int or None, 'upload_row': int or None,
+       'oas_values': row tuple or None,
+       'fields': [(column, oascaphs_value, upload_value), ...]  (mismatch only)}
+    Returns None when deadline is reached while reading the tabs: rows not
+    read yet would show up as missing, so nothing is reported.
+    """
+    common_cols = sorted(
+        set(upload_headers.keys()).intersection(oas_headers.keys())
+        - set(ignore_cols)
+        - {None}
+    )
+
+    def _norm(v):
+        return "" if v is None else str(v).strip()
+
+    def _data_rows(sheet, headers):
+        rows = []
+        for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+            if deadline is not None and deadline.reached(r, sheet):
+                return None
+            if is_blank_row(row):
+                continue
+            key = tuple(
+                _norm(row[headers[col] - 1]) if headers[col] - 1 < len(row) else ""
+                for col in common_cols
+            )
+            rows.append((r, row, key))
+        return rows
+
+    oas_rows = _data_rows(oas_sheet, oas_headers)
+    up_rows = _data_rows(upload_sheet, upload_headers) if oas_rows is not None else None
+    if up_rows is None:
+        return None
+
+    pairs = []          # (oas position, upload position)
+    oas_missing = []    # oas positions
+    up_missing = []     # upload positions
+
+    def _align_groups(oas_positions, up_positions):
+        alignment = _align_row_keys(
+            [oas_rows[i][2] for i in oas_positions],
+            [up_rows[j][2] for j in up_positions],
+        )
+        for i, j in alignment['same'] + alignment['moved'] + alignment['changed']:
+            pairs.append((oas_positions[i], up_positions[j]))
+        oas_missing.extend(oas_positions[i] for i in alignment['left'])
+        up_missing.extend(up_positions[j] for j in alignment['right'])
+
+    oas_mrn_col = oas_headers.get("MRN")
+    up_mrn_col = upload_headers.get("MRN")
+    if oas_mrn_col and up_mrn_col:
+        def _group_by_mrn(rows, mrn_col):
+            groups = defaultdict(list)
+            for pos, (_, row, _) in enumerate(rows):
+                mrn = _norm(row[mrn_col - 1]) if mrn_col - 1 < len(row) else ""
+                groups[mrn].append(pos)
+            return groups
+
+        oas_groups = _group_by_mrn(oas_rows, oas_mrn_col)
+        up_groups = _group_by_mrn(up_rows, up_mrn_col)
+        for mrn, oas_positions in oas_groups.items():
+            up_positions = up_groups.get(mrn)
+            if not up_positions:
+                oas_missing.extend(oas_positions)
+            elif mrn and len(oas_positions) == 1 and len(up_positions) == 1:
+                pairs.append((oas_positions[0], up_positions[0]))
+            else:
+                _align_groups(oas_positions, up_positions)
+        for mrn, up_positions in up_groups.items():
+            if mrn not in oas_groups:
+                up_missing.extend(up_positions)
+    else:
+        _align_groups(list(range(len(oas_rows))), list(range(len(up_rows))))
+
+    pairs.sort()
+    in_order = set(_longest_increasing_pairs(pairs))
+
+    results = []
+    for i, j in pairs:
+        oas_r, oas_row, oas_key = oas_rows[i]
+        up_r, up_row, up_key = up_rows[j]
+        if (i, j) not in in_order:
+            results.append({
+                'kind': 'reordered',
+                'oas_row': oas_r,
+                'upload_row': up_r,
+                'oas_values': oas_row,
+                'fields': [],
+            })
+        if oas_key != up_key:
+            fields = []
+            for col, oas_val, up_val in zip(common_cols, oas_key, up_key):
+                if oas_val != up_val:
+                    oas_idx = oas_headers[col] - 1
+                    up_idx = upload_headers[col] - 1
+                    fields.append((
+                        col,
+                        oas_row[oas_idx] if oas_idx < len(oas_row) else None,
+                        up_row[up_idx] if up_idx < len(up_row) else None,
+                    ))
+            results.append({
+                'kind': 'mismatch',
+                'oas_row': oas_r,
+                'upload_row': up_r,
+                'oas_values': oas_row,
+                'fields': fields,
+            })
+    for i in oas_missing:
+        results.append({
+            'kind': 'missing_upload',
+            'oas_row': oas_rows[i][0],
+            'upload_row': None,
+            'oas_values': oas_rows[i][1],
+            'fields': [],
+        })
+    for j in up_missing:
+        results.append({
+            'kind': 'missing_oascaphs',
+            'oas_row': None,
+            'upload_row': up_rows[j][0],
+            'oas_values': None,
+            'fields': [],
+        })
+
+    kind_order = {'missing_upload': 0, 'reordered': 1, 'mismatch': 2, 'missing_oascaphs': 3}
+    results.sort(key=lambda d: (
+        d['oas_row'] if d['oas_row'] is not None else float('inf'),
+        d['upload_row'] if d['upload_row'] is not None else 0,
+        kind_order[d['kind']],
+    ))
+    return results
+
+
+def extract_service_date_range(sheet, svc_col, mrn_col=None, cms_col=None, deadline=None):
     """
     Extract the earliest and latest service dates from the SERVICE DATE column.
-    Also validates that no SERVICE DATE fields are blank.
+    Also validates that no SERVICE DATE fields are blank. A deadline (optional)
+    stops the scan; the range then only covers the rows read.
     
     Returns: (date_range_str, blank_date_issues, blank_date_row_issues)
         - date_range_str: "MM/DD/YYYY - MM/DD/YYYY" or None if no valid dates
@@ -1670,6 +2804,8 @@ def extract_service_date_range(sheet, svc_col, mrn_col=None, cms_col=None):
     valid_dates = []
     
     for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+        if deadline is not None and deadline.reached(r, sheet):
+            break
         if is_blank_row(row):
             continue
         
@@ -1712,42 +2848,74 @@ def extract_service_date_range(sheet, svc_col, mrn_col=None, cms_col=None):
     return None, blank_date_issues, blank_date_row_issues
 
 
-def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_issues, filename_year=None):
-    """
-    Perform data quality validation checks on OASCAPHS sheet columns.
-    Returns updated issues and row_issues lists.
-    """
-    from collections import defaultdict
+# Row-local checks in column_validations run in a process pool for sheets with
+# at least this many data rows (see _validate_row_chunk)
+PARALLEL_VALIDATION_MIN_ROWS = 50000
+PARALLEL_VALIDATION_MAX_WORKERS = 8
 
-    svc_col = headers.get("SERVICE DATE")
-    age_col = headers.get("AGE")
-    email_col = headers.get("EMAIL ADDRESS")
-    lang_col = headers.get("SURVEY LANGUAGE")
-    tel_col = headers.get("TELEPHONE")
-    dob_col = headers.get("DATE OF BIRTH")
-    name_col = headers.get("PATIENT NAME")
-    gender_col = headers.get("GENDER")
+# Column values handed to _validate_row_chunk, in this order
+_ROW_CHECK_FIELDS = (
+    "mrn", "cms", "em", "gender", "svc", "age", "dob", "email", "lang", "tel", "name",
+)
 
-    # Track service dates to check they're all in the same month
-    service_dates = []
-    # Track MRNs to check for duplicates
-    mrn_tracker = defaultdict(list)
+_PLACEHOLDER_NAMES = {
+    "test",
+    "patient",
+    "sample",
+    "john doe",
+    "jane doe",
+    "asdf",
+    "qwerty",
+    "foo bar",
+}
 
-    for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-        if is_blank_row(row):
-            continue
 
-        mrn_val = row[mrn_col - 1] if mrn_col else None
-        cms_val = row[cms_col - 1] if cms_col else None
-        em_val = row[em_col - 1] if em_col else None
+def _validate_row_chunk(task):
+    """
+    Run the row-local column_validations checks on a contiguous chunk of rows.
 
-        # Track MRN for duplicate check
-        if mrn_val:
-            mrn_tracker[mrn_val].append(r)
+    task is (rows, present): rows is a list of (row_idx, values) with values
+    ordered as _ROW_CHECK_FIELDS, present the matching tuple of
+    "column exists" flags. Module-level so it can run in a worker process.
+
+    Returns (row_issues, service_dates, phone_issues, name_issues) in row order;
+    the three issue lists are kept apart because column_validations reports
+    them in separate sections.
+    """
+    rows, present = task
+    (_, has_cms, has_em, has_gender, has_svc, has_age, has_dob,
+     has_email, has_lang, has_tel, has_name) = present
+    row_issues = []
+    service_dates = []
+    phone_issues = []
+    name_issues = []
+
+    for r, values in rows:
+        (mrn_val, cms_val, em_val, gender_val, svc_val, age_val, dob_val,
+         email_val, lang_val, tel_val, name_val) = values
+
+        # Telephone and placeholder-name checks are reported after the sheet-wide
+        # checks, but they don't depend on the checks below, so run them first
+        # (the service-date check can skip the rest of the row)
+        if has_tel:
+            _check_row_telephone(r, mrn_val, cms_val, tel_val, phone_issues)
+        if has_name and name_val and str(name_val).strip():
+            name_str = str(name_val).strip().lower()
+            for name in _PLACEHOLDER_NAMES:
+                if name in name_str:
+                    name_issues.append(
+                        {
+                            "row": r,
+                            "mrn": mrn_val,
+                            "cms": cms_val,
+                            "issue_type": "Possible Placeholder Name",
+                            "description": f"Patient Name '{name_val}' may be a placeholder or test name",
+                        }
+                    )
+                    break
 
         # GENDER - must be M, F, 0, 1, or 2 (blank is acceptable)
-        if gender_col:
-            gender_val = row[gender_col - 1]
+        if has_gender:
             valid_genders = ["M", "F", "0", "1", "2", "U", "O"]
             gender_str = str(gender_val).strip().upper() if gender_val else ""
             if gender_str and gender_str not in valid_genders:
@@ -1762,8 +2930,7 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
                 )
 
         # SERVICE DATE - validate format and collect all dates for month validation
-        if svc_col:
-            svc_val = row[svc_col - 1]
+        if has_svc:
             if svc_val:
                 # Convert to string for validation
                 if isinstance(svc_val, datetime.datetime):
@@ -1815,8 +2982,7 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
                     )
 
         # AGE - must be 18 or older (only matters when CMS=1)
-        if age_col:
-            age_val = row[age_col - 1]
+        if has_age:
             try:
                 age_int = int(float(str(age_val))) if age_val is not None else None
                 cms_int = (
@@ -1839,8 +3005,7 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
                 pass
 
         # make sure date of birth is valid (day, month, and year are present and not in the future). it should look exactly like this: 01/01/2025, for example
-        if dob_col:
-            dob_val = row[dob_col - 1]
+        if has_dob:
             if dob_val:
                 ok, normalized, err = parse_dob(dob_val)
                 if not ok:
@@ -1856,8 +3021,7 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
                     )
 
         # EMAIL ADDRESS - validate format when present; require it for CMS=2
-        if email_col:
-            email_val = row[email_col - 1]
+        if has_email:
             if email_val and str(email_val).strip():
                 email_str = str(email_val).strip()
                 # Use email-validator for RFC-compliant syntax checking (no DNS)
@@ -1902,8 +3066,7 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
                     )
 
         # SURVEY LANGUAGE - must be en, es, ko, zh, or m (lowercase)
-        if lang_col:
-            lang_val = row[lang_col - 1]
+        if has_lang:
             valid_langs = ["en", "es", "ko", "zh", "m"]
             lang_str = str(lang_val).strip() if lang_val else ""
             if not lang_str or lang_str not in valid_langs:
@@ -1920,7 +3083,7 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
         # E/M and CMS INDICATOR logic
         # - If CMS=1, E/M must be 'E' or 'M'
         # - If CMS=2, E/M should NOT be 'E' or 'M'
-        if cms_col and em_col:
+        if has_cms and has_em:
             try:
                 cms_int = (
                     int(float(str(cms_val)))
@@ -1954,6 +3117,154 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
             except (ValueError, TypeError):
                 pass
 
+    return row_issues, service_dates, phone_issues, name_issues
+
+
+def _check_row_telephone(r, mrn_val, cms_val, tel_val, phone_issues):
+    """Telephone validity check for one row (phonenumbers, US region)."""
+    # CMS=2 patients are contacted by email only — skip phone checks
+    try:
+        if cms_val is not None and int(cms_val) == 2:
+            return
+    except (ValueError, TypeError):
+        pass
+
+    if tel_val and str(tel_val).strip():
+        tel_str = str(tel_val).strip()
+        try:
+            phone_number = phonenumbers.parse(tel_str, "US")
+            if not phonenumbers.is_valid_number(phone_number):
+                phone_issues.append(
+                    {
+                        "row": r,
+                        "mrn": mrn_val,
+                        "cms": cms_val,
+                        "issue_type": "Invalid Telephone Number",
+                        "description": f"Telephone '{tel_str}' is not a valid number",
+                    }
+                )
+        except phonenumbers.NumberParseException:
+            phone_issues.append(
+                {
+                    "row": r,
+                    "mrn": mrn_val,
+                    "cms": cms_val,
+                    "issue_type": "Invalid Telephone Number Format",
+                    "description": f"Telephone '{tel_str}' has invalid format",
+                }
+            )
+
+
+# Rows checked between deadline checks in the serial path of column_validations
+VALIDATION_DEADLINE_CHUNK = 2000
+
+
+def _validation_worker_count(n_rows, workers):
+    """
+    Number of processes for row-local validation. workers=None picks one per
+    CPU (up to PARALLEL_VALIDATION_MAX_WORKERS) for sheets with at least
+    PARALLEL_VALIDATION_MIN_ROWS rows. Always 1 inside a daemon process
+    (e.g. an --all pool worker), which can't start its own pool.
+    """
+    import multiprocessing
+
+    if multiprocessing.current_process().daemon:
+        return 1
+    if workers is None:
+        if n_rows < PARALLEL_VALIDATION_MIN_ROWS:
+            return 1
+        workers = min(multiprocessing.cpu_count(), PARALLEL_VALIDATION_MAX_WORKERS)
+    return max(1, min(workers, n_rows))
+
+
+def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_issues,
+                       filename_year=None, workers=None, deadline=None):
+    """
+    Perform data quality validation checks on OASCAPHS sheet columns.
+    Returns updated issues and row_issues lists.
+
+    The row-local checks (_validate_row_chunk) run on contiguous chunks of
+    rows, in a process pool when _validation_worker_count allows more than one
+    worker; the sheet-wide checks (service month/year, duplicate MRN and phone)
+    are merged here afterwards. Output is identical for any worker count.
+
+    With a Deadline, chunks are checked until it is reached; the rows after
+    that point are left unchecked (deadline.stopped_at is the first one).
+    """
+    columns = (
+        mrn_col,
+        cms_col,
+        em_col,
+        headers.get("GENDER"),
+        headers.get("SERVICE DATE"),
+        headers.get("AGE"),
+        headers.get("DATE OF BIRTH"),
+        headers.get("EMAIL ADDRESS"),
+        headers.get("SURVEY LANGUAGE"),
+        headers.get("TELEPHONE"),
+        headers.get("PATIENT NAME"),
+    )
+    present = tuple(bool(c) for c in columns)
+    tel_col = headers.get("TELEPHONE")
+
+    # One pass over the sheet: keep only the columns the checks read, and
+    # collect the MRN / phone occurrences for the duplicate checks
+    rows = []
+    mrn_tracker = defaultdict(list)
+    phone_tracker = defaultdict(list)
+    for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+        if deadline is not None and deadline.reached(r, sheet):
+            break
+        if is_blank_row(row):
+            continue
+        values = tuple(row[c - 1] if c else None for c in columns)
+        rows.append((r, values))
+        mrn_val, cms_val = values[0], values[1]
+        # Track MRN for duplicate check
+        if mrn_val:
+            mrn_tracker[mrn_val].append(r)
+        tel_val = values[9]
+        if tel_col and tel_val and str(tel_val).strip():
+            phone_tracker[str(tel_val).strip()].append((r, mrn_val, cms_val))
+
+    n_workers = _validation_worker_count(len(rows), workers)
+    timed = deadline is not None and deadline.limit_at is not None
+    if n_workers > 1:
+        from multiprocessing import Pool
+
+        # A few chunks per worker evens out chunks with many invalid emails
+        n_chunks = n_workers * 4
+        size = -(-len(rows) // n_chunks)
+        tasks = [(rows[i:i + size], present) for i in range(0, len(rows), size)]
+        chunk_results = []
+        with Pool(processes=n_workers) as pool:
+            # Leaving the with block terminates chunks still running
+            for i, result in enumerate(pool.imap(_validate_row_chunk, tasks)):
+                chunk_results.append(result)
+                next_row = tasks[i + 1][0][0][0] if i + 1 < len(tasks) else None
+                if timed and next_row is not None and deadline.reached(next_row, sheet):
+                    break
+    elif timed:
+        # Check the deadline every VALIDATION_DEADLINE_CHUNK rows
+        chunk_results = []
+        for i in range(0, len(rows), VALIDATION_DEADLINE_CHUNK):
+            if deadline.reached(rows[i][0], sheet):
+                break
+            chunk_results.append(
+                _validate_row_chunk((rows[i:i + VALIDATION_DEADLINE_CHUNK], present))
+            )
+    else:
+        chunk_results = [_validate_row_chunk((rows, present))]
+
+    service_dates = []
+    phone_issues = []
+    name_issues = []
+    for chunk_issues, chunk_dates, chunk_phone, chunk_names in chunk_results:
+        row_issues.extend(chunk_issues)
+        service_dates.extend(chunk_dates)
+        phone_issues.extend(chunk_phone)
+        name_issues.extend(chunk_names)
+
     # Check all SERVICE DATEs are in the same month
     if service_dates:
         # Get month/year from first date
@@ -1988,10 +3299,10 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
                 )
 
     # Check for duplicate MRNs
-    for mrn, rows in mrn_tracker.items():
-        if len(rows) > 1:
-            rows_str = ", ".join(str(r) for r in rows)
-            for r in rows:
+    for mrn, mrn_rows in mrn_tracker.items():
+        if len(mrn_rows) > 1:
+            rows_str = ", ".join(str(r) for r in mrn_rows)
+            for r in mrn_rows:
                 row_issues.append(
                     {
                         "row": r,
@@ -2004,110 +3315,31 @@ def column_validations(sheet, headers, mrn_col, cms_col, em_col, issues, row_iss
             issues.append(f"OASCAPHS: Duplicate MRN '{mrn}' found in rows {rows_str}")
 
     # check validity of telephone numbers using phonenumbers package
-    if tel_col:
-        for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            if is_blank_row(row):
-                continue
-            tel_val = row[tel_col - 1]
-            mrn_val = row[mrn_col - 1] if mrn_col else None
-            cms_val = row[cms_col - 1] if cms_col else None
-
-            # CMS=2 patients are contacted by email only — skip phone checks
-            try:
-                if cms_val is not None and int(cms_val) == 2:
-                    continue
-            except (ValueError, TypeError):
-                pass
-
-            if tel_val and str(tel_val).strip():
-                tel_str = str(tel_val).strip()
-                try:
-                    phone_number = phonenumbers.parse(tel_str, "US")
-                    if not phonenumbers.is_valid_number(phone_number):
-                        row_issues.append(
-                            {
-                                "row": r,
-                                "mrn": mrn_val,
-                                "cms": cms_val,
-                                "issue_type": "Invalid Telephone Number",
-                                "description": f"Telephone '{tel_str}' is not a valid number",
-                            }
-                        )
-                except phonenumbers.NumberParseException:
-                    row_issues.append(
-                        {
-                            "row": r,
-                            "mrn": mrn_val,
-                            "cms": cms_val,
-                            "issue_type": "Invalid Telephone Number Format",
-                            "description": f"Telephone '{tel_str}' has invalid format",
-                        }
-                    )
+    row_issues.extend(phone_issues)
 
     # Check for duplicate phone numbers (possible accidental copy-paste)
-    if tel_col:
-        phone_tracker = defaultdict(list)
-        for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            if is_blank_row(row):
+    for tel_str, entries in phone_tracker.items():
+        if len(entries) > 1:
+            # Only flag if at least 2 appearances are CMS=1
+            cms1_appearances = sum(
+                1 for _, _, cms_val in entries
+                if cms_val is not None and str(cms_val).strip() == "1"
+            )
+            if cms1_appearances < 2:
                 continue
-            tel_val = row[tel_col - 1]
-            mrn_val = row[mrn_col - 1] if mrn_col else None
-            cms_val = row[cms_col - 1] if cms_col else None
-            if tel_val and str(tel_val).strip():
-                phone_tracker[str(tel_val).strip()].append((r, mrn_val, cms_val))
-        for tel_str, entries in phone_tracker.items():
-            if len(entries) > 1:
-                # Only flag if at least 2 appearances are CMS=1
-                cms1_appearances = sum(
-                    1 for _, _, cms_val in entries
-                    if cms_val is not None and str(cms_val).strip() == "1"
-                )
-                if cms1_appearances < 2:
-                    continue
-                rows_str = ", ".join(str(e[0]) for e in entries)
-                for r, mrn_val, cms_val in entries:
-                    row_issues.append({
-                        "row": r,
-                        "mrn": mrn_val,
-                        "cms": cms_val,
-                        "issue_type": "Duplicate Telephone Number",
-                        "description": f"Phone '{tel_str}' appears in rows: {rows_str}",
-                    })
-                issues.append(f"OASCAPHS: Phone '{tel_str}' appears in rows {rows_str}")
+            rows_str = ", ".join(str(e[0]) for e in entries)
+            for r, mrn_val, cms_val in entries:
+                row_issues.append({
+                    "row": r,
+                    "mrn": mrn_val,
+                    "cms": cms_val,
+                    "issue_type": "Duplicate Telephone Number",
+                    "description": f"Phone '{tel_str}' appears in rows: {rows_str}",
+                })
+            issues.append(f"OASCAPHS: Phone '{tel_str}' appears in rows {rows_str}")
 
     # find placeholder/test names in patient name col
-    if name_col:
-        placeholder_names = {
-            "test",
-            "patient",
-            "sample",
-            "john doe",
-            "jane doe",
-            "asdf",
-            "qwerty",
-            "foo bar",
-        }
-        for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            if is_blank_row(row):
-                continue
-            name_val = row[name_col - 1]
-            mrn_val = row[mrn_col - 1] if mrn_col else None
-            cms_val = row[cms_col - 1] if cms_col else None
-
-            if name_val and str(name_val).strip():
-                name_str = str(name_val).strip().lower()
-                for name in placeholder_names:
-                    if name in name_str:
-                        row_issues.append(
-                            {
-                                "row": r,
-                                "mrn": mrn_val,
-                                "cms": cms_val,
-                                "issue_type": "Possible Placeholder Name",
-                                "description": f"Patient Name '{name_val}' may be a placeholder or test name",
-                            }
-                        )
-                        break
+    row_issues.extend(name_issues)
 
     return issues, row_issues
 
@@ -2190,8 +3422,8 @@ def validate_email_quality(email_str):
     return warnings
 
 
-def check_email_quality_all_rows(sheet, email_col, mrn_col, cms_col):
-    """Scan every row for suspicious email addresses.
+def check_email_quality_all_rows(sheet, email_col, mrn_col, cms_col, deadline=None):
+    """Scan every row for suspicious email addresses (until deadline, if given).
 
     Returns two lists:
         cms1_issues  – list of dicts for CMS=1 rows (high priority)
@@ -2206,6 +3438,8 @@ def check_email_quality_all_rows(sheet, email_col, mrn_col, cms_col):
         return cms1_issues, cms2_issues
 
     for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+        if deadline is not None and deadline.reached(r, sheet):
+            break
         if is_blank_row(row):
             continue
 
@@ -2251,7 +3485,7 @@ def check_email_quality_all_rows(sheet, email_col, mrn_col, cms_col):
 _EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 
 
-def collect_lookup_candidates(sheet, headers, mrn_col, cms_col):
+def collect_lookup_candidates(sheet, headers, mrn_col, cms_col, deadline=None):
     """
     Scan the OASCAPHS sheet for CMS=1 rows that need a manual people-search:
       - Invalid (non-blank) email address
@@ -2259,6 +3493,7 @@ def collect_lookup_candidates(sheet, headers, mrn_col, cms_col):
 
     Rows with at least one valid phone but a bad one are flagged as "reference"
     (show the values, no search links). All others are "lookup" (show search links).
+    Rows after the one where deadline (optional) is reached are not scanned.
 
     Returns a list of dicts:
       {row, mrn, name, city, state, issues: [str, ...], mode, tel_value, cell_value}
@@ -2274,6 +3509,8 @@ def collect_lookup_candidates(sheet, headers, mrn_col, cms_col):
     candidates = []
 
     for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+        if deadline is not None and deadline.reached(r, sheet):
+            break
         if is_blank_row(row):
             continue
 
@@ -1,12 +1,16 @@
 import ast
 import os
-import sys
 import datetime
 import base64
+import html
+import json
+import re
+import tempfile
+from functools import lru_cache
 from tqdm import tqdm
 from dotenv import load_dotenv
 
-from audit_lib_funcs import check_address, check_pop_upload_email_consistency, count_nonempty_rows_after_header, collect_lookup_candidates, build_person_search_urls, check_email_quality_all_rows
+from audit_lib_funcs import AuditBudget, active_stage_timings, check_address, check_pop_upload_email_consistency, count_nonempty_rows_after_header, collect_lookup_candidates, build_person_search_urls, check_email_quality_all_rows, diff_upload_oascaphs
 
 
 def build_report(
@@ -41,15 +45,51 @@ def build_report(
     sid_col=None,
     sid_row_issues=None,
     inel_row_issues=None,
+    inel_count=None,
+    inel_highlighted_count=0,
     sid_prefix=None,
     sid_registry_name=None,
     service_date_range=None,
     blank_date_row_issues=None,
     facility_matches=None,
+    update_info=None,
+    report_writer=None,
+    css_href=None,
+    audit_result=None,
+    row_workers=None,
+    budget=None,
 ):
     """
     Build the HTML audit report for saving as .html
+
+    When report_writer (a ReportWriter) is given, lines are streamed to it as
+    they are produced and it is returned in place of the report_lines list.
+    When audit_result (a dict) is given, the same findings are recorded in it
+    for the JSON/NDJSON output (see save_audit_result). budget (an
+    AuditBudget) times the column, email and address checks, which stop or
+    are skipped when it runs out; every budget event is listed as a warning.
     """
+    if budget is None:
+        budget = AuditBudget()
+    result = audit_result if audit_result is not None else {}
+    result_counts = result.setdefault("counts", {})
+    result_checks = result.setdefault("checks", [])
+
+    def _record_check(check_id, status, message):
+        result_checks.append(
+            {"id": check_id, "status": status, "message": _plain_text(message)}
+        )
+
+    def _skip_check_for_budget(check_id, check_name, stage_labels):
+        # The counts this check compares are partial, so neither pass nor fail
+        issue_msg = (
+            f"{check_name} not checked: {', '.join(stage_labels)} did not "
+            f"finish within the time budget"
+        )
+        report_lines.append(
+            f"<tr><td>{issue_msg}</td><td style='color: orange;'>⚠</td></tr>"
+        )
+        _record_check(check_id, "skipped", issue_msg)
 
     # Track row-based issues separately for table display
     row_issues = []  # List of dicts: {row, mrn, cms, issue_type, description}
@@ -106,7 +146,15 @@ def build_report(
             pass
 
     # Start HTML document with helper function
-    report_lines = _build_html_header(file_path, version, audit_id, sid_prefix, service_date_range)
+    header_lines = _build_html_header(
+        file_path, version, audit_id, sid_prefix, service_date_range,
+        update_info=update_info, css_href=css_href,
+    )
+    if report_writer is not None:
+        report_lines = report_writer
+        report_lines.extend(header_lines)
+    else:
+        report_lines = header_lines
         
     # Add SID row issues if provided
     if sid_row_issues:
@@ -174,59 +222,33 @@ def build_report(
     report_lines.append(
         f"<tr><td>Non-Reported entries (CMS INDICATOR = 2)</td><td>{non_reported}</td></tr>"
     )
+    em_incomplete = budget.incomplete("e_m_totals")
+    if em_incomplete:
+        report_lines.append(
+            "<tr><td colspan='2' style='color: orange;'>⚠ Counts cover only part of OASCAPHS "
+            "(E/M totals did not finish within the time budget)</td></tr>"
+        )
     report_lines.append("</table>")
+    result_counts.update(
+        cms1_count=cms1_count,
+        emails=emails,
+        mailings=mailings,
+        total_em=total_em,
+        non_reported=non_reported,
+    )
 
-    # count rows in INEL and FRAME (needed for validation checks)
-    inel_count = None
-    inel_highlighted_count = 0
-    if "INEL" in wb.sheetnames:
-        inel_sheet = wb["INEL"]
-        # Import SERVICE_DATE_ALIASES and find_column_by_aliases here
-        from audit_lib_funcs import SERVICE_DATE_ALIASES, find_column_by_aliases
-        
-        # Find service date column
-        service_date_col, header_row = find_column_by_aliases(inel_sheet, SERVICE_DATE_ALIASES)
-        start_row = header_row + 1 if header_row else 2
-        
-        # Count rows, but skip ones with highlighted service dates
-        # Optimized: Load all rows at once instead of per-row iter_rows calls
-        inel_count = 0
-        all_rows = list(inel_sheet.iter_rows(min_row=start_row, max_row=inel_sheet.max_row, values_only=False))
-        
-        for row_offset, row_cells in enumerate(tqdm(all_rows, desc="Processing INEL rows", disable=len(all_rows) < 1000)):
-            row_idx = start_row + row_offset
-            # Get row values
-            row = [cell.value for cell in row_cells]
-            
-            # Check if row has any data
-            if not any(cell is not None and str(cell).strip() != "" for cell in row):
-                continue
-            
-            # If we found a service date column, check if it's highlighted
-            skip_row = False
-            if service_date_col:
-                try:
-                    cell = row_cells[service_date_col - 1]  # service_date_col is 1-indexed
-                    # Check if cell has a fill color (is highlighted)
-                    if cell.fill and cell.fill.start_color:
-                        color_index = cell.fill.start_color.index
-                        if color_index and color_index != '00000000' and color_index != 'FFFFFFFF':
-                            skip_row = True
-                except (AttributeError, IndexError):
-                    pass
-            
-            if not skip_row:
-                inel_count += 1
-            else:
-                inel_highlighted_count += 1
-
+    # INEL counts come precomputed from analyze_inel_tab; count FRAME here
+    # (both are needed for validation checks)
     frame_inel_count = None
     if "FRAME" in wb.sheetnames and find_frame_inel_count is not None:
         frame_sheet = wb["FRAME"]
-        try:
-            frame_inel_count = find_frame_inel_count(frame_sheet)
-        except Exception:
-            frame_inel_count = None
+        deadline = budget.start("frame")
+        if not deadline.skipped:
+            try:
+                frame_inel_count = find_frame_inel_count(frame_sheet, deadline=deadline)
+            except Exception:
+                frame_inel_count = None
+        budget.finish(deadline)
 
     # VALIDATION CHECKS
     report_lines.append("<h2>VALIDATION SUMMARY</h2>")
@@ -234,10 +256,16 @@ def build_report(
     # Tab counts in table format
     report_lines.append("<div class='section-subheader'>INELIGIBLE PATIENTS</div>")
     report_lines.append("<table class='data-table'>")
+    inel_incomplete = budget.incomplete("inel")
     if inel_count is not None:
-        report_lines.append(f"<tr><td>Patients in INEL tab</td><td>{inel_count}</td></tr>")
+        partial = " (partial: time budget reached)" if inel_incomplete else ""
+        report_lines.append(f"<tr><td>Patients in INEL tab</td><td>{inel_count}{partial}</td></tr>")
         report_lines.append(
-            f"<tr><td>Patients with ineligible service dates</td><td>{inel_highlighted_count}</td></tr>"
+            f"<tr><td>Patients with ineligible service dates</td><td>{inel_highlighted_count}{partial}</td></tr>"
+        )
+    elif budget.status("inel") == "skipped":
+        report_lines.append(
+            "<tr><td>Patients in INEL tab</td><td>Not counted (time budget used up)</td></tr>"
         )
     else:
         issues.append("INEL tab missing")
@@ -246,11 +274,23 @@ def build_report(
         report_lines.append(
             f"<tr><td>6-month repeats</td><td>{frame_inel_count}</td></tr>"
         )
+    elif budget.incomplete("frame"):
+        report_lines.append(
+            "<tr><td>6-month repeats</td><td>Not counted (time budget used up)</td></tr>"
+        )
 
     total_inel_combined = (inel_count or 0) + (frame_inel_count or 0)
+    result_counts.update(
+        inel_count=inel_count,
+        inel_highlighted_count=inel_highlighted_count,
+        frame_inel_count=frame_inel_count,
+        total_inel_combined=total_inel_combined,
+    )
+    combined_incomplete = budget.incomplete("inel", "frame")
     if patients_submitted is not None:
+        partial_total = " (partial: time budget reached)" if combined_incomplete else ""
         report_lines.append(
-            f"<tr><td>Total Ineligible Patients</td><td>{total_inel_combined}</td></tr>"
+            f"<tr><td>Total Ineligible Patients</td><td>{total_inel_combined}{partial_total}</td></tr>"
         )
     report_lines.append("</table>")
 
@@ -259,33 +299,55 @@ def build_report(
     report_lines.append("<table class='data-table'>")
 
     # Check 1: Sample Size matches Reported
-    if sample_size is not None and cms1_count != sample_size:
+    if sample_size is not None and em_incomplete:
+        _skip_check_for_budget("sample_size_matches_reported", "Sample Size vs CMS=1 rows", em_incomplete)
+    elif sample_size is not None and cms1_count != sample_size:
         issue_msg = f"<strong>WARNING:</strong> Sample Size mismatch: expected {sample_size}, found {cms1_count} rows with CMS=1"
         report_lines.append(
             f"<tr><td style='color: red;'>{issue_msg}</td><td>✗</td></tr>"
         )
         issues.append(issue_msg)
+        _record_check("sample_size_matches_reported", "fail", issue_msg)
     else:
         report_lines.append(
             "<tr><td>Sample Size matches Reported</td><td style='color: #28a745;'>✓</td></tr>"
         )
+        _record_check("sample_size_matches_reported", "pass", "Sample Size matches Reported")
 
     # Check 2: E/M total matches Sample Size
-    if sample_size is not None and total_em != sample_size:
+    if sample_size is not None and em_incomplete:
+        _skip_check_for_budget("em_total_matches_sample_size", "E/M total vs Sample Size", em_incomplete)
+    elif sample_size is not None and total_em != sample_size:
         issue_msg = f"<strong>WARNING:</strong> Reported total mismatch: <strong>{total_em}</strong> vs Sample Size <strong>{sample_size}</strong>"
         report_lines.append(
             f"<tr><td>{issue_msg}</td><td style='color: red;'>✗</td></tr>"
         )
         issues.append(issue_msg)
+        _record_check("em_total_matches_sample_size", "fail", issue_msg)
     else:
         report_lines.append(
             "<tr><td>E/M total matches Sample Size</td><td style='color: #28a745;'>✓</td></tr>"
         )
+        _record_check("em_total_matches_sample_size", "pass", "E/M total matches Sample Size")
+
+    # Row counts for checks 3 and 4 (one scan per tab, see get_sheet_stats)
+    pop_rows = upload_rows = oascaphs_rows = None
+    deadline = budget.start("row_counts")
+    if not deadline.skipped:
+        if "POP" in wb.sheetnames:
+            pop_rows = count_nonempty_rows_after_header(wb["POP"], deadline=deadline)
+        if "UPLOAD" in wb.sheetnames:
+            upload_rows = count_nonempty_rows(wb["UPLOAD"], deadline=deadline)
+            oascaphs_rows = count_nonempty_rows(sheet, deadline=deadline)
+    budget.finish(deadline)
+    row_counts_incomplete = budget.incomplete("row_counts")
 
     # Check 3: Submitted matches POP tab
-    if "POP" in wb.sheetnames and patients_submitted is not None:
-        pop_sheet = wb["POP"]
-        pop_rows = count_nonempty_rows_after_header(pop_sheet)
+    pop_incomplete = budget.incomplete("inel", "row_counts")
+    if "POP" in wb.sheetnames and patients_submitted is not None and pop_incomplete:
+        _skip_check_for_budget("submitted_matches_pop", "Submitted # vs POP tab #", pop_incomplete)
+    elif "POP" in wb.sheetnames and patients_submitted is not None:
+        result_counts["pop_rows"] = pop_rows
         TOL = 4
         expected_submitted = pop_rows - inel_highlighted_count
         if abs(patients_submitted - expected_submitted) > TOL:
@@ -303,10 +365,12 @@ def build_report(
                 f"<tr><td>{issue_msg_with_tooltip}</td><td style='color: red;'>✗</td></tr>"
             )
             issues.append(f"<strong>WARNING:</strong> {issue_msg}")
+            _record_check("submitted_matches_pop", "fail", issue_msg)
         else:
             report_lines.append(
                 "<tr><td>Submitted # matches POP tab #</td><td style='color: #28a745;'>✓</td></tr>"
             )
+            _record_check("submitted_matches_pop", "pass", "Submitted # matches POP tab #")
     else:
         issue_msg = (
             "<strong>WARNING:</strong> POP tab missing or Submitted value not found"
@@ -315,28 +379,32 @@ def build_report(
             f"<tr><td>{issue_msg}</td><td style='color: red;'>✗</td></tr>"
         )
         issues.append(issue_msg)
+        _record_check("submitted_matches_pop", "fail", issue_msg)
 
     # Check 4: UPLOAD and OASCAPHS row counts match
-    if "UPLOAD" in wb.sheetnames:
-        upload_sheet = wb["UPLOAD"]
-        upload_rows = count_nonempty_rows(upload_sheet)
-        oascaphs_rows = count_nonempty_rows(sheet)
+    if "UPLOAD" in wb.sheetnames and row_counts_incomplete:
+        _skip_check_for_budget("upload_row_count_matches", "UPLOAD vs OASCAPHS row counts", row_counts_incomplete)
+    elif "UPLOAD" in wb.sheetnames:
+        result_counts.update(upload_rows=upload_rows, oascaphs_rows=oascaphs_rows)
         if upload_rows != oascaphs_rows:
             issue_msg = f"<strong>WARNING:</strong> UPLOAD mismatch: {upload_rows} rows vs {oascaphs_rows} rows in OASCAPHS"
             report_lines.append(
                 f"<tr><td>{issue_msg}</td><td style='color: red;'>✗</td></tr>"
             )
             issues.append(issue_msg)
+            _record_check("upload_row_count_matches", "fail", issue_msg)
         else:
             report_lines.append(
                 "<tr><td>UPLOAD and OASCAPHS row counts match</td><td style='color: #28a745;'>✓</td></tr>"
             )
+            _record_check("upload_row_count_matches", "pass", "UPLOAD and OASCAPHS row counts match")
     else:
         issue_msg = "UPLOAD tab missing"
         report_lines.append(
             f"<tr><td>{issue_msg}</td><td style='color: red;'>✗</td></tr>"
         )
         issues.append(issue_msg)
+        _record_check("upload_row_count_matches", "fail", issue_msg)
 
     # Check 5: UPLOAD tab has the correct columns (OASCAPHS minus ATT, LAG, ID, FD, LG, E/M)
     upload_only_cols = {"ATT", "LAG", "ID", "FD", "LG", "E/M"}
@@ -353,6 +421,7 @@ def build_report(
             report_lines.append(
                 "<tr><td>UPLOAD tab has correct columns</td><td style='color: #28a745;'>✓</td></tr>"
             )
+            _record_check("upload_columns_match", "pass", "UPLOAD tab has correct columns")
         else:
             parts = []
             if missing_in_upload:
@@ -364,18 +433,24 @@ def build_report(
                 f"<tr><td>{issue_msg}</td><td style='color: red;'>✗</td></tr>"
             )
             issues.append(issue_msg)
+            _record_check("upload_columns_match", "fail", issue_msg)
 
     # Calculate estimated percentage if both values are available
     estimated_percentage = None
     if sample_size is not None and eligible_patients is not None and eligible_patients > 0:
         estimated_percentage = int(round((sample_size / eligible_patients) * 100, 0))
+    result_counts["estimated_percentage"] = estimated_percentage
 
     # Check 5: SID validation
+    sid_incomplete = budget.incomplete("sid")
     if sid_row_issues is not None:
-        if not sid_row_issues:
+        if not sid_row_issues and sid_incomplete:
+            _skip_check_for_budget("sid_sequence", "SID order", sid_incomplete)
+        elif not sid_row_issues:
             report_lines.append(
                 "<tr><td>SIDs present and in order</td><td style='color: #28a745;'>✓</td></tr>"
             )
+            _record_check("sid_sequence", "pass", "SIDs present and in order")
         else:
             issue_types = set(issue['issue_type'] for issue in sid_row_issues)
             issue_summary = ', '.join(issue_types)
@@ -383,18 +458,23 @@ def build_report(
             report_lines.append(
                 f"<tr><td>{issue_msg}</td><td style='color: red;'>✗</td></tr>"
             )
+            _record_check("sid_sequence", "fail", issue_msg)
     else:
         issue_msg = "SID validation not performed"
         report_lines.append(
             f"<tr><td>{issue_msg}</td><td style='color: orange;'>⚠</td></tr>"
         )
+        _record_check("sid_sequence", "skipped", issue_msg)
 
     # Check 6: INEL REPEAT validation
     if inel_row_issues is not None:
-        if not inel_row_issues:
+        if not inel_row_issues and inel_incomplete:
+            _skip_check_for_budget("inel_repeat_format", "INEL REPEAT formatting", inel_incomplete)
+        elif not inel_row_issues:
             report_lines.append(
                 "<tr><td>INEL tab REPEAT entries properly formatted</td><td style='color: #28a745;'>✓</td></tr>"
             )
+            _record_check("inel_repeat_format", "pass", "INEL tab REPEAT entries properly formatted")
         else:
             issue_types = set(issue['issue_type'] for issue in inel_row_issues)
             issue_summary = ', '.join(issue_types)
@@ -402,15 +482,19 @@ def build_report(
             report_lines.append(
                 f"<tr><td>{issue_msg}</td><td style='color: red;'>✗</td></tr>"
             )
+            _record_check("inel_repeat_format", "fail", issue_msg)
     else:
         if "INEL" in wb.sheetnames:
             issue_msg = "INEL REPEAT validation not performed"
             report_lines.append(
                 f"<tr><td>{issue_msg}</td><td style='color: orange;'>⚠</td></tr>"
             )
+            _record_check("inel_repeat_format", "skipped", issue_msg)
 
     # Check 7: Eligible + INEL = Submitted math check
-    if patients_submitted is not None and eligible_patients is not None and inel_count is not None:
+    if patients_submitted is not None and eligible_patients is not None and combined_incomplete:
+        _skip_check_for_budget("eligible_plus_inel_equals_submitted", "Eligible + INEL = Submitted", combined_incomplete)
+    elif patients_submitted is not None and eligible_patients is not None and inel_count is not None:
         math_total = eligible_patients + total_inel_combined
         if math_total != patients_submitted:
             issue_msg = (
@@ -428,10 +512,16 @@ def build_report(
                 f"<tr><td style='background-color: #fff3cd;'>{issue_msg_with_tooltip}</td><td style='color: red;'>✗</td></tr>"
             )
             issues.append(f"<strong>WARNING:</strong> Math error: Eligible ({eligible_patients}) + Combined INEL ({total_inel_combined}) = {math_total}, but Submitted = {patients_submitted}")
+            _record_check("eligible_plus_inel_equals_submitted", "fail", issue_msg)
         else:
             report_lines.append(
                 f"<tr><td>Eligible + INEL = Submitted ({eligible_patients} + {total_inel_combined} = {patients_submitted})</td><td style='color: #28a745;'>✓</td></tr>"
             )
+            _record_check(
+                "eligible_plus_inel_equals_submitted",
+                "pass",
+                f"Eligible + INEL = Submitted ({eligible_patients} + {total_inel_combined} = {patients_submitted})",
+            )
 
     report_lines.append("</table>") # based on month (November=orange, December=green, etc.)
     qtr_header_color = "#2dbd69"  # Default green
@@ -547,6 +637,7 @@ def build_report(
 
     # Show facility/location columns found in POP tab (always, regardless of SID lookup result)
     fac_matches = facility_matches or []
+    result["facility_matches"] = fac_matches
     if fac_matches:
         count_label = f"{len(fac_matches)} column{'s' if len(fac_matches) != 1 else ''} found"
         report_lines.append(
@@ -581,16 +672,24 @@ def build_report(
     # DATA QUALITY VALIDATION SECTION
     from audit_lib_funcs import column_validations
 
-    issues, row_issues = column_validations(
-        sheet, headers, mrn_col, cms_col, em_col, issues, row_issues,
-        filename_year=filename_year
-    )
+    deadline = budget.start("column_validations")
+    if not deadline.skipped:
+        issues, row_issues = column_validations(
+            sheet, headers, mrn_col, cms_col, em_col, issues, row_issues,
+            filename_year=filename_year, workers=row_workers, deadline=deadline,
+        )
+    budget.finish(deadline)
 
     # Email quality / suspicious-email scan
     email_col = headers.get("EMAIL ADDRESS")
-    cms1_email_quality, cms2_email_quality = check_email_quality_all_rows(
-        sheet, email_col, mrn_col, cms_col
-    )
+    deadline = budget.start("email")
+    cms1_email_quality, cms2_email_quality = [], []
+    if not deadline.skipped:
+        cms1_email_quality, cms2_email_quality = check_email_quality_all_rows(
+            sheet, email_col, mrn_col, cms_col, deadline=deadline
+        )
+    budget.finish(deadline)
+    result["email_quality"] = cms1_email_quality + cms2_email_quality
     # CMS=1 potentially invalid emails go into the main issues table
     for eq in cms1_email_quality:
         desc = "; ".join(eq["warnings"])
@@ -611,97 +710,123 @@ def build_report(
     cat_col = headers.get("SURGICAL CATEGORY")
     if cpt_col and cat_col:
         from audit_lib_funcs import is_blank_row
-        
-        all_validation_rows = list(sheet.iter_rows(min_row=2, values_only=True))
-        for r, row in enumerate(tqdm(all_validation_rows, desc="Validating surgical categories", disable=len(all_validation_rows) < 1000), start=2):
-            if is_blank_row(row):
-                continue
-            cpt_val = row[cpt_col - 1]
-            cat_val = row[cat_col - 1]
-            expected = classify_cpt(str(cpt_val) if cpt_val else "")
+
+        deadline = budget.start("surgical_category")
+        if not deadline.skipped:
+            n_validation_rows = max(sheet.max_row - 1, 0)
+            validation_rows = sheet.iter_rows(min_row=2, values_only=True)
+            for r, row in enumerate(tqdm(validation_rows, desc="Validating surgical categories", total=n_validation_rows, disable=n_validation_rows < 1000), start=2):
+                if deadline.reached(r, sheet):
+                    break
+                if is_blank_row(row):
+                    continue
+                cpt_val = row[cpt_col - 1]
+                cat_val = row[cat_col - 1]
+                expected = classify_cpt(str(cpt_val) if cpt_val else "")
             
-            # Skip validation if both CPT and surgical category are blank
-            cpt_is_blank = not cpt_val or str(cpt_val).strip() == ""
-            cat_is_blank = not cat_val or str(cat_val).strip() == ""
-            if cpt_is_blank and cat_is_blank:
-                continue
+                # Skip validation if both CPT and surgical category are blank
+                cpt_is_blank = not cpt_val or str(cpt_val).strip() == ""
+                cat_is_blank = not cat_val or str(cat_val).strip() == ""
+                if cpt_is_blank and cat_is_blank:
+                    continue
                 
-            if expected != cat_val:
-                # Get MRN and CMS for this row
-                mrn_val = row[mrn_col - 1] if mrn_col else None
-                cms_val = row[cms_col - 1] if cms_col else None
-
-                row_issues.append(
-                    {
-                        "row": r,
-                        "mrn": mrn_val,
-                        "cms": cms_val,
-                        "issue_type": "Surgical Category Mismatch",
-                        "description": f"CPT {cpt_val} has category {cat_val}, expected {expected}",
-                    }
-                )
-                issues.append(
-                    f"OASCAPHS Row {r}: CPT {cpt_val} has category {cat_val}, expected {expected}"
-                )
-    else:
-        issue_msg = "Missing CPT or SURGICAL CATEGORY column in OASCAPHS"
-        issues.append(issue_msg)
+                if expected != cat_val:
+                    # Get MRN and CMS for this row
+                    mrn_val = row[mrn_col - 1] if mrn_col else None
+                    cms_val = row[cms_col - 1] if cms_col else None
 
-    # 2. UPLOAD vs OASCAPHS comparison (value-by-value)
-    # Only run if UPLOAD tab exists AND row counts match — if counts differ,
-    # Check 4 above already reported it; positional comparison would be meaningless.
-    if "UPLOAD" in wb.sheetnames:
-        upload_sheet = wb["UPLOAD"]
-        _up_count = count_nonempty_rows(upload_sheet)
-        _oas_count = count_nonempty_rows(sheet)
-        if _up_count > 0 and _up_count == _oas_count:
-            up_headers = {
-                cell.value: idx
-                for idx, cell in enumerate(
-                    next(upload_sheet.iter_rows(min_row=1, max_row=1)), start=1
-                )
-            }
-            oas_headers = headers
-            ignore_cols = {"LG", "FD", "ID", "ATT", "LAG", "E/M"}
-            common_cols = sorted(
-                set(up_headers.keys()).intersection(oas_headers.keys())
-                - ignore_cols
-                - {None}
-            )
-
-            upload_rows = list(upload_sheet.iter_rows(min_row=2, values_only=True))
-            oas_rows = list(sheet.iter_rows(min_row=2, values_only=True))
-
-            def _norm(v):
-                return "" if v is None else str(v).strip()
-
-            for r_offset, (up_row, oas_row) in enumerate(zip(upload_rows, oas_rows)):
-                r = r_offset + 2
-                row_mismatches = []
-                for col in common_cols:
-                    up_idx = up_headers[col] - 1
-                    oas_idx = oas_headers[col] - 1
-                    up_val = up_row[up_idx] if up_idx < len(up_row) else None
-                    oas_val = oas_row[oas_idx] if oas_idx < len(oas_row) else None
-                    if _norm(up_val) != _norm(oas_val):
-                        row_mismatches.append(
-                            f"{col}: OASCAPHS='{oas_val}' UPLOAD='{up_val}'"
-                        )
-                if row_mismatches:
-                    mrn_val = oas_row[mrn_col - 1] if mrn_col else None
-                    cms_val = oas_row[cms_col - 1] if cms_col else None
                     row_issues.append(
                         {
                             "row": r,
                             "mrn": mrn_val,
                             "cms": cms_val,
-                            "issue_type": "UPLOAD/OASCAPHS Mismatch",
-                            "description": "; ".join(row_mismatches),
+                            "issue_type": "Surgical Category Mismatch",
+                            "description": f"CPT {cpt_val} has category {cat_val}, expected {expected}",
                         }
                     )
                     issues.append(
-                        f"Row {r}: " + "; ".join(row_mismatches)
+                        f"OASCAPHS Row {r}: CPT {cpt_val} has category {cat_val}, expected {expected}"
                     )
+        budget.finish(deadline)
+    else:
+        issue_msg = "Missing CPT or SURGICAL CATEGORY column in OASCAPHS"
+        issues.append(issue_msg)
+
+    # 2. UPLOAD vs OASCAPHS comparison (value-by-value)
+    # Rows are aligned on MRN (or full-row values when MRN is absent), so a
+    # missing, extra or reordered UPLOAD row is reported on its own instead of
+    # shifting every comparison after it.
+    if "UPLOAD" in wb.sheetnames:
+        upload_sheet = wb["UPLOAD"]
+        up_headers = {
+            cell.value: idx
+            for idx, cell in enumerate(
+                next(upload_sheet.iter_rows(min_row=1, max_row=1)), start=1
+            )
+        }
+        ignore_cols = {"LG", "FD", "ID", "ATT", "LAG", "E/M"}
+        upload_diffs = None  # None when cut off: unread rows would look missing
+        deadline = budget.start("upload_diff")
+        if not deadline.skipped and count_nonempty_rows(upload_sheet, deadline=deadline) > 0:
+            upload_diffs = diff_upload_oascaphs(
+                sheet, headers, upload_sheet, up_headers, ignore_cols, deadline=deadline
+            )
+        budget.finish(deadline)
+        for diff in upload_diffs or ():
+            r = diff["oas_row"]
+            up_r = diff["upload_row"]
+            oas_row = diff["oas_values"]
+            mrn_val = oas_row[mrn_col - 1] if oas_row and mrn_col else None
+            cms_val = oas_row[cms_col - 1] if oas_row and cms_col else None
+            if diff["kind"] == "missing_oascaphs":
+                up_mrn_idx = up_headers.get("MRN")
+                up_row = next(
+                    upload_sheet.iter_rows(min_row=up_r, max_row=up_r, values_only=True)
+                )
+                up_mrn = (
+                    up_row[up_mrn_idx - 1]
+                    if up_mrn_idx and up_mrn_idx - 1 < len(up_row)
+                    else None
+                )
+                desc = f"UPLOAD row {up_r} has no matching OASCAPHS row"
+                row_issues.append(
+                    {
+                        "row": f"UPLOAD {up_r}",
+                        "mrn": up_mrn,
+                        "cms": None,
+                        "issue_type": "Missing from OASCAPHS",
+                        "description": desc,
+                    }
+                )
+                issues.append(f"UPLOAD Row {up_r}: {desc}")
+                continue
+            if diff["kind"] == "missing_upload":
+                issue_type = "Missing from UPLOAD"
+                desc = "OASCAPHS row has no matching UPLOAD row"
+            elif diff["kind"] == "reordered":
+                issue_type = "UPLOAD Row Order"
+                desc = f"Out of order: matches UPLOAD row {up_r}"
+            else:
+                issue_type = "UPLOAD/OASCAPHS Mismatch"
+                desc = "; ".join(
+                    f"{col}: OASCAPHS='{oas_val}' UPLOAD='{up_val}'"
+                    for col, oas_val, up_val in diff["fields"]
+                )
+                if up_r != r:
+                    desc += f" (UPLOAD row {up_r})"
+            row_issues.append(
+                {
+                    "row": r,
+                    "mrn": mrn_val,
+                    "cms": cms_val,
+                    "issue_type": issue_type,
+                    "description": desc,
+                }
+            )
+            if diff["kind"] == "mismatch":
+                issues.append(f"Row {r}: {desc}")
+            else:
+                issues.append(f"OASCAPHS Row {r}: {desc}")
 
     # 2b. Cross-tab consistency: POP vs UPLOAD email matching
     if "UPLOAD" in wb.sheetnames:
@@ -718,9 +843,13 @@ def build_report(
         upload_email_col = up_headers.get("EMAIL ADDRESS")
 
         if upload_mrn_col and upload_email_col:
-            email_mismatches = check_pop_upload_email_consistency(
-                wb, upload_sheet, upload_mrn_col, upload_email_col
-            )
+            email_mismatches = []
+            deadline = budget.start("pop_email")
+            if not deadline.skipped:
+                email_mismatches = check_pop_upload_email_consistency(
+                    wb, upload_sheet, upload_mrn_col, upload_email_col, deadline=deadline
+                )
+            budget.finish(deadline)
 
             # Add mismatches to row_issues for table display
             for upload_row, mrn, upload_email, pop_email in email_mismatches:
@@ -748,58 +877,103 @@ def build_report(
     # 3. CPT Ineligibility Check (only report when CMS == 1)
     cpt_ineligible_rows = []
     if cpt_col:
-        for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            if not any(row):
-                continue
-            cpt_val = row[cpt_col - 1]
-            cms_val = row[cms_col - 1] if cms_col else None
-            mrn_val = row[mrn_col - 1] if mrn_col else None
-            cms_int = None
-            try:
-                if cms_val is not None and str(cms_val).strip() != "":
-                    cms_int = int(float(str(cms_val).strip()))
-            except Exception:
+        deadline = budget.start("cpt")
+        if not deadline.skipped:
+            for r, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+                if deadline.reached(r, sheet):
+                    break
+                if not any(row):
+                    continue
+                cpt_val = row[cpt_col - 1]
+                cms_val = row[cms_col - 1] if cms_col else None
+                mrn_val = row[mrn_col - 1] if mrn_col else None
                 cms_int = None
+                try:
+                    if cms_val is not None and str(cms_val).strip() != "":
+                        cms_int = int(float(str(cms_val).strip()))
+                except Exception:
+                    cms_int = None
 
-            ineligible, reason = cpt_is_ineligible(cpt_val)
-            if ineligible and cms_int == 1:
-                msg = f"OASCAPHS Row {r}: CPT {cpt_val} ineligible ({reason})"
-                cpt_ineligible_rows.append((r, cpt_val, reason, mrn_val, cms_val))
+                ineligible, reason = cpt_is_ineligible(cpt_val)
+                if ineligible and cms_int == 1:
+                    msg = f"OASCAPHS Row {r}: CPT {cpt_val} ineligible ({reason})"
+                    cpt_ineligible_rows.append((r, cpt_val, reason, mrn_val, cms_val))
 
-                row_issues.append(
-                    {
-                        "row": r,
-                        "mrn": mrn_val,
-                        "cms": cms_val,
-                        "issue_type": "CPT Ineligible",
-                        "description": f"CPT {cpt_val} ineligible ({reason})",
-                    }
-                )
-                issues.append(msg)
+                    row_issues.append(
+                        {
+                            "row": r,
+                            "mrn": mrn_val,
+                            "cms": cms_val,
+                            "issue_type": "CPT Ineligible",
+                            "description": f"CPT {cpt_val} ineligible ({reason})",
+                        }
+                    )
+                    issues.append(msg)
+        budget.finish(deadline)
     else:
         issues.append("CPT column missing in OASCAPHS for ineligibility check")
 
+    # Address check runs before the issues are listed so a time-budget
+    # cut-off shows up with the other warnings; results are rendered below
+    deadline = budget.start("address")
+    invalid_addresses, noted_addresses = [], []
+    if not deadline.skipped:
+        invalid_addresses, noted_addresses = check_address(
+            sheet, addr1_col, city_col, state_col, zip_col, mrn_col, cms_col, em_col, addr2_col,
+            deadline=deadline,
+        )
+    budget.finish(deadline)
+
+    # Contact lookup scan, likewise run here and rendered below
+    deadline = budget.start("lookup_candidates")
+    candidates = []
+    if not deadline.skipped:
+        candidates = collect_lookup_candidates(sheet, headers, mrn_col, cms_col, deadline=deadline)
+    budget.finish(deadline)
+
+    # Checks skipped, cut off or over budget so far (report writing is
+    # recorded later and only appears in the structured result)
+    if budget.events:
+        issues.append(
+            "<strong>WARNING:</strong> Some checks did not run to completion because of the "
+            "audit time budget; results below may be incomplete."
+        )
+        for event in budget.events:
+            issues.append(f"<strong>WARNING:</strong> Time budget: {budget.describe(event)}")
+        _record_check(
+            "time_budget", "warning",
+            "; ".join(budget.describe(event) for event in budget.events),
+        )
+
     # ISSUES section
     report_lines.append("<h2>ISSUES FOUND</h2>")
+    virtual_tables = {}  # shared by _append_row_table so its script is written once
 
     # Display row-based issues in table format
     if row_issues:
         report_lines.append("<details open>")
         report_lines.append(f"<summary>Issues ({len(row_issues)} found)</summary>")
-        report_lines.append("<table class='excel-style' style='font-size: 0.85em;'>")
-        report_lines.append(
-            "<tr><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ROW</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>MRN</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CMS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ISSUE TYPE</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>DESCRIPTION</th></tr>"
-        )
+        issue_rows = []
+        issue_styles = []
         for issue in row_issues:
             mrn_display = issue.get("mrn") if issue.get("mrn") is not None else ""
             cms_display = issue.get("cms") if issue.get("cms") is not None else ""
             issue_type = issue['issue_type']
             is_possible = issue_type.startswith("Possible") or issue_type.startswith("Potentially")
-            row_style = "background-color: #fefce8;" if is_possible else ""
-            report_lines.append(
-                f"<tr style='{row_style}'><td style='padding: 3px 8px;'>{issue['row']}</td><td style='padding: 3px 8px;'>{mrn_display}</td><td style='padding: 3px 8px;'>{cms_display}</td><td style='padding: 3px 8px;'>{issue_type}</td><td style='padding: 3px 8px;'>{issue['description']}</td></tr>"
+            issue_styles.append("background-color: #fefce8;" if is_possible else "")
+            issue_rows.append(
+                [issue['row'], mrn_display, cms_display, issue_type, issue['description']]
             )
-        report_lines.append("</table>")
+        _append_row_table(
+            report_lines,
+            "issues-table",
+            "<tr><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ROW</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>MRN</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CMS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ISSUE TYPE</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>DESCRIPTION</th></tr>",
+            ["ROW", "MRN", "CMS", "ISSUE TYPE", "DESCRIPTION"],
+            issue_rows,
+            filters=[("Issue type", 3, "select"), ("MRN", 1, "text"), ("Row", 0, "text")],
+            row_styles=issue_styles,
+            script_state=virtual_tables,
+        )
         report_lines.append("</details>")
 
     # Display general/non-row issues as list
@@ -811,6 +985,8 @@ def build_report(
             for iss in [iss]
         )
     ]
+    result["row_issues"] = row_issues
+    result["issues"] = [_plain_text(issue) for issue in non_row_issues]
     if non_row_issues:
         report_lines.append("<h3>General Issues</h3>")
         report_lines.append("<ul>")
@@ -822,6 +998,10 @@ def build_report(
         report_lines.append("<p>No issues found</p>")
 
     # CPT ineligible summary
+    result["cpt_ineligible"] = [
+        {"row": r, "cpt": cpt, "reason": reason, "mrn": mrn, "cms": cms}
+        for r, cpt, reason, mrn, cms in cpt_ineligible_rows
+    ]
 
     if cpt_ineligible_rows:
         report_lines.append("<h2>INELIGIBLE CPT CODES</h2>")
@@ -835,33 +1015,32 @@ def build_report(
         report_lines.append(
             f"<summary>Ineligible CPT Details ({len(cpt_ineligible_rows)} rows)</summary>"
         )
-        report_lines.append("<table class='excel-style' style='font-size: 0.85em;'>")
-        report_lines.append(
-            "<tr><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ROW</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>MRN</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CMS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CPT</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>REASON</th></tr>"
-        )
+        cpt_rows = []
         for r, cpt, reason, mrn, cms in cpt_ineligible_rows:
             mrn_display = mrn if mrn is not None else ""
             cms_display = cms if cms is not None else ""
-            report_lines.append(
-                f"<tr><td style='padding: 3px 8px;'>{r}</td><td style='padding: 3px 8px;'>{mrn_display}</td><td style='padding: 3px 8px;'>{cms_display}</td><td style='padding: 3px 8px;'>{cpt}</td><td style='padding: 3px 8px;'>{reason}</td></tr>"
-            )
-        report_lines.append("</table>")
+            cpt_rows.append([r, mrn_display, cms_display, cpt, reason])
+        _append_row_table(
+            report_lines,
+            "cpt-ineligible-table",
+            "<tr><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ROW</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>MRN</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CMS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CPT</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>REASON</th></tr>",
+            ["ROW", "MRN", "CMS", "CPT", "REASON"],
+            cpt_rows,
+            filters=[("Reason", 4, "select"), ("MRN", 1, "text"), ("Row", 0, "text"), ("CPT", 3, "text")],
+            script_state=virtual_tables,
+        )
         report_lines.append("</details>")
 
     # INVALID ADDRESSES section
-    invalid_addresses, noted_addresses = check_address(
-        sheet, addr1_col, city_col, state_col, zip_col, mrn_col, cms_col, em_col, addr2_col
-    )
+    result["invalid_addresses"] = []
+    result["problematic_addresses"] = []
     if invalid_addresses:
         report_lines.append("<h2>INVALID ADDRESSES FOUND</h2>")
         report_lines.append("<details open>")
         report_lines.append(
             f"<summary>Invalid Address Details ({len(invalid_addresses)} found)</summary>"
         )
-        report_lines.append("<table class='excel-style' style='font-size: 0.85em;'>")
-        report_lines.append(
-            "<tr><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ROW</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>MRN</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CMS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>E/M</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>STREET</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CITY</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>STATE</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ZIP</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>REASON</th></tr>"
-        )
+        address_rows = []
         for address in invalid_addresses:
             # Parse format: "Row: 5 - MRN: '123' - CMS: '1' - E/M: 'E' - ADDRESS: '{'country_code': 'US', ...}' - REASON: 'Invalid state'"
             parts = address.split(" - ")
@@ -902,10 +1081,22 @@ def build_report(
             reason_text = (
                 parts[5].replace("REASON: ", "").strip("'") if len(parts) > 5 else ""
             )
-            report_lines.append(
-                f"<tr><td style='padding: 3px 8px;'>{row_num}</td><td style='padding: 3px 8px;'>{mrn_val}</td><td style='padding: 3px 8px;'>{cms_val}</td><td style='padding: 3px 8px;'>{em_val}</td><td style='padding: 3px 8px;'>{street}</td><td style='padding: 3px 8px;'>{city}</td><td style='padding: 3px 8px;'>{state}</td><td style='padding: 3px 8px;'>{zip_code}</td><td style='padding: 3px 8px;'>{reason_text}</td></tr>"
+            address_rows.append(
+                [row_num, mrn_val, cms_val, em_val, street, city, state, zip_code, reason_text]
             )
-        report_lines.append("</table>")
+            result["invalid_addresses"].append(dict(zip(
+                ("row", "mrn", "cms", "em", "street", "city", "state", "zip", "reason"),
+                address_rows[-1],
+            )))
+        _append_row_table(
+            report_lines,
+            "invalid-address-table",
+            "<tr><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ROW</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>MRN</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CMS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>E/M</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>STREET</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CITY</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>STATE</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ZIP</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>REASON</th></tr>",
+            ["ROW", "MRN", "CMS", "E/M", "STREET", "CITY", "STATE", "ZIP", "REASON"],
+            address_rows,
+            filters=[("Reason", 8, "select"), ("MRN", 1, "text"), ("Row", 0, "text")],
+            script_state=virtual_tables,
+        )
         report_lines.append("</details>")
 
     # possibly problematic addresses
@@ -915,10 +1106,7 @@ def build_report(
         report_lines.append(
             f"<summary>Problematic Address Details ({len(noted_addresses)} found)</summary>"
         )
-        report_lines.append("<table class='excel-style' style='font-size: 0.85em;'>")
-        report_lines.append(
-            "<tr><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ROW</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>MRN</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CMS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>E/M</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ADDRESS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ISSUE(S)</th></tr>"
-        )
+        noted_rows = []
         for address in noted_addresses:
             # Parse format: "Row: 5 - MRN: '123' - CMS: '1' - E/M: 'E' - ADDRESS: '123 Main St' - REASON(s): 'city, state'"
             parts = address.split(" - ")
@@ -942,14 +1130,23 @@ def build_report(
             reason_text = (
                 parts[5].replace("REASON(s): ", "").strip("'") if len(parts) > 5 else ""
             )
-            report_lines.append(
-                f"<tr><td style='padding: 3px 8px;'>{row_num}</td><td style='padding: 3px 8px;'>{mrn_val}</td><td style='padding: 3px 8px;'>{cms_val}</td><td style='padding: 3px 8px;'>{em_val}</td><td style='padding: 3px 8px;'>{addr_text}</td><td style='padding: 3px 8px;'>{reason_text}</td></tr>"
-            )
-        report_lines.append("</table>")
+            noted_rows.append([row_num, mrn_val, cms_val, em_val, addr_text, reason_text])
+            result["problematic_addresses"].append(dict(zip(
+                ("row", "mrn", "cms", "em", "address", "reason"), noted_rows[-1]
+            )))
+        _append_row_table(
+            report_lines,
+            "problem-address-table",
+            "<tr><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ROW</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>MRN</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>CMS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>E/M</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ADDRESS</th><th style='background-color: #000; color: #fff; padding: 4px 8px;'>ISSUE(S)</th></tr>",
+            ["ROW", "MRN", "CMS", "E/M", "ADDRESS", "ISSUE(S)"],
+            noted_rows,
+            filters=[("Issue", 5, "select"), ("MRN", 1, "text"), ("Row", 0, "text")],
+            script_state=virtual_tables,
+        )
         report_lines.append("</details>")
 
     # PEOPLE-SEARCH LOOKUP SECTION
-    candidates = collect_lookup_candidates(sheet, headers, mrn_col, cms_col)
+    result["lookup_candidates"] = candidates
     if candidates:
         report_lines.append("<h2>CONTACT LOOKUP</h2>")
         th = "<th style='background-color: #000; color: #fff; padding: 4px 8px;'>"
@@ -970,12 +1167,6 @@ def build_report(
 
         def _build_lookup_table(use_flipped):
             rows = []
-            rows.append("<table class='excel-style' style='font-size: 0.85em;'>")
-            rows.append(
-                f"<tr>{th}ROW</th>{th}MRN</th>{th}PATIENT NAME</th>{th}AGE</th>"
-                f"{th}CITY, STATE</th>{th}REASON(S)</th>"
-                f"<th style='background-color:#000;color:#fff;padding:4px 8px;'>SEARCH LINKS</th></tr>"
-            )
             for c in candidates:
                 mrn_disp = c["mrn"] if c["mrn"] is not None else ""
                 age_disp = c["age"] if c["age"] is not None else ""
@@ -999,18 +1190,21 @@ def build_report(
                     name_disp  = c["name"] or "&mdash;"
                     links_html = "&mdash;"
                 rows.append(
-                    f"<tr>"
-                    f"<td style='padding: 3px 8px;'>{c['row']}</td>"
-                    f"<td style='padding: 3px 8px;'>{mrn_disp}</td>"
-                    f"<td style='padding: 3px 8px;'>{name_disp}</td>"
-                    f"<td style='padding: 3px 8px;'>{age_disp}</td>"
-                    f"<td style='padding: 3px 8px;'>{location}</td>"
-                    f"<td style='padding: 3px 8px;'>{reasons}</td>"
-                    f"<td style='padding: 3px 8px;'>{links_html}</td>"
-                    f"</tr>"
+                    [c['row'], mrn_disp, name_disp, age_disp, location, reasons, links_html]
                 )
-            rows.append("</table>")
-            return rows
+            table_lines = []
+            _append_row_table(
+                table_lines,
+                "lookup-table-flip" if use_flipped else "lookup-table-raw",
+                f"<tr>{th}ROW</th>{th}MRN</th>{th}PATIENT NAME</th>{th}AGE</th>"
+                f"{th}CITY, STATE</th>{th}REASON(S)</th>"
+                f"<th style='background-color:#000;color:#fff;padding:4px 8px;'>SEARCH LINKS</th></tr>",
+                ["ROW", "MRN", "PATIENT NAME", "AGE", "CITY, STATE", "REASON(S)", "SEARCH LINKS"],
+                rows,
+                filters=[("MRN", 1, "text"), ("Row", 0, "text"), ("Name", 2, "text")],
+                script_state=virtual_tables,
+            )
+            return table_lines
 
         if show_picker:
             flip_names = [
@@ -1057,26 +1251,25 @@ def build_report(
             f"<summary>CMS=2 Potentially Invalid Emails ({len(cms2_email_quality)} rows)</summary>"
         )
         th = "<th style='background-color: #000; color: #fff; padding: 4px 8px;'>"
-        report_lines.append("<table class='excel-style' style='font-size: 0.85em;'>")
-        report_lines.append(
-            f"<tr>{th}ROW</th>{th}MRN</th>{th}CMS</th>{th}EMAIL</th>{th}REASON(S)</th></tr>"
-        )
+        cms2_rows = []
         for eq in cms2_email_quality:
             mrn_disp = eq["mrn"] if eq["mrn"] is not None else ""
             cms_disp = eq["cms"] if eq["cms"] is not None else ""
             reasons = "; ".join(eq["warnings"])
-            report_lines.append(
-                f"<tr>"
-                f"<td style='padding: 3px 8px;'>{eq['row']}</td>"
-                f"<td style='padding: 3px 8px;'>{mrn_disp}</td>"
-                f"<td style='padding: 3px 8px;'>{cms_disp}</td>"
-                f"<td style='padding: 3px 8px;'>{eq['email']}</td>"
-                f"<td style='padding: 3px 8px;'>{reasons}</td>"
-                f"</tr>"
-            )
-        report_lines.append("</table>")
+            cms2_rows.append([eq['row'], mrn_disp, cms_disp, eq['email'], reasons])
+        _append_row_table(
+            report_lines,
+            "cms2-email-table",
+            f"<tr>{th}ROW</th>{th}MRN</th>{th}CMS</th>{th}EMAIL</th>{th}REASON(S)</th></tr>",
+            ["ROW", "MRN", "CMS", "EMAIL", "REASON(S)"],
+            cms2_rows,
+            filters=[("MRN", 1, "text"), ("Row", 0, "text"), ("Email", 3, "text")],
+            script_state=virtual_tables,
+        )
         report_lines.append("</details>")
 
+    _append_timings_footer(report_lines, active_stage_timings())
+
     report_lines.append("<hr>")
     report_lines.append(
         "<p style='text-align: center;'><strong>END OF REPORT</strong></p>"
@@ -1088,23 +1281,205 @@ def build_report(
     return report_lines, issues
 
 
-def _build_html_header(file_path, version, audit_id=None, sid_prefix=None, service_date_range=None):
+def _append_timings_footer(report_lines, timings):
     """
-    Build the HTML header section (reusable for both success and failure reports)
+    Collapsed table of where this audit's time went (StageTimings), slowest
+    stage first. Report writing is still running here, so its time and the
+    total are as of this point.
     """
-    tor = datetime.datetime.now()
-    time_of_report = tor.strftime("%m/%d/%Y %H:%M:%S")
+    if timings is None:
+        return
+    stages = timings.as_dict()
+    total = sum(entry["seconds"] for entry in stages.values())
+    report_lines.append("<details class='audit-timings' style='margin-top: 16px; color: #555;'>")
+    report_lines.append(f"<summary>Audit timings ({total:.2f}s)</summary>")
+    report_lines.append("<table class='data-table'>")
+    report_lines.append(f"<tr>{_TABLE_TH}STAGE</th>{_TABLE_TH}SECONDS</th>{_TABLE_TH}CALLS</th>{_TABLE_TH}SHARE</th></tr>")
+    for name, entry in sorted(stages.items(), key=lambda item: -item[1]["seconds"]):
+        share = entry["seconds"] / total if total else 0.0
+        report_lines.append(
+            f"<tr><td>{html.escape(name)}</td><td>{entry['seconds']:.3f}</td>"
+            f"<td>{entry['calls']}</td><td>{share:.0%}</td></tr>"
+        )
+    report_lines.append("</table>")
+    report_lines.append("</details>")
+
+
+# Tables with more rows than this are embedded as JSON and rendered by a small
+# script that only builds the rows in view (plus filters), so reports for files
+# with systemic problems stay small enough to open.
+VIRTUAL_TABLE_MIN_ROWS = 1000
+
+_TABLE_TH = "<th style='background-color: #000; color: #fff; padding: 4px 8px;'>"
+
+_VIRTUAL_TABLE_SCRIPT = """<script>
+function oasVirtualTable(id) {
+  var root = document.getElementById(id);
+  var data = JSON.parse(document.getElementById(id + '-data').textContent);
+  var rows = data.rows, highlight = data.highlight || {};
+  var viewport = root.querySelector('.vt-viewport');
+  var tbody = root.querySelector('tbody');
+  var counter = root.querySelector('.vt-count');
+  var filters = root.querySelectorAll('[data-col]');
+  var shown = [], rowHeight = 24, measured = false, overscan = 20;
+  function render() {
+    var height = viewport.clientHeight || 600;
+    var visible = Math.ceil(height / rowHeight) + 2 * overscan;
+    var first = Math.floor(viewport.scrollTop / rowHeight) - overscan;
+    first = Math.max(0, Math.min(first, shown.length - visible));
+    var last = Math.min(shown.length, first + visible);
+    var out = ['<tr style="height:' + first * rowHeight + 'px"></tr>'];
+    for (var i = first; i < last; i++) {
+      var idx = shown[i], row = rows[idx];
+      out.push(highlight[idx] ? '<tr style="' + highlight[idx] + '">' : '<tr>');
+      for (var c = 0; c < row.length; c++) {
+        out.push("<td style='padding: 3px 8px;'>" + row[c] + '</td>');
+      }
+      out.push('</tr>');
+    }
+    out.push('<tr style="height:' + (shown.length - last) * rowHeight + 'px"></tr>');
+    tbody.innerHTML = out.join('');
+    if (!measured && last > first && tbody.offsetHeight) {
+      // Spacer rows use the average rendered row height from the first paint
+      measured = true;
+      rowHeight = Math.max(1, tbody.offsetHeight / (last - first));
+      render();
+    }
+  }
+  function applyFilters() {
+    var active = [];
+    filters.forEach(function (el) {
+      var value = el.value.trim().toLowerCase();
+      if (value) active.push([+el.getAttribute('data-col'), value, el.tagName === 'SELECT']);
+    });
+    shown = [];
+    for (var i = 0; i < rows.length; i++) {
+      var keep = true;
+      for (var k = 0; k < active.length && keep; k++) {
+        var cell = String(rows[i][active[k][0]]).toLowerCase();
+        keep = active[k][2] ? cell === active[k][1] : cell.indexOf(active[k][1]) !== -1;
+      }
+      if (keep) shown.push(i);
+    }
+    counter.textContent = shown.length + ' of ' + rows.length + ' rows';
+    viewport.scrollTop = 0;
+    render();
+  }
+  filters.forEach(function (el) { el.addEventListener('input', applyFilters); });
+  viewport.addEventListener('scroll', render);
+  // Re-render when a hidden table (closed details, name-order picker) is shown
+  document.addEventListener('change', render);
+  document.addEventListener('toggle', render, true);
+  applyFilters();
+}
+</script>"""
+
+
+def _table_row_html(cells, row_style=None):
+    """One static <tr>; row_style=None omits the style attribute."""
+    tds = "".join(f"<td style='padding: 3px 8px;'>{cell}</td>" for cell in cells)
+    if row_style is None:
+        return f"<tr>{tds}</tr>"
+    return f"<tr style='{row_style}'>{tds}</tr>"
+
+
+def _append_row_table(report_lines, table_id, header_row_html, columns, rows,
+                      filters=(), row_styles=None, script_state=None):
+    """
+    Append a row table to the report.
+
+    Small tables are written as static HTML (header_row_html followed by one
+    <tr> per row, row_styles giving each row's style attribute or None).
+    Tables with more than VIRTUAL_TABLE_MIN_ROWS rows are embedded as a JSON
+    payload with a filter bar instead; filters is a list of (label, column index,
+    "select" or "text"). script_state is a dict shared across one report so the
+    renderer script is only written once.
+    """
+    if len(rows) <= VIRTUAL_TABLE_MIN_ROWS:
+        report_lines.append("<table class='excel-style' style='font-size: 0.85em;'>")
+        report_lines.append(header_row_html)
+        for i, cells in enumerate(rows):
+            report_lines.append(
+                _table_row_html(cells, row_styles[i] if row_styles else None)
+            )
+        report_lines.append("</table>")
+        return
+
+    if script_state is not None and not script_state.get("written"):
+        report_lines.append(_VIRTUAL_TABLE_SCRIPT)
+        script_state["written"] = True
+
+    report_lines.append(f"<div id='{table_id}' class='virtual-table'>")
+    controls = []
+    for label, col, kind in filters:
+        if kind == "select":
+            options = "".join(
+                f"<option value='{html.escape(str(v), quote=True)}'>{v}</option>"
+                for v in sorted({str(cells[col]) for cells in rows})
+            )
+            controls.append(
+                f"<label>{label} <select data-col='{col}'><option value=''>All</option>{options}</select></label>"
+            )
+        else:
+            controls.append(
+                f"<label>{label} <input type='search' data-col='{col}' size='12'></label>"
+            )
+    controls.append("<span class='vt-count' style='color: #7f8c8d;'></span>")
+    report_lines.append(
+        "<div style='display: flex; gap: 12px; align-items: center; margin: 6px 0; font-size: 0.85em;'>"
+        + "".join(controls)
+        + "</div>"
+    )
+    sticky_th = "<th style='background-color: #000; color: #fff; padding: 4px 8px; position: sticky; top: 0;'>"
+    report_lines.append("<div class='vt-viewport' style='height: 600px; overflow-y: auto;'>")
+    report_lines.append("<table class='excel-style' style='font-size: 0.85em;'>")
+    report_lines.append(
+        "<thead><tr>" + "".join(f"{sticky_th}{c}</th>" for c in columns) + "</tr></thead>"
+    )
+    report_lines.append("<tbody></tbody>")
+    report_lines.append("</table>")
+    report_lines.append("</div>")
+    highlight = {}
+    if row_styles:
+        highlight = {i: style for i, style in enumerate(row_styles) if style}
+    payload = json.dumps(
+        {"rows": [[str(c) for c in cells] for cells in rows], "highlight": highlight},
+        separators=(",", ":"),
+    ).replace("</", "<\\/")
+    report_lines.append(f"<script type='application/json' id='{table_id}-data'>{payload}</script>")
+    report_lines.append(f"<script>oasVirtualTable('{table_id}');</script>")
+    report_lines.append(
+        f"<noscript><p>{len(rows)} rows; enable JavaScript to view this table.</p></noscript>"
+    )
+    report_lines.append("</div>")
+
+
+def _plain_text(message):
+    """Strip the HTML markup used in report messages (for JSON output)."""
+    return re.sub(r"<[^>]+>", "", message) if isinstance(message, str) else message
+
+
+def _build_update_badge(update_info):
+    """Link shown next to the version text when a newer release is available."""
+    if not update_info:
+        return ""
+    return (
+        f"<a href=\"{update_info['download_url']}\" "
+        "style='margin-left:8px;background:#fffbe6;border:1px solid #ffe58f;"
+        "padding:2px 8px;border-radius:3px;color:#8a6d3b;font-size:0.9em;"
+        "text-decoration:none;font-weight:500;'"
+        f" title='A newer version was available when this audit was generated'>"
+        f"&#8595; Click here to download v{update_info['latest_version']}"
+        "</a>"
+    )
 
-    modified_ts = "N/A"
-    try:
-        modified_ts = datetime.datetime.fromtimestamp(
-            os.path.getmtime(file_path)
-        ).strftime("%Y-%m-%d %H:%M:%S")
-    except Exception:
-        pass
-    basefname = os.path.basename(file_path)
-    base_before_hash = basefname.split("#", 1)[0]
 
+@lru_cache(maxsize=1)
+def _static_head_parts():
+    """
+    Read the report favicon and stylesheet once per process.
+    Returns (icon data URI or None, tuple of indented CSS lines for an inline <style> block).
+    """
     icon_href = None
     icon_candidates = [
         os.path.join(os.path.dirname(__file__), "python-xxl.png"),
@@ -1120,6 +1495,76 @@ def _build_html_header(file_path, version, audit_id=None, sid_prefix=None, servi
             except Exception:
                 icon_href = None
 
+    # Load CSS from external file
+    css_path = os.path.join(os.path.dirname(__file__), "audit_report.css")
+    try:
+        with open(css_path, "r", encoding="utf-8") as css_file:
+            css_lines = tuple(f"        {line.rstrip()}" for line in css_file)
+    except FileNotFoundError:
+        # Fallback to basic styling if CSS file not found
+        css_lines = ("        body { font-family: sans-serif; }",)
+
+    return icon_href, css_lines
+
+
+SHARED_CSS_NAME = "audit_report.css"
+
+
+def use_shared_report_css():
+    """
+    SHARED_REPORT_CSS=true makes batch (--all) reports link one stylesheet in
+    their AUDITS folder instead of inlining the CSS into every report.
+    """
+    load_dotenv()
+    return os.getenv("SHARED_REPORT_CSS", "false").lower() == "true"
+
+
+def write_shared_css(audits_dir):
+    """
+    Make sure audits_dir holds an up-to-date copy of the report stylesheet.
+    Returns the href to use from reports saved in that folder.
+    """
+    _, css_lines = _static_head_parts()
+    css_text = "\n".join(line[8:] for line in css_lines) + "\n"
+    css_path = os.path.join(audits_dir, SHARED_CSS_NAME)
+    try:
+        with open(css_path, "r", encoding="utf-8") as f:
+            if f.read() == css_text:
+                return SHARED_CSS_NAME
+    except OSError:
+        pass
+    # Several workers may get here at once; write a temp copy and swap it in
+    os.makedirs(audits_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".css.tmp", dir=audits_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(css_text)
+    os.chmod(temp_path, _new_file_mode())
+    os.replace(temp_path, css_path)
+    return SHARED_CSS_NAME
+
+
+def _build_html_header(file_path, version, audit_id=None, sid_prefix=None, service_date_range=None, update_info=None, css_href=None):
+    """
+    Build the HTML header section (reusable for both success and failure reports)
+
+    The favicon and CSS come from _static_head_parts(); with css_href the
+    report links that stylesheet instead of inlining it.
+    """
+    tor = datetime.datetime.now()
+    time_of_report = tor.strftime("%m/%d/%Y %H:%M:%S")
+
+    modified_ts = "N/A"
+    try:
+        modified_ts = datetime.datetime.fromtimestamp(
+            os.path.getmtime(file_path)
+        ).strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        pass
+    basefname = os.path.basename(file_path)
+    base_before_hash = basefname.split("#", 1)[0]
+
+    icon_href, css_lines = _static_head_parts()
+
     header_lines = []
     header_lines.append("<!DOCTYPE html>")
     header_lines.append("<html>")
@@ -1129,19 +1574,12 @@ def _build_html_header(file_path, version, audit_id=None, sid_prefix=None, servi
     header_lines.append(f"    <title>{base_before_hash} - {title_prefix}</title>")
     if icon_href:
         header_lines.append(f"    <link rel='icon' type='image/png' href='{icon_href}'>")
-    header_lines.append("    <style>")
-
-    # Load CSS from external file
-    css_path = os.path.join(os.path.dirname(__file__), "audit_report.css")
-    try:
-        with open(css_path, "r", encoding="utf-8") as css_file:
-            for line in css_file:
-                header_lines.append(f"        {line.rstrip()}")
-    except FileNotFoundError:
-        # Fallback to basic styling if CSS file not found
-        header_lines.append("        body { font-family: sans-serif; }")
-
-    header_lines.append("    </style>")
+    if css_href:
+        header_lines.append(f"    <link rel='stylesheet' href='{css_href}'>")
+    else:
+        header_lines.append("    <style>")
+        header_lines.extend(css_lines)
+        header_lines.append("    </style>")
     header_lines.append("</head>")
     header_lines.append("<body>")
     header_lines.append("<div class='report-container'>")
@@ -1180,7 +1618,7 @@ def _build_html_header(file_path, version, audit_id=None, sid_prefix=None, servi
     header_lines.append("</div>")
     header_lines.append(
         f"<div style='display: flex; justify-content: space-between; align-items: center; margin: 0 0 5px 0; color: #bdc3c7; font-size: 0.85em;'>"
-        f"<span><a href='https://tylercbrock.com' style='color: inherit; text-decoration: none;'>Auditor</a> v{version}</span>"
+        f"<span><a href='https://tylercbrock.com' style='color: inherit; text-decoration: none;'>Auditor</a> v{version}{_build_update_badge(update_info)}</span>"
         f"<span><a href='https://github.com/ToonLunk/OAS-CAHPS-Auditor' style='color: inherit; text-decoration: none;'>Need Help?</a></span>"
         f"</div>"
     )
@@ -1205,14 +1643,13 @@ def _build_html_header(file_path, version, audit_id=None, sid_prefix=None, servi
     return header_lines
 
 
-def save_report(file_path, report_lines, failure_reason="", version="0.0-alpha", service_date_range=None, update_info=None):
+def get_report_path(file_path, failure_reason="", service_date_range=None):
     """
-    Write report to .html file in AUDITS directory
-    Location depends on ORGANIZE_AUDITS_BY_DATE setting:
+    Return the timestamped .html path for a file's report in its AUDITS directory
+    (created if needed). Location depends on ORGANIZE_AUDITS_BY_DATE setting:
       - True: %LOCALAPPDATA%\OAS-CAHPS-Auditor\AUDITS\YEAR\MONTH\
       - False: Next to the audited file in AUDITS folder (default)
     """
-    # --- Write report to .html file ---
     base_name = os.path.splitext(file_path)[0]
     report_file = base_name + ".html"
     
@@ -1299,50 +1736,257 @@ def save_report(file_path, report_lines, failure_reason="", version="0.0-alpha",
     timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
     final_report_file = os.path.join(AUDITS_dir, f"{name}{month_str}_{timestamp}{ext}")
 
-    # prevent accidental overwrite (very unlikely because of timestamp, but safe)
-    if os.path.isfile(final_report_file):
-        print(
-            f"--- File already exists! This auditor will not overwrite files. If you wish to run a new audit on this file, please delete the previous audit:  {final_report_file}"
+    return final_report_file
+
+
+class AuditError(Exception):
+    """A file could not be audited; batch workers record it and carry on."""
+
+
+class WorkbookOpenError(AuditError):
+    """The workbook could not be opened or has no OASCAPHS tab."""
+
+    def __init__(self, file_path, reason):
+        super().__init__(f"Could not open {file_path}: {reason}")
+        self.file_path = file_path
+        self.reason = reason
+        self.report_path = None  # failure report, once written
+
+
+class ReportExistsError(AuditError):
+    """The report file already exists; reports are never overwritten."""
+
+    def __init__(self, report_path):
+        super().__init__(
+            "This auditor will not overwrite files. If you wish to run a new audit "
+            f"on this file, please delete the previous audit: {report_path}"
         )
-        input("Press enter to exit: ")
-        print("\n")
-        sys.exit(99)
-
-    # Inject update badge next to version text if an update is available
-    if update_info and isinstance(report_lines, list):
-        _badge = (
-            f"<a href=\"{update_info['download_url']}\" "
-            "style='margin-left:8px;background:#fffbe6;border:1px solid #ffe58f;"
-            "padding:2px 8px;border-radius:3px;color:#8a6d3b;font-size:0.9em;"
-            "text-decoration:none;font-weight:500;'"
-            f" title='A newer version was available when this audit was generated'>"
-            f"&#8595; Click here to download v{update_info['latest_version']}"
-            "</a>"
+        self.report_path = report_path
+
+
+@lru_cache(maxsize=None)
+def _new_file_mode():
+    """
+    Permissions open() would give a new file under the process umask.
+    mkstemp creates its files 0600, so temp files are set to this before
+    they are renamed into place.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+class ReportWriter:
+    """
+    Streams report lines to a temporary file next to the final report path.
+
+    Supports append()/extend() like the report_lines list it replaces, so
+    build_report can write sections as it produces them. commit() moves the
+    finished file into place atomically; discard() removes it. Lines are
+    joined with newlines exactly as "\n".join(report_lines) would.
+    """
+
+    def __init__(self, final_path):
+        self.path = final_path
+        fd, self.temp_path = tempfile.mkstemp(
+            prefix=".", suffix=".html.tmp", dir=os.path.dirname(final_path) or "."
         )
-        for i, line in enumerate(report_lines):
-            if "Auditor</a> v" in line:
-                report_lines[i] = line.replace("</span>", f"{_badge}</span>", 1)
-                break
+        os.chmod(self.temp_path, _new_file_mode())
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+        self.line_count = 0
+
+    def append(self, line):
+        if self.line_count:
+            self._file.write("\n")
+        self._file.write(line)
+        self.line_count += 1
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def __len__(self):
+        return self.line_count
+
+    def commit(self):
+        """Close the temp file and rename it to the final report path."""
+        self._file.close()
+        os.replace(self.temp_path, self.path)
+        return self.path
+
+    def discard(self):
+        """Close and delete the temp file (e.g. when the audit failed midway)."""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
 
-    with open(final_report_file, "w", encoding="utf-8") as f:
-        if not failure_reason:
-            f.write("\n".join(report_lines))
+
+class NullReportWriter(ReportWriter):
+    """
+    Stand-in for ReportWriter when no HTML report was requested
+    (e.g. --format json): lines are dropped and nothing is written.
+    """
+
+    def __init__(self, final_path):
+        self.path = final_path
+        self.line_count = 0
+
+    def append(self, line):
+        self.line_count += 1
+
+    def commit(self):
+        return None
+
+    def discard(self):
+        pass
+
+
+# Structured (JSON / NDJSON) audit output. Bump the version whenever a field
+# is renamed or removed or changes meaning; adding fields keeps the version.
+AUDIT_RESULT_SCHEMA = "oas-cahps-audit-result"
+AUDIT_RESULT_SCHEMA_VERSION = 2
+OUTPUT_FORMATS = ("html", "json", "ndjson")
+
+# NDJSON record type for the items of each list field
+_NDJSON_RECORD_TYPES = {
+    "checks": "check",
+    "issues": "issue",
+    "row_issues": "row_issue",
+    "cpt_ineligible": "cpt_ineligible",
+    "invalid_addresses": "invalid_address",
+    "problematic_addresses": "problematic_address",
+    "email_quality": "email_quality",
+    "lookup_candidates": "lookup_candidate",
+    "facility_matches": "facility_match",
+}
+
+
+def _json_default(value):
+    """JSON fallback for cell values: dates as ISO strings, anything else as str."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_dumps(value):
+    return json.dumps(value, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def _write_result_json(f, result):
+    """Write result as one JSON object, encoding list fields item by item."""
+    f.write("{")
+    for n, (key, value) in enumerate(result.items()):
+        if n:
+            f.write(",")
+        f.write(_json_dumps(key) + ":")
+        if isinstance(value, list):
+            f.write("[")
+            for i, item in enumerate(value):
+                if i:
+                    f.write(",")
+                f.write(_json_dumps(item))
+            f.write("]")
         else:
-            # Build failure report using the helper function
-            failure_html = _build_html_header(file_path, version, audit_id=None)
-            failure_html.append("<h2>Audit Failed</h2>")
-            failure_html.append(f"<p>{report_lines}</p>")
-            failure_html.append(
-                f"<p><strong>Failure reason:</strong> {failure_reason}</p>"
-            )
-            failure_html.append("<hr>")
-            failure_html.append(
-                "<p style='text-align: center;'><strong>END OF REPORT</strong></p>"
-            )
-            failure_html.append("</div>")
-            failure_html.append("</body>")
-            failure_html.append("</html>")
-            f.write("\n".join(failure_html))
+            f.write(_json_dumps(value))
+    f.write("}\n")
+
+
+def _write_result_ndjson(f, result):
+    """
+    Write result as NDJSON: one "audit" record with the scalar fields, then
+    one record per item of each list field (record type from _NDJSON_RECORD_TYPES).
+    """
+    summary = {"record": "audit"}
+    summary.update((k, v) for k, v in result.items() if not isinstance(v, list))
+    f.write(_json_dumps(summary) + "\n")
+    for key, value in result.items():
+        if not isinstance(value, list):
+            continue
+        record_type = _NDJSON_RECORD_TYPES.get(key, key)
+        for item in value:
+            record = {"record": record_type}
+            if isinstance(item, dict):
+                record.update(item)
+            else:
+                record["value"] = item
+            f.write(_json_dumps(record) + "\n")
+
+
+def save_audit_result(result, report_path, formats):
+    """
+    Write the structured audit result next to the HTML report path, as
+    <report>.json and/or <report>.ndjson depending on formats.
+    Each file is written to a temp file and renamed into place.
+    Returns the list of files written.
+    """
+    base = os.path.splitext(report_path)[0]
+    written = []
+    for fmt, writer in (("json", _write_result_json), ("ndjson", _write_result_ndjson)):
+        if fmt not in formats:
+            continue
+        out_path = f"{base}.{fmt}"
+        out_dir = os.path.dirname(out_path) or "."
+        os.makedirs(out_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".", suffix=f".{fmt}.tmp", dir=out_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                writer(f, result)
+            os.chmod(temp_path, _new_file_mode())
+            os.replace(temp_path, out_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        written.append(out_path)
+    return written
+
+
+def save_report(file_path, report_lines, failure_reason="", version="0.0-alpha", service_date_range=None, update_info=None):
+    """
+    Write report to .html file in AUDITS directory (see get_report_path).
+
+    report_lines is either a ReportWriter from build_report, which is renamed
+    into place, or a list of lines / failure text that is written here.
+    Raises ReportExistsError instead of overwriting an existing report.
+    """
+    if isinstance(report_lines, ReportWriter):
+        final_report_file = report_lines.path
+    else:
+        final_report_file = get_report_path(file_path, failure_reason, service_date_range)
+
+    # prevent accidental overwrite (very unlikely because of timestamp, but safe)
+    if os.path.isfile(final_report_file):
+        if isinstance(report_lines, ReportWriter):
+            report_lines.discard()
+        raise ReportExistsError(final_report_file)
+
+    if isinstance(report_lines, ReportWriter):
+        report_lines.commit()
+    else:
+        with open(final_report_file, "w", encoding="utf-8") as f:
+            if not failure_reason:
+                f.write("\n".join(report_lines))
+            else:
+                # Build failure report using the helper function
+                failure_html = _build_html_header(file_path, version, audit_id=None, update_info=update_info)
+                failure_html.append("<h2>Audit Failed</h2>")
+                failure_html.append(f"<p>{report_lines}</p>")
+                failure_html.append(
+                    f"<p><strong>Failure reason:</strong> {failure_reason}</p>"
+                )
+                failure_html.append("<hr>")
+                failure_html.append(
+                    "<p style='text-align: center;'><strong>END OF REPORT</strong></p>"
+                )
+                failure_html.append("</div>")
+                failure_html.append("</body>")
+                failure_html.append("</html>")
+                f.write("\n".join(failure_html))
 
     if not failure_reason:
         print(f"--- Audit complete. Report saved to {final_report_file}\n")
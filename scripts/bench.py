@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite on synthetic OAS workbooks.
+
+Generates synthetic workbooks (see synthetic_oas.py; generated files are
+kept in a cache folder and reused), audits each one --repeat times in a
+fresh process and writes throughput (rows/s), per-stage times (see
+StageTimings) and peak RSS per run and as medians to a JSON results file.
+
+`compare` runs the same workbooks as a baseline results file (by default the
+committed scripts/bench_baseline.json) and fails with exit code 1 when a
+stage's median got slower by more than its noise threshold, or when a
+baseline workbook is missing from the results.
+
+    python scripts/bench.py run --rows 1000 10000 100000 --repeat 3 -o bench_results.json
+    python scripts/bench.py compare
+    python scripts/bench.py compare --results bench_results.json
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_oas import workbook_name, write_synthetic_workbook  # noqa: E402
+
+BENCH_SCHEMA = "oas-cahps-auditor.bench"
+BENCH_SCHEMA_VERSION = 1
+DEFAULT_ROWS = [1000, 10000, 100000]
+DEFAULT_CACHE = os.path.join(tempfile.gettempdir(), "oas-bench-workbooks")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# Baseline stage medians are first scaled by the workbook's machine speed
+# factor: the current/baseline ratio of the median calibration time, a fixed
+# pure-Python workload (cpu_calibration) timed in the same process right
+# before each audit. It uses no auditor code, so a slower or busier machine
+# moves it but a regression in the audit does not. A stage then regresses
+# when its median exceeds the scaled baseline by more than the largest of:
+# REL_TOLERANCE of it, MIN_DELTA_SECONDS, and NOISE_FACTOR times the combined
+# standard error of both medians (estimated from the run-to-run spread).
+# The total wall time is never scaled: it regresses when it exceeds the raw
+# baseline by more than REL_TOLERANCE (and MIN_DELTA_SECONDS).
+REL_TOLERANCE = 0.25
+MIN_DELTA_SECONDS = 0.05
+NOISE_FACTOR = 3.0
+CALIBRATION_LOOPS = 200000
+RSS_REL_TOLERANCE = 0.20
+RSS_MIN_DELTA_MB = 16.0
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in KB elsewhere
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return round(counters.PeakWorkingSetSize / (1024 * 1024), 1)
+    return None
+
+
+def cpu_calibration(loops=CALIBRATION_LOOPS):
+    """
+    Seconds taken by a fixed pure-Python workload (string formatting, dict
+    updates, sorting) that uses no auditor code; the machine speed reference
+    for compare.
+    """
+    started = time.perf_counter()
+    counts = {}
+    for i in range(loops):
+        key = f"{i % 997:05d}"
+        counts[key] = counts.get(key, 0) + len(key)
+    sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return round(time.perf_counter() - started, 4)
+
+
+def audit_once(path, row_workers):
+    """
+    Audit path once (HTML report) in this process; returns the calibration
+    time (see cpu_calibration), wall and CPU seconds, peak RSS and the stage
+    timings. Runs in a fresh pool process so peak RSS and warm caches belong
+    to this one audit.
+    """
+    calibration = cpu_calibration()
+    import audit
+    from audit_lib_funcs import StageTimings
+
+    timings = StageTimings()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+            contextlib.redirect_stderr(devnull):
+        audit.run_audit(path, row_workers=row_workers, timings=timings)
+    return {
+        "calibration_seconds": calibration,
+        "wall_seconds": round(time.perf_counter() - started, 4),
+        "cpu_seconds": round(time.process_time() - cpu_started, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": {name: entry["seconds"] for name, entry in timings.as_dict().items()},
+    }
+
+
+def summarize_runs(runs, rows):
+    """Medians over runs: calibration and wall seconds, rows/s, peak RSS and seconds per stage."""
+    wall = statistics.median(r["wall_seconds"] for r in runs)
+    rss = [r["peak_rss_mb"] for r in runs if r["peak_rss_mb"] is not None]
+    stage_names = dict.fromkeys(name for r in runs for name in r["stages"])
+    return {
+        "calibration_seconds": round(statistics.median(r["calibration_seconds"] for r in runs), 4),
+        "wall_seconds": round(wall, 4),
+        "rows_per_second": round(rows / wall, 1) if wall else None,
+        "peak_rss_mb": statistics.median(rss) if rss else None,
+        "stages": {
+            name: round(statistics.median(r["stages"].get(name, 0.0) for r in runs), 4)
+            for name in stage_names
+        },
+    }
+
+
+def ensure_workbook(cache_dir, rows, issue_rate, pop_format, seed):
+    """Path of the cached synthetic workbook for these parameters, generated if missing."""
+    path = os.path.join(cache_dir, workbook_name(rows, issue_rate, pop_format, seed))
+    if not os.path.exists(path):
+        print(f"Generating {os.path.basename(path)}...")
+        partial = path + ".partial"
+        write_synthetic_workbook(partial, rows, issue_rate=issue_rate, pop_format=pop_format, seed=seed)
+        os.replace(partial, path)
+    return path
+
+
+def run_suite(rows_list, issue_rate=0.05, pop_formats=("normal",), repeat=3,
+              row_workers=1, cache_dir=DEFAULT_CACHE, seed=0):
+    """Run the benchmarks and return the results dict (see the module docstring)."""
+    specs = [
+        (rows, issue_rate, pop_format, seed)
+        for pop_format in pop_formats
+        for rows in rows_list
+    ]
+    return run_workbooks(specs, repeat=repeat, row_workers=row_workers, cache_dir=cache_dir)
+
+
+def run_workbooks(specs, repeat=3, row_workers=1, cache_dir=DEFAULT_CACHE):
+    """
+    Benchmark the workbooks given as (rows, issue_rate, pop_format, seed)
+    tuples and return the results dict; each workbook entry records its own
+    parameters so compare can regenerate exactly that workbook.
+    """
+    import audit
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Reports go next to each workbook and are removed after every run
+    os.environ["ORGANIZE_AUDITS_BY_DATE"] = "false"
+    workbooks = {}
+    ctx = multiprocessing.get_context("spawn")
+    for rows, issue_rate, pop_format, seed in specs:
+        path = ensure_workbook(cache_dir, rows, issue_rate, pop_format, seed)
+        name = os.path.basename(path).split("#", 1)[0]
+        runs = []
+        for i in range(repeat):
+            pool = ctx.Pool(1, maxtasksperchild=1)
+            try:
+                run = pool.apply(audit_once, (path, row_workers))
+            finally:
+                pool.close()
+                pool.join()
+            shutil.rmtree(os.path.join(cache_dir, "AUDITS"), ignore_errors=True)
+            runs.append(run)
+            print(f"  {name} run {i + 1}/{repeat}: {run['wall_seconds']:.2f}s, "
+                  f"{rows / run['wall_seconds']:.0f} rows/s, peak RSS {run['peak_rss_mb']} MB")
+        workbooks[name] = {
+            "rows": rows,
+            "issue_rate": issue_rate,
+            "pop_format": pop_format,
+            "seed": seed,
+            "size_mb": round(os.path.getsize(path) / (1024 * 1024), 2),
+            "runs": runs,
+            "median": summarize_runs(runs, rows),
+        }
+    return {
+        "schema": BENCH_SCHEMA,
+        "schema_version": BENCH_SCHEMA_VERSION,
+        "auditor_version": audit.version,
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "row_workers": row_workers,
+        "workbooks": workbooks,
+    }
+
+
+def print_summary(results):
+    print(f"\n{'workbook':<28} {'rows':>8} {'median s':>9} {'rows/s':>9} {'peak MB':>8}")
+    for name, wb in results["workbooks"].items():
+        median = wb["median"]
+        print(f"{name:<28} {wb['rows']:>8} {median['wall_seconds']:>9.2f} "
+              f"{median['rows_per_second']:>9.0f} {median['peak_rss_mb'] or 0:>8.1f}")
+
+
+def _median_error(values):
+    """
+    Standard error of the median of values, from their scaled median absolute
+    deviation (a spread estimate robust to one slow run).
+    """
+    if len(values) < 2:
+        return 0.0
+    center = statistics.median(values)
+    spread = 1.4826 * statistics.median(abs(v - center) for v in values)
+    return 1.2533 * spread / len(values) ** 0.5
+
+
+def _stage_runs(workbook, stage):
+    if stage == "total":
+        return [r["wall_seconds"] for r in workbook["runs"]]
+    return [r["stages"].get(stage, 0.0) for r in workbook["runs"]]
+
+
+def machine_speed_factor(base, current):
+    """
+    Current/baseline ratio of one workbook's median calibration time, or None
+    when either result has no calibration (recorded before it existed).
+    """
+    before = base["median"].get("calibration_seconds")
+    after = current["median"].get("calibration_seconds")
+    if not before or not after:
+        return None
+    return after / before
+
+
+def compare_workbook(base, current, rel_tolerance=REL_TOLERANCE,
+                     min_delta=MIN_DELTA_SECONDS, noise_factor=NOISE_FACTOR, normalize=True):
+    """
+    Compare one workbook's per-stage medians (plus "total" wall time) and
+    peak RSS. Returns (speed factor, rows), where each row dict has stage,
+    base, expected (base scaled by the speed factor; never for "total"),
+    current, delta (vs expected), threshold and status ('REGRESSION',
+    'faster', 'ok', 'new' or 'gone'). The speed factor is None when either
+    side has no calibration time; stages are then compared unscaled.
+    """
+    rows = []
+    base_stages = dict(base["median"]["stages"], total=base["median"]["wall_seconds"])
+    current_stages = dict(current["median"]["stages"], total=current["median"]["wall_seconds"])
+    speed = machine_speed_factor(base, current) if normalize else 1.0
+    scale = speed or 1.0
+    for stage in dict.fromkeys([*base_stages, *current_stages]):
+        if stage not in current_stages or stage not in base_stages:
+            rows.append({
+                "stage": stage, "base": base_stages.get(stage), "expected": None,
+                "current": current_stages.get(stage), "delta": None, "threshold": None,
+                "status": "gone" if stage not in current_stages else "new",
+            })
+            continue
+        before, after = base_stages[stage], current_stages[stage]
+        if stage == "total":
+            # Judged raw, so a regression spread over every stage still fails
+            # even if it were mistaken for a slower machine.
+            expected = before
+            threshold = max(rel_tolerance * before, min_delta)
+        else:
+            expected = before * scale
+            noise = ((scale * _median_error(_stage_runs(base, stage))) ** 2
+                     + _median_error(_stage_runs(current, stage)) ** 2) ** 0.5
+            threshold = max(rel_tolerance * expected, min_delta, noise_factor * noise)
+        delta = after - expected
+        if delta > threshold:
+            status = "REGRESSION"
+        elif -delta > threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({"stage": stage, "base": before, "expected": expected, "current": after,
+                     "delta": delta, "threshold": threshold, "status": status})
+
+    before, after = base["median"]["peak_rss_mb"], current["median"]["peak_rss_mb"]
+    if before is not None and after is not None:
+        threshold = max(RSS_REL_TOLERANCE * before, RSS_MIN_DELTA_MB)
+        delta = after - before
+        rows.append({
+            "stage": "peak RSS (MB)", "base": before, "expected": before, "current": after,
+            "delta": delta, "threshold": threshold,
+            "status": "REGRESSION" if delta > threshold else ("smaller" if -delta > threshold else "ok"),
+        })
+    return speed, rows
+
+
+def _fmt(value, suffix=""):
+    return "-" if value is None else f"{value:.3f}{suffix}"
+
+
+def print_comparison(name, rows_count, speed, rows):
+    """Per-validator diff table for one workbook, biggest slowdown first."""
+    if speed is None:
+        speed_note = "no calibration recorded, times compared unscaled"
+    else:
+        speed_note = f"machine speed factor {speed:.2f}x"
+    print(f"\n{name} ({rows_count} rows, {speed_note})")
+    print(f"  {'stage':<22} {'baseline':>9} {'expected':>9} {'current':>9} {'change':>9} "
+          f"{'%':>7} {'allowed':>8}  status")
+    ordered = sorted(rows, key=lambda r: (r["stage"] in ("total", "peak RSS (MB)"),
+                                          -(r["delta"] or 0.0)))
+    for row in ordered:
+        percent = (f"{row['delta'] / row['expected']:+.0%}"
+                   if row["delta"] is not None and row["expected"] else "")
+        change = "-" if row["delta"] is None else f"{row['delta']:+.3f}"
+        allowed = "-" if row["threshold"] is None else f"{row['threshold']:.3f}"
+        print(f"  {row['stage']:<22} {_fmt(row['base']):>9} {_fmt(row['expected']):>9} "
+              f"{_fmt(row['current']):>9} {change:>9} {percent:>7} {allowed:>8}  {row['status']}")
+
+
+def cmd_compare(args):
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read baseline {args.baseline}: {e}")
+        return 2
+    if not isinstance(baseline, dict) or not isinstance(baseline.get("workbooks"), dict):
+        print(f"Baseline {args.baseline} has no workbooks; re-record it with 'scripts/bench.py run'")
+        return 2
+    if args.results:
+        try:
+            with open(args.results, encoding="utf-8") as f:
+                results = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read results {args.results}: {e}")
+            return 2
+        if not isinstance(results, dict) or not isinstance(results.get("workbooks"), dict):
+            print(f"Results {args.results} have no workbooks; write them with 'scripts/bench.py run'")
+            return 2
+    else:
+        # Re-run exactly the workbooks in the baseline, each with its own parameters
+        try:
+            specs = [
+                (wb["rows"], wb["issue_rate"], wb["pop_format"], wb["seed"])
+                for wb in baseline["workbooks"].values()
+            ]
+        except KeyError as e:
+            print(f"Baseline {args.baseline} has no {e} for its workbooks; re-record it with "
+                  f"'scripts/bench.py run'")
+            return 2
+        results = run_workbooks(
+            specs, repeat=args.repeat or baseline["repeat"], row_workers=baseline["row_workers"],
+            cache_dir=args.cache,
+        )
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+                f.write("\n")
+
+    print(f"\nBaseline: {args.baseline} (auditor {baseline.get('auditor_version', '?')}, "
+          f"{baseline.get('generated_at', '?')}, {baseline.get('platform', '?')})")
+    print(f"Current:  auditor {results.get('auditor_version', '?')}, "
+          f"{results.get('generated_at', '?')}, {results.get('platform', '?')}")
+    if baseline.get("platform") != results.get("platform"):
+        print("Note: baseline was recorded on a different machine; timings may not be comparable.")
+
+    regressions = []
+    missing = []
+    for name, base in baseline["workbooks"].items():
+        current = results["workbooks"].get(name)
+        if current is None:
+            print(f"\n{name}: not in the current results")
+            missing.append(name)
+            continue
+        speed, rows = compare_workbook(
+            base, current, rel_tolerance=args.tolerance, min_delta=args.min_delta,
+            noise_factor=args.noise_factor, normalize=not args.absolute,
+        )
+        print_comparison(name, base["rows"], speed, rows)
+        regressions.extend((name, row["stage"]) for row in rows if row["status"] == "REGRESSION")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for name, stage in regressions:
+            print(f"  {name}: {stage}")
+    if missing:
+        print(f"\n{len(missing)} baseline workbook(s) missing from the current results:")
+        for name in missing:
+            print(f"  {name}")
+    if regressions or missing:
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+def cmd_run(args):
+    results = run_suite(
+        args.rows, issue_rate=args.issue_rate, pop_formats=args.pop_format,
+        repeat=args.repeat, row_workers=args.workers, cache_dir=args.cache, seed=args.seed,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print_summary(results)
+    print(f"\nResults written to {args.output}")
+
+
+def add_suite_arguments(parser):
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="OASCAPHS rows per workbook (1000 to 500000)")
+    parser.add_argument("--issue-rate", type=float, default=0.05)
+    parser.add_argument("--pop-format", choices=("normal", "pipe"), nargs="+", default=["normal"])
+    parser.add_argument("--repeat", type=int, default=3, help="audits per workbook (median is kept)")
+    parser.add_argument("--workers", type=int, default=1, help="processes for the row checks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="folder for the generated workbooks")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks and write a results file")
+    add_suite_arguments(run)
+    run.add_argument("-o", "--output", default="bench_results.json")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="compare a run against the baseline results")
+    compare.add_argument("--baseline", default=DEFAULT_BASELINE)
+    compare.add_argument("--results", help="compare this results file instead of running the benchmarks")
+    compare.add_argument("--repeat", type=int, help="audits per workbook (default: as in the baseline)")
+    compare.add_argument("--tolerance", type=float, default=REL_TOLERANCE,
+                         help=f"allowed relative slowdown per stage (default {REL_TOLERANCE})")
+    compare.add_argument("--min-delta", type=float, default=MIN_DELTA_SECONDS,
+                         help=f"slowdowns below this many seconds are ignored (default {MIN_DELTA_SECONDS})")
+    compare.add_argument("--noise-factor", type=float, default=NOISE_FACTOR,
+                         help=f"allowed slowdown in multiples of the run-to-run spread (default {NOISE_FACTOR})")
+    compare.add_argument("--absolute", action="store_true",
+                         help="compare raw times, without scaling by the machine speed factor")
+    compare.add_argument("--cache", default=DEFAULT_CACHE, help="folder for the generated workbooks")
+    compare.add_argument("-o", "--output", help="also write the new results to this file")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Read-ahead benchmark for audit --all --prefetch.
+
+Copies one workbook N times into a temporary folder, throttles every
+workbook read to a slow-share speed (AUDIT_READ_THROTTLE_MBPS) and runs the
+batch with and without prefetching, printing the makespan and the time
+workers spent blocked on reads.
+
+    python scripts/bench_prefetch.py "Client# MARCH OAS 2026.xlsx" --copies 8 --mbps 0.2 --prefetch 0 2 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audit  # noqa: E402
+from audit_batch import READ_THROTTLE_ENV  # noqa: E402
+
+
+def run_once(folder, prefetch):
+    """Audit every copy in folder; returns (makespan, read seconds, failures)."""
+    for entry in os.scandir(folder):
+        if entry.is_dir():
+            shutil.rmtree(entry.path)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = audit.run_batch([folder], prefetch=prefetch)
+    makespan = time.perf_counter() - started
+    failures = sum(1 for r in results if r["status"] != "success")
+    return makespan, sum(r["read_seconds"] for r in results), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("workbook", help="OAS workbook to copy")
+    parser.add_argument("--copies", type=int, default=8)
+    parser.add_argument("--mbps", type=float, default=0.2, help="simulated read speed in MB/s")
+    parser.add_argument("--prefetch", type=int, nargs="+", default=[0, 2, 4])
+    args = parser.parse_args()
+
+    os.environ[READ_THROTTLE_ENV] = str(args.mbps)
+    with tempfile.TemporaryDirectory(prefix="oas-bench-prefetch-") as work:
+        os.environ["AUDIT_HISTORY_FILE"] = os.path.join(work, "history.jsonl")
+        folder = os.path.join(work, "share")
+        os.mkdir(folder)
+        name = os.path.basename(args.workbook).split("#", 1)[-1]
+        for i in range(args.copies):
+            shutil.copy(args.workbook, os.path.join(folder, f"Client{i:03d}#{name}"))
+
+        size_mb = os.path.getsize(args.workbook) / (1024 * 1024)
+        print(f"{args.copies} x {size_mb:.2f} MB at {args.mbps} MB/s "
+              f"({size_mb / args.mbps:.2f}s per read)")
+        print(f"{'prefetch':>8} {'makespan':>9} {'read wait':>10}")
+        for prefetch in args.prefetch:
+            makespan, read_seconds, failures = run_once(folder, prefetch)
+            note = f"  ({failures} failed)" if failures else ""
+            print(f"{prefetch:>8} {makespan:>8.2f}s {read_seconds:>9.2f}s{note}")
+
+
+if __name__ == "__main__":
+    main()
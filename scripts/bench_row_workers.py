@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for the parallel row checks in column_validations.
+
+Builds an in-memory OASCAPHS sheet with a mix of valid and invalid values,
+then times column_validations with 1, 2, 4 and 8 workers and checks that
+every run returns exactly the same issues in the same order.
+
+    python scripts/bench_row_workers.py --rows 200000 --workers 1 2 4 8
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl  # noqa: E402
+from audit_lib_funcs import column_validations  # noqa: E402
+
+HEADERS = [
+    "SID", "PATIENT NAME", "TELEPHONE", "SERVICE DATE", "GENDER", "AGE", "MRN",
+    "DATE OF BIRTH", "EMAIL ADDRESS", "SURVEY LANGUAGE", "CMS INDICATOR", "E/M",
+]
+
+
+def build_sheet(n_rows, seed=0):
+    """OASCAPHS-like sheet with roughly 10% bad values per column."""
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "OASCAPHS"
+    ws.append(HEADERS)
+    for i in range(n_rows):
+        cms = 1 if rng.random() < 0.75 else 2
+        bad = rng.random() < 0.1
+        ws.append([
+            f"ABC{i:06d}",
+            "TEST PATIENT" if bad else "ANA LOPEZ",
+            "555" if bad else f"217555{rng.randint(0, 9999):04d}",
+            "13/01/2026" if bad else datetime.datetime(2026, 3, rng.randint(1, 28)),
+            "X" if bad else rng.choice(["M", "F"]),
+            17 if bad else rng.randint(18, 90),
+            f"M{rng.randint(1, n_rows * 2)}",
+            "02/30/1980" if bad else "01/01/1980",
+            "bad@@mail" if bad else f"p{i}@example.org",
+            "EN" if bad else "en",
+            cms,
+            ("E" if rng.random() < 0.5 else "M") if cms == 1 else None,
+        ])
+    headers = {cell.value: idx for idx, cell in enumerate(ws[1], start=1)}
+    return ws, headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=1, help="runs per worker count (best is kept)")
+    args = parser.parse_args()
+
+    print(f"Building {args.rows} rows...")
+    ws, headers = build_sheet(args.rows)
+
+    baseline = None
+    base_time = None
+    print(f"{'workers':>8} {'seconds':>9} {'rows/s':>10} {'speedup':>8}")
+    for workers in args.workers:
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = column_validations(
+                ws, headers, headers["MRN"], headers["CMS INDICATOR"], headers["E/M"],
+                [], [], filename_year=2026, workers=workers,
+            )
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        if baseline is None:
+            baseline, base_time = result, best
+        elif result != baseline:
+            print(f"!! results with {workers} workers differ from {args.workers[0]} worker(s)")
+            sys.exit(1)
+        print(f"{workers:>8} {best:>9.2f} {args.rows / best:>10.0f} {base_time / best:>7.2f}x")
+    print(f"Identical results across worker counts ({len(baseline[1])} row issues).")
+
+
+if __name__ == "__main__":
+    main()
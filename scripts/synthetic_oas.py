@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Synthetic OAS workbook generator.
+
+Writes a workbook shaped like a real OAS file without any patient data:
+OASCAPHS (with the SUBMITTED / EL / SS header and footer), UPLOAD, POP
+(normal or pipe-delimited), INEL (REPEAT rows and highlighted service dates)
+and FRAME (the sampling frame followed by a sparse block of 6-month
+repeats). With --issue-rate 0 the counts in the header and footer agree with
+the tabs; a higher rate plants bad values in that fraction of the OASCAPHS
+rows and broken REPEAT formatting in that fraction of the INEL rows.
+
+    python scripts/synthetic_oas.py --rows 100000 --issue-rate 0.05 --pop-format pipe -o out/
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook  # noqa: E402
+from openpyxl.cell import WriteOnlyCell  # noqa: E402
+from openpyxl.styles import Font, PatternFill  # noqa: E402
+from audit_lib_funcs import classify_cpt  # noqa: E402
+
+OASCAPHS_HEADERS = [
+    "SID", "PATIENT NAME", "ADDRESS1", "ADDRESS2", "CITY", "STATE", "ZIP", "TELEPHONE",
+    "SERVICE DATE", "GENDER", "AGE", "PROVIDER NAME", "MRN", "P.TYPE", "SURGICAL CATEGORY",
+    "ATT", "LAG", "ID", "FD", "LG", "E/M", "EMAIL ADDRESS", "CMS INDICATOR",
+    "SURVEY LANGUAGE", "CPT", "DATE OF BIRTH", "CELL PHONE",
+]
+# UPLOAD is OASCAPHS without the sampling columns
+UPLOAD_HEADERS = [h for h in OASCAPHS_HEADERS if h not in ("ATT", "LAG", "ID", "FD", "LG", "E/M")]
+POP_HEADERS = ["MRN", "Patient Name", "Email", "Facility Name", "Location", "DOS"]
+INEL_HEADERS = ["MRN", "NAME", "SERVICE DATE", "NOTE"]
+
+FIRST_NAMES = ["ANA", "JOHN", "MARY", "LUIS", "GRACE", "OMAR", "EMMA", "NOAH", "LILY", "RAJ"]
+LAST_NAMES = ["LOPEZ", "SMITH", "JONES", "NGUYEN", "PATEL", "BROWN", "GARCIA", "KIM", "MILLER", "DAVIS"]
+PLACES = [
+    ("Springfield", "IL", "62701"), ("Peoria", "IL", "61602"), ("Madison", "WI", "53703"),
+    ("Columbus", "OH", "43215"), ("Austin", "TX", "78701"), ("Denver", "CO", "80202"),
+]
+STREETS = ["Main St", "Oak Ave", "Maple Dr", "Cedar Ln", "Lake Rd", "Hill St"]
+CPT_CODES = ["27447", "43239", "66984", "45378", "G0121"]
+FACILITIES = [("North ASC", "Bldg 1"), ("North ASC", "Bldg 2"), ("South ASC", "Bldg 1")]
+
+SID_PREFIX = "SYN"
+MONTH, YEAR = 3, 2026
+
+# One bad value per planted row issue, keyed by OASCAPHS column
+BAD_VALUES = {
+    "PATIENT NAME": "TEST PATIENT",
+    "ADDRESS1": "homeless",
+    "STATE": "ZZ",
+    "ZIP": "6270",
+    "TELEPHONE": "555",
+    "SERVICE DATE": "13/01/2026",
+    "GENDER": "X",
+    "AGE": 17,
+    "EMAIL ADDRESS": "bad@@mail",
+    "SURVEY LANGUAGE": "EN",
+    "CPT": "11042",
+    "DATE OF BIRTH": "02/30/1980",
+}
+
+RED_FONT = Font(color="FFFF0000")
+RED_BOLD_FONT = Font(color="FFFF0000", bold=True)
+YELLOW_FILL = PatternFill("solid", fgColor="FFFFFF00")
+
+
+def workbook_name(rows, issue_rate, pop_format, seed):
+    """File name for a generated workbook; the client part encodes its parameters."""
+    return f"SYN{rows}-{issue_rate:g}-{pop_format}-{seed}# MARCH OAS {YEAR}.xlsx"
+
+
+def _patient(rng, i, sampled_cms):
+    """One OASCAPHS row as a dict (SID filled in later)."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    city, state, zip_code = rng.choice(PLACES)
+    # Non-reported (CMS=2) patients can only be surveyed by email
+    has_email = sampled_cms == 2 or rng.random() < 0.6
+    cpt = rng.choice(CPT_CODES)
+    return {
+        "SID": None,
+        "PATIENT NAME": f"{first} {last}",
+        "ADDRESS1": f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+        "ADDRESS2": None,
+        "CITY": city,
+        "STATE": state,
+        "ZIP": zip_code,
+        "TELEPHONE": f"217{2000000 + i:07d}",
+        "SERVICE DATE": f"{MONTH:02d}/{rng.randint(1, 28):02d}/{YEAR}",
+        "GENDER": rng.choice("MF"),
+        "AGE": rng.randint(18, 90),
+        "PROVIDER NAME": f"DR {rng.choice(LAST_NAMES)}",
+        "MRN": f"M{i:07d}",
+        "P.TYPE": 1,
+        "SURGICAL CATEGORY": classify_cpt(cpt),
+        "ATT": 1, "LAG": 1, "ID": 1, "FD": 1, "LG": 1,
+        "E/M": ("E" if has_email else "M") if sampled_cms == 1 else None,
+        "EMAIL ADDRESS": f"{first.lower()}.{last.lower()}{i}@example.org" if has_email else None,
+        "CMS INDICATOR": sampled_cms,
+        "SURVEY LANGUAGE": rng.choice(["en", "en", "en", "es"]),
+        "CPT": cpt,
+        "DATE OF BIRTH": f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(1935, 2005)}",
+        "CELL PHONE": f"312{2000000 + i:07d}" if rng.random() < 0.5 else None,
+    }
+
+
+def write_synthetic_workbook(path, rows, issue_rate=0.0, pop_format="normal",
+                             inel_rate=0.05, frame_repeat_rate=0.02, seed=0):
+    """
+    Write a synthetic OAS workbook with `rows` OASCAPHS rows to path.
+
+    inel_rate and frame_repeat_rate size the INEL tab and the FRAME repeat
+    block relative to rows. Returns a dict of the counts written (rows,
+    sample_size, eligible, submitted, inel_rows, highlighted_inel,
+    frame_repeats, pop_rows, planted_issues).
+    """
+    if pop_format not in ("normal", "pipe"):
+        raise ValueError(f"pop_format must be 'normal' or 'pipe', got {pop_format!r}")
+    rng = random.Random(seed)
+    patients = [_patient(rng, i, 1 if rng.random() < 0.75 else 2) for i in range(rows)]
+
+    sid_width = max(5, len(str(rows + 100)))
+    header_sid = f"{SID_PREFIX}{100:0{sid_width}d}"
+    next_sid = 101
+    for patient in patients:
+        if patient["CMS INDICATOR"] == 1:
+            patient["SID"] = f"{SID_PREFIX}{next_sid:0{sid_width}d}"
+            next_sid += 1
+
+    planted = 0
+    bad_columns = list(BAD_VALUES)
+    for patient in patients:
+        if rng.random() < issue_rate:
+            column = rng.choice(bad_columns)
+            patient[column] = BAD_VALUES[column]
+            planted += 1
+
+    inel_rows = round(rows * inel_rate)
+    highlighted_inel = inel_rows // 5
+    frame_repeats = round(rows * frame_repeat_rate)
+    sample_size = sum(1 for p in patients if p["CMS INDICATOR"] == 1)
+    # Eligible + INEL + FRAME repeats = submitted; POP = submitted + highlighted INEL
+    submitted = rows + (inel_rows - highlighted_inel) + frame_repeats
+    pop_rows = submitted + highlighted_inel
+
+    wb = Workbook(write_only=True)
+
+    ws = wb.create_sheet("OASCAPHS")
+    ws.oddHeader.center.text = f"{header_sid} TB SUBMITTED = {submitted}"
+    ws.oddFooter.center.text = f"EL = {rows} SS = {sample_size}"
+    ws.append(OASCAPHS_HEADERS)
+    for patient in patients:
+        ws.append([patient[h] for h in OASCAPHS_HEADERS])
+
+    ws = wb.create_sheet("UPLOAD")
+    ws.append(UPLOAD_HEADERS)
+    for patient in patients:
+        ws.append([patient[h] for h in UPLOAD_HEADERS])
+
+    ws = wb.create_sheet("POP")
+    ws.append(["Synthetic population report"])
+    ws.append([])
+    pop_patients = patients + [
+        _patient(rng, rows + i, 2) for i in range(pop_rows - rows)
+    ]
+    if pop_format == "pipe":
+        ws.append(["|".join(POP_HEADERS)])
+    else:
+        ws.append(POP_HEADERS)
+    for patient in pop_patients:
+        facility, location = rng.choice(FACILITIES)
+        values = [patient["MRN"], patient["PATIENT NAME"], patient["EMAIL ADDRESS"],
+                  facility, location, patient["SERVICE DATE"]]
+        if pop_format == "pipe":
+            ws.append(["|".join("" if v is None else str(v) for v in values)])
+        else:
+            ws.append(values)
+
+    ws = wb.create_sheet("INEL")
+    ws.append(INEL_HEADERS)
+    for i in range(inel_rows):
+        values = [f"I{i:07d}", f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                  f"{MONTH:02d}/{rng.randint(1, 28):02d}/{YEAR}"]
+        broken = rng.random() < issue_rate
+        if i < highlighted_inel:
+            # Ineligible service date: only that cell is highlighted
+            cells = [WriteOnlyCell(ws, value=v) for v in values]
+            if not broken:
+                cells[2].fill = YELLOW_FILL
+            cells.append(WriteOnlyCell(ws, value=None))
+        else:
+            cells = [WriteOnlyCell(ws, value=v) for v in values]
+            for cell in cells:
+                cell.font = RED_FONT
+            repeat = WriteOnlyCell(ws, value="REPEAT")
+            repeat.font = RED_BOLD_FONT
+            if not broken:
+                repeat.fill = YELLOW_FILL
+            cells.append(repeat)
+        planted += broken
+        ws.append(cells)
+
+    ws = wb.create_sheet("FRAME")
+    for i, patient in enumerate(patients):
+        ws.append([i, patient["MRN"], patient["PATIENT NAME"], patient["SERVICE DATE"],
+                   patient["CPT"]])
+    ws.append([])
+    for i in range(frame_repeats):
+        # RATSTATS random number in column A, repeat patient's MRN in column B
+        ws.append([rng.randint(1, rows), f"R{i:07d}"])
+
+    wb.save(path)
+    return {
+        "rows": rows,
+        "sample_size": sample_size,
+        "eligible": rows,
+        "submitted": submitted,
+        "inel_rows": inel_rows,
+        "highlighted_inel": highlighted_inel,
+        "frame_repeats": frame_repeats,
+        "pop_rows": pop_rows,
+        "planted_issues": planted,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000],
+                        help="OASCAPHS rows per workbook, e.g. 1000 50000 500000")
+    parser.add_argument("--issue-rate", type=float, default=0.05,
+                        help="fraction of rows with a planted problem (default 0.05)")
+    parser.add_argument("--pop-format", choices=("normal", "pipe"), default="normal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=".", help="folder to write the workbooks to")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    for rows in args.rows:
+        path = os.path.join(args.output, workbook_name(rows, args.issue_rate, args.pop_format, args.seed))
+        counts = write_synthetic_workbook(
+            path, rows, issue_rate=args.issue_rate, pop_format=args.pop_format, seed=args.seed,
+        )
+        print(f"{path}: {counts['rows']} rows, SS={counts['sample_size']}, "
+              f"SUBMITTED={counts['submitted']}, {counts['planted_issues']} planted issue(s)")
+
+
+if __name__ == "__main__":
+    main()